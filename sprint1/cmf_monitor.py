@@ -20,6 +20,9 @@ from fake_useragent import UserAgent
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Tamaño de bloque al escribir el PDF de prueba a disco
+PDF_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class CMFMonitor:
     """Monitor de salud del sistema de scraping de CMF Chile"""
@@ -327,16 +330,25 @@ class CMFMonitor:
             pdf_url = f"{self.base_url}{pdf_relative_path}"
             logger.info(f"[PDF] Descargando PDF desde: {pdf_url}")
 
-            # Descargar PDF
-            pdf_response = self.session.get(pdf_url, timeout=30)
-            pdf_response.raise_for_status()
+            # Descargar PDF en streaming: se escribe a disco en bloques sin tener
+            # el archivo completo en memoria
+            test_pdf_path = os.path.join(self.temp_dir, 'monitor_test.pdf')
+            with self.session.get(pdf_url, timeout=30, stream=True) as pdf_response:
+                pdf_response.raise_for_status()
+
+                chunks = pdf_response.iter_content(chunk_size=PDF_DOWNLOAD_CHUNK_SIZE)
+                first_chunk = next(chunks, b'')
+                file_size = len(first_chunk)
+                with open(test_pdf_path, 'wb') as f:
+                    f.write(first_chunk)
+                    for chunk in chunks:
+                        f.write(chunk)
+                        file_size += len(chunk)
 
-            pdf_content = pdf_response.content
-            file_size = len(pdf_content)
             result['file_size_bytes'] = file_size
 
             # Verificar que es un PDF válido (headers b'%PDF')
-            is_valid = pdf_content.startswith(b'%PDF')
+            is_valid = first_chunk.startswith(b'%PDF')
             result['is_valid_pdf'] = is_valid
 
             if not is_valid:
@@ -350,11 +362,6 @@ class CMFMonitor:
                 result['errors'].append(f'Tamaño de PDF sospechosamente pequeño: {file_size} bytes')
                 self._log_alert('WARNING', f'PDF pequeño: {file_size} bytes')
 
-            # Guardar PDF de prueba
-            test_pdf_path = os.path.join(self.temp_dir, 'monitor_test.pdf')
-            with open(test_pdf_path, 'wb') as f:
-                f.write(pdf_content)
-
             result['pdf_path'] = test_pdf_path
             logger.info(f"[PDF] PDF guardado en: {test_pdf_path} ({file_size} bytes)")
             logger.info(f"[PDF] Validación completada: {result['status']}")
@@ -4,20 +4,40 @@ Incluye integración con Fintual API, scraping web de CMF Chile y generación de
 """
 
 import os
+import io
+import asyncio
+import atexit
+import codecs
+import csv
+import hashlib
+import html
+import heapq
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
-import pdfplumber
 import logging
+import queue
 import re
 import json
+import shutil
+import sqlite3
+import subprocess
+import threading
 import time
+import weakref
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
-from openai import OpenAI
-import openai
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from fake_useragent import UserAgent
 
 # Cargar variables de entorno
@@ -27,14 +47,127 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# pdfminer (usado por pdfplumber) loguea por cada token del PDF: con logging en
+# DEBUG el parsing se vuelve órdenes de magnitud más lento. Los hijos
+# (pdfminer.pdfinterp, pdfminer.psparser, ...) heredan el nivel
+for _pdf_logger in ('pdfminer', 'pdfplumber'):
+    logging.getLogger(_pdf_logger).setLevel(logging.WARNING)
+
 # FIX 4.4: Regex compilados module-level para performance
-REGEX_COMISION = re.compile(r'(\d*[\.,]?\d+)\s*%?')
+# re.ASCII donde la entrada relevante es ASCII (números, fechas, RUTs, JS/HTML): \d y \b
+# se resuelven con una tabla de 128 entradas en vez de consultar la base Unicode.
+# Rentabilidad, valor cuota y porcentaje quedan en modo Unicode: usan 'año' con
+# IGNORECASE (debe matchear 'AÑO') o \s sobre texto de PDF, que puede traer \xa0
+REGEX_COMISION = re.compile(r'(\d*[\.,]?\d+)\s*%?', re.ASCII)
 REGEX_RENT_1ANO = re.compile(r'1\s+año\s+([-]?\d*[\.,]?\d+)\s*%', re.IGNORECASE)
 REGEX_RENT_2ANOS = re.compile(r'2\s+años?\s+([-]?\d*[\.,]?\d+)\s*%', re.IGNORECASE)
 REGEX_RENT_3ANOS = re.compile(r'[35]\s+años?\s+([-]?\d*[\.,]?\d+)\s*%', re.IGNORECASE)
-REGEX_FECHA_CMF = re.compile(r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})')
+REGEX_FECHA_CMF = re.compile(r'(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})', re.ASCII)
 REGEX_VALOR_CUOTA = re.compile(r'valor\s+cuota[:\s]+\$?\s*([\d.,]+)', re.IGNORECASE)
-REGEX_PERFIL_RIESGO = re.compile(r'\bR([1-7])\b')
+REGEX_PERFIL_RIESGO = re.compile(r'\bR([1-7])\b', re.ASCII)
+REGEX_FONDOS_ARRAY = re.compile(r'fondos_(\d+)\s*=\s*new Array\((.*?)\);', re.DOTALL | re.ASCII)
+REGEX_RUT_FONDO = re.compile(r'^\d+-[\dkK]$', re.ASCII)
+REGEX_NUMERO = re.compile(r'[\d,]+\.?\d*', re.ASCII)
+REGEX_PORCENTAJE = re.compile(r'(-?\d+\.?\d*)\s*%')
+REGEX_PESTANIA = re.compile(r'pestania=\d+', re.ASCII)
+REGEX_ENTIDAD_HREF = re.compile(r'href\s*=\s*["\']([^"\']*entidad\.php[^"\']*)["\']', re.IGNORECASE)
+REGEX_VERFOLLETO_ATTR = re.compile(r'verFolleto')
+REGEX_VERFOLLETO_ARGS = re.compile(r"verFolleto\('([^']*)',\s*'([^']*)',\s*'([^']*)'\)")
+REGEX_FOLLETOS_VIGENTES = re.compile('Folletos Informativos.*VIGENTES', re.IGNORECASE)
+REGEX_ICONO_DOC = re.compile('doc\\.gif', re.IGNORECASE)
+REGEX_FECHA_DDMMYYYY = re.compile(r'\d{2}/\d{2}/\d{4}', re.ASCII)
+REGEX_FOLLETO_ONCLICK = re.compile(r'(ver|abrir)?[Ff]olleto', re.IGNORECASE)
+REGEX_PDF_HREF = re.compile(r'\.pdf$', re.IGNORECASE)
+
+# Formato chileno -> float: quitar separador de miles y usar punto decimal (una pasada en C)
+TRANS_NUMERO_CL = str.maketrans({'.': '', ',': '.'})
+
+# Nombre de fondo -> nombre de archivo: reemplazar separadores de ruta y espacios
+TRANS_NOMBRE_ARCHIVO = str.maketrans({' ': '_', '/': '_', '\\': '_', ':': '_'})
+
+# Tamaño de la muestra usada para detectar el separador de archivos de cartera
+SEPARATOR_SAMPLE_SIZE = 64 * 1024
+
+# Tamaño de bloque al descargar folletos PDF en streaming
+PDF_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Formato del archivo de respaldo de _generate_simple_excel: 'xlsx' (para personas)
+# o 'csv' (cuando lo consume otro script)
+SIMPLE_OUTPUT_FORMAT = os.getenv('SIMPLE_OUTPUT_FORMAT', 'xlsx').lower()
+
+# Separador de fases en los logs del pipeline (se arma una sola vez)
+LOG_SEPARATOR = "═" * 60
+
+# Máximo de descripciones IA generadas en paralelo (rate limit de OpenAI)
+AI_DESCRIPTION_CONCURRENCY = 8
+
+# Listado de fondos mutuos vigentes de CMF (contiene los links a entidad.php con row ID)
+CMF_LISTADO_URL = "https://www.cmfchile.cl/institucional/mercados/consulta.php?mercado=V&Estado=VI&entidad=RGFMU"
+
+# Página de entidad sin row ID (funciona para fondos que el listado arma en JavaScript)
+CMF_ENTIDAD_DIRECT_URL = ("https://www.cmfchile.cl/institucional/mercados/entidad.php?mercado=V&rut={rut}"
+                          "&tipoentidad=RGFMU&vig=VI&control=svs&pestania={pestania}")
+
+# Lectura en streaming de páginas CMF (listado y folletos): tamaño de bloque y cola
+# conservada entre bloques (cubre un href o un onclick partido en el borde)
+CMF_STREAM_CHUNK_SIZE = 16 * 1024
+CMF_STREAM_TAIL = 2048
+
+# Máximo de páginas CMF descargadas en paralelo al precargar folletos
+CMF_FETCH_CONCURRENCY = 32
+
+# Endpoint que entrega el path del PDF viewer de un folleto (PASO 1 de la descarga)
+# CORRECCION: URL correcta del endpoint (antes: /institucional/inc/)
+CMF_FOLLETO_URL = "https://www.cmfchile.cl/603/ver_folleto_fm.php"
+
+# XPath de los links a folletos en la página de entidad (Selenium), en orden de prioridad
+SELENIUM_FOLLETO_SELECTORS = (
+    "//a[contains(@onclick, 'verFolleto') or contains(@onclick, 'abrirFolleto')]",
+    "//button[contains(@onclick, 'verFolleto') or contains(@onclick, 'abrirFolleto')]",
+    "//a[contains(@href, '.pdf')]",
+    "//*[contains(text(), 'Folleto') or contains(text(), 'FOLLETO')]/ancestor::a",
+    "//a[contains(@class, 'folleto')]"
+)
+# Unión de todos los selectores: cualquier enlace de folleto presente
+SELENIUM_FOLLETO_ANY_XPATH = " | ".join(SELENIUM_FOLLETO_SELECTORS)
+# Evaluar los selectores en el navegador en orden de prioridad (un solo round-trip
+# de WebDriver). Devuelve [índice del selector, enlaces, [onclick, href] de cada enlace];
+# una unión XPath "|" no sirve porque devuelve los nodos en orden de documento y se
+# pierde la prioridad. Los atributos vienen en la misma llamada: cada get_attribute()
+# posterior sería otro round-trip
+SELENIUM_FIND_FOLLETOS_JS = """
+var selectores = arguments[0];
+for (var i = 0; i < selectores.length; i++) {
+    var r = document.evaluate(selectores[i], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    if (r.snapshotLength > 0) {
+        var nodos = [], datos = [];
+        for (var j = 0; j < r.snapshotLength; j++) {
+            var n = r.snapshotItem(j);
+            nodos.push(n);
+            datos.push([n.getAttribute('onclick') || '', n.getAttribute('href') || '']);
+        }
+        return [i, nodos, datos];
+    }
+}
+return [-1, [], []];
+"""
+# Atributos [onclick, href] de una lista de enlaces en un solo round-trip
+SELENIUM_LINK_ATTRS_JS = (
+    "return Array.from(arguments[0]).map(function (a) {"
+    " return [a.getAttribute('onclick') || '', a.getAttribute('href') || '']; });"
+)
+# Página lista: documento cargado, pestañas renderizadas y sin AJAX de jQuery pendiente
+SELENIUM_PAGE_READY_JS = (
+    "return document.readyState === 'complete'"
+    " && document.getElementById('tabs') !== null"
+    " && (typeof jQuery === 'undefined' || jQuery.active === 0);"
+)
+
+# Campos del folleto PDF que se copian al resultado solo si vienen con valor
+CAMPOS_PDF_OPCIONALES = ('horizonte_inversion', 'comision_administracion', 'rentabilidad_24m', 'rentabilidad_36m')
+
+# Modelo usado para las descripciones (forma parte de la clave de caché)
+AI_DESCRIPTION_MODEL = "gpt-3.5-turbo"
 
 
 # FIX 1.3: Función utilitaire pour éviter NoneType+str concatenation
@@ -98,6 +231,8 @@ def request_with_retry(session: requests.Session, url: str, max_retries: int = 3
             elif response.status_code in [404, 503] and attempt < max_retries - 1:
                 wait_time = backoff ** attempt
                 logger.warning(f"[HTTP RETRY] HTTP {response.status_code} en {url[:80]}, retry {attempt + 1}/{max_retries} en {wait_time}s")
+                # Con stream=True la conexión queda tomada hasta leer o cerrar la respuesta
+                response.close()
                 time.sleep(wait_time)
 
             # Otros errores: no retry
@@ -127,6 +262,456 @@ def request_with_retry(session: requests.Session, url: str, max_retries: int = 3
     return None
 
 
+async def async_request_with_retry(client, url: str, max_retries: int = 3, backoff: float = 2, **kwargs):
+    """
+    Versión async de request_with_retry sobre un httpx.AsyncClient.
+
+    Los errores de conexión ya los reintenta el transporte (AsyncHTTPTransport(retries=...));
+    aquí se reintentan los status 404/503 y los timeouts con backoff exponencial.
+
+    Returns:
+        httpx.Response si exitoso, None si falla tras todos los retries
+    """
+    for attempt in range(max_retries):
+        try:
+            response = await client.get(url, **kwargs)
+
+            if response.status_code == 200:
+                return response
+
+            elif response.status_code in [404, 503] and attempt < max_retries - 1:
+                wait_time = backoff ** attempt
+                logger.warning(f"[HTTP RETRY] HTTP {response.status_code} en {url[:80]}, retry {attempt + 1}/{max_retries} en {wait_time}s")
+                await asyncio.sleep(wait_time)
+
+            else:
+                logger.warning(f"[HTTP RETRY] HTTP {response.status_code} para {url[:80]} - no retry")
+                return response
+
+        except httpx.HTTPError as e:
+            if attempt < max_retries - 1:
+                wait_time = backoff ** attempt
+                logger.warning(f"[HTTP RETRY] Exception {type(e).__name__} en {url[:80]}, retry {attempt + 1}/{max_retries} en {wait_time}s")
+                await asyncio.sleep(wait_time)
+            else:
+                logger.error(f"[HTTP RETRY] Falló tras {max_retries} intentos: {type(e).__name__}: {e}")
+                return None
+
+    logger.error(f"[HTTP RETRY] Agotados {max_retries} intentos para {url[:80]}")
+    return None
+
+
+def _set_url_pestania(url: str, pestania: str) -> str:
+    """Agregar o reemplazar el parámetro pestania de una URL de entidad CMF"""
+    if 'pestania=' in url:
+        return REGEX_PESTANIA.sub(f'pestania={pestania}', url)
+    return f"{url}&pestania={pestania}" if '?' in url else f"{url}?pestania={pestania}"
+
+
+def _build_entidad_url(href: str, pestania: str) -> str:
+    """Armar la URL absoluta de un link a entidad.php con la pestaña indicada"""
+    # Construir URL completa
+    if href.startswith('http'):
+        url_base = href
+    elif href.startswith('/'):
+        url_base = f"https://www.cmfchile.cl{href}"
+    else:
+        url_base = f"https://www.cmfchile.cl/institucional/mercados/{href}"
+
+    # Solo cambia el valor de pestania: reemplazo directo sobre el string, sin
+    # tokenizar y reconstruir la URL completa
+    return _set_url_pestania(url_base, pestania)
+
+
+def _find_entidad_url_in_listado(html_content, rut: str, pestania: str) -> Optional[str]:
+    """
+    Buscar en el HTML del listado CMF el link a entidad.php (con row ID) de un RUT.
+
+    Args:
+        html_content: HTML del listado (bytes o str)
+        rut (str): RUT del fondo SIN guión
+        pestania (str): Pestaña con la que se arma la URL
+
+    Returns:
+        URL completa con parámetros incluido row, o None
+    """
+    # Camino rápido: un solo scan del HTML crudo con regex, sin parsear la página.
+    # Los href son ASCII, latin-1 decodifica cualquier byte sin errores
+    texto = html_content.decode('latin-1') if isinstance(html_content, bytes) else html_content
+    for match in REGEX_ENTIDAD_HREF.finditer(texto):
+        href = html.unescape(match.group(1))
+        if f'rut={rut}' in href and 'row=' in href:
+            return _build_entidad_url(href, pestania)
+
+    # Fallback: links que el regex no reconoce (ej. href sin comillas)
+    # Solo interesan los <a href>: no construir el árbol del resto de la página
+    soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=SoupStrainer('a', href=True))
+
+    for enlace in soup.find_all('a', href=True):
+        href = enlace['href']
+        if f'rut={rut}' in href and 'entidad.php' in href and 'row=' in href:
+            return _build_entidad_url(href, pestania)
+
+    return None
+
+
+def _find_entidad_url_in_stream(response, rut: str, pestania: str) -> Optional[str]:
+    """
+    Igual que _find_entidad_url_in_listado, pero sobre una respuesta con stream=True:
+    escanea cada bloque a medida que llega y corta la descarga en el primer match.
+
+    Args:
+        response: requests.Response abierta con stream=True (se cierra al terminar)
+        rut (str): RUT del fondo SIN guión
+        pestania (str): Pestaña con la que se arma la URL
+
+    Returns:
+        URL completa con parámetros incluido row, o None
+    """
+    chunks = []
+    pendiente = ''
+    try:
+        for chunk in response.iter_content(chunk_size=CMF_STREAM_CHUNK_SIZE):
+            chunks.append(chunk)
+            pendiente += chunk.decode('latin-1')
+            ultimo_fin = 0
+            for match in REGEX_ENTIDAD_HREF.finditer(pendiente):
+                ultimo_fin = match.end()
+                href = html.unescape(match.group(1))
+                if f'rut={rut}' in href and 'row=' in href:
+                    return _build_entidad_url(href, pestania)
+            # Conservar solo la cola: un href puede quedar partido entre dos bloques
+            pendiente = pendiente[max(ultimo_fin, len(pendiente) - CMF_STREAM_TAIL):]
+    finally:
+        response.close()
+
+    # Sin match en el camino rápido: fallback con BeautifulSoup sobre la página completa
+    return _find_entidad_url_in_listado(b''.join(chunks), rut, pestania)
+
+
+# Headers de navegador para ver_folleto_fm.php y el PDF viewer de CMF (parte fija)
+# CORRECCION: Simplificados, removiendo Content-Type y X-Requested-With que pueden causar rechazo
+CMF_FOLLETO_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'es-CL,es;q=0.9',
+    'Origin': 'https://www.cmfchile.cl',
+}
+
+
+def _cmf_folleto_headers(rut: str) -> Dict[str, str]:
+    """Headers de navegador para ver_folleto_fm.php y el PDF viewer de CMF"""
+    # Solo el Referer depende del fondo
+    # FIX 1.1: Proteger concatenation RUT en Referer header (evitar NoneType crash)
+    headers = CMF_FOLLETO_HEADERS.copy()
+    headers['Referer'] = f'https://www.cmfchile.cl/institucional/mercados/entidad.php?mercado=V&rut={rut or ""}'
+    return headers
+
+
+def _cmf_viewer_url(respuesta: str, rut: str, serie: str) -> Optional[str]:
+    """
+    Convertir la respuesta de ver_folleto_fm.php (PASO 1) en la URL del PDF viewer.
+
+    Returns:
+        URL absoluta del PDF, o None si CMF respondió HTML, 'ERROR' o vacío
+    """
+    # La respuesta debe ser un path relativo al PDF viewer o "ERROR"
+    pdf_viewer_path = respuesta.strip()
+
+    logger.debug(f"[CMF PDF] Respuesta PASO 1: {pdf_viewer_path[:200]}")
+
+    # CORRECCION: Validar que no sea HTML de error antes de intentar usarla como path
+    if pdf_viewer_path.startswith('<!DOCTYPE') or pdf_viewer_path.startswith('<html'):
+        logger.error(f"[CMF PDF] Respuesta HTML recibida en lugar de path. Primeros 500 chars: {pdf_viewer_path[:500]}")
+        return None
+
+    # FIX 1.2: Validar pdf_viewer_path antes de construir URL (evitar NoneType crash)
+    if pdf_viewer_path == 'ERROR' or not pdf_viewer_path:
+        logger.warning(f"[CMF PDF] No se encontró folleto para RUT {rut}, Serie {serie}")
+        return None
+
+    # Construir URL completa (siempre es un path relativo que comienza con /)
+    if pdf_viewer_path.startswith('/'):
+        return f"https://www.cmfchile.cl{pdf_viewer_path}"
+    return f"https://www.cmfchile.cl/{pdf_viewer_path}"
+
+
+def _parse_cmf_folletos_html(html_content) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Extraer folletos y rutAdmin del HTML de la pestaña de folletos (pestania=68).
+
+    Args:
+        html_content: HTML de la página de entidad (bytes o str)
+
+    Returns:
+        Tuple con la lista de folletos y el rutAdmin (o None)
+    """
+    soup = BeautifulSoup(html_content, HTML_PARSER)
+
+    folletos = []
+    rut_admin = None
+
+    # MÉTODO 1: Extraer de onclick="verFolleto(...)"
+    # Buscar todos los elementos con onclick que llaman a verFolleto
+    onclick_elements = soup.find_all(attrs={'onclick': REGEX_VERFOLLETO_ATTR})
+
+    logger.info(f"[CMF] Encontrados {len(onclick_elements)} elementos con verFolleto")
+
+    for elem in onclick_elements:
+        onclick = elem.get('onclick', '')
+        # Extraer parámetros: verFolleto('runFondo','serie','rutAdmin')
+        match = REGEX_VERFOLLETO_ARGS.search(onclick)
+        if match:
+            run_fondo, serie, rut_admin_found = match.groups()
+
+            # Guardar el primer rutAdmin encontrado
+            if rut_admin_found and not rut_admin:
+                rut_admin = rut_admin_found
+                logger.info(f"[CMF] ✅ rutAdmin extraído: {rut_admin}")
+
+            # Agregar serie única
+            if serie and serie not in [f['serie'] for f in folletos]:
+                folletos.append({
+                    'serie': serie,
+                    'runFondo': run_fondo,
+                    'rutAdmin': rut_admin_found,
+                    'encontrado': True
+                })
+                logger.debug(f"[CMF] Folleto encontrado: Serie={serie}, runFondo={run_fondo}, rutAdmin={rut_admin_found}")
+
+    # MÉTODO 2 (fallback): Buscar en tabla si no encontramos con onclick
+    if not folletos:
+        texto_folletos = soup.find(string=REGEX_FOLLETOS_VIGENTES)
+
+        if texto_folletos:
+            tabla = texto_folletos.find_parent('table')
+            if not tabla:
+                elemento_actual = texto_folletos.parent
+                for _ in range(10):
+                    if elemento_actual:
+                        tabla = elemento_actual.find_next('table')
+                        if tabla:
+                            break
+                        elemento_actual = elemento_actual.parent
+
+            if tabla:
+                filas = tabla.find_all('tr')
+
+                for fila in filas:
+                    celdas = fila.find_all('td')
+
+                    if len(celdas) >= 4:
+                        icono_doc = fila.find('img', src=REGEX_ICONO_DOC)
+
+                        if icono_doc:
+                            serie = None
+                            fecha_envio = None
+
+                            for i, celda in enumerate(celdas):
+                                texto = celda.get_text().strip()
+
+                                if REGEX_FECHA_DDMMYYYY.match(texto):
+                                    if not fecha_envio:
+                                        fecha_envio = texto
+
+                                if texto and len(texto) < 20 and texto.isupper():
+                                    serie = texto
+
+                            if serie or fecha_envio:
+                                folletos.append({
+                                    'serie': serie or 'UNICA',
+                                    'fecha_envio': fecha_envio,
+                                    'encontrado': True
+                                })
+                                logger.debug(f"[CMF] Folleto encontrado (método tabla): Serie={serie}, Fecha={fecha_envio}")
+###toda esta parte se puede optimizar mas no me gustan tantos ifs y demas
+    if not folletos:
+        logger.warning("[CMF] No se encontraron folletos, intentando serie UNICA")
+        folletos = [{'serie': 'UNICA', 'fecha_envio': None, 'encontrado': False}]
+
+    logger.info(f"[CMF] Total folletos encontrados: {len(folletos)}, rutAdmin: {rut_admin}")
+    return folletos, rut_admin
+
+
+def _parse_cmf_folletos_stream(chunks, encoding: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Extraer folletos y rutAdmin escaneando la página de entidad bloque a bloque.
+
+    Camino rápido del MÉTODO 1: REGEX_VERFOLLETO_ARGS sobre el HTML crudo a medida
+    que llega, sin construir el árbol. Si no aparece ninguna serie (onclick con
+    entidades HTML, o página que solo trae la tabla) se parsea la página completa
+    con _parse_cmf_folletos_html.
+
+    Args:
+        chunks: Iterable de bloques bytes (ej. response.iter_content())
+        encoding (str): Encoding de la respuesta (default latin-1)
+
+    Returns:
+        Tuple con la lista de folletos y el rutAdmin (o None)
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding or 'latin-1')(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('latin-1')()
+    recibidos = []
+    pendiente = ''
+    folletos = []
+    series = set()
+    rut_admin = None
+
+    for chunk in chunks:
+        recibidos.append(chunk)
+        pendiente += decoder.decode(chunk)
+        ultimo_fin = 0
+        for match in REGEX_VERFOLLETO_ARGS.finditer(pendiente):
+            ultimo_fin = match.end()
+            run_fondo, serie, rut_admin_found = match.groups()
+
+            # Guardar el primer rutAdmin encontrado
+            if rut_admin_found and not rut_admin:
+                rut_admin = rut_admin_found
+                logger.info(f"[CMF] ✅ rutAdmin extraído: {rut_admin}")
+
+            # Agregar serie única
+            if serie and serie not in series:
+                series.add(serie)
+                folletos.append({
+                    'serie': serie,
+                    'runFondo': run_fondo,
+                    'rutAdmin': rut_admin_found,
+                    'encontrado': True
+                })
+                logger.debug(f"[CMF] Folleto encontrado: Serie={serie}, runFondo={run_fondo}, rutAdmin={rut_admin_found}")
+
+        # Conservar solo la cola: una llamada verFolleto puede quedar partida entre bloques
+        pendiente = pendiente[max(ultimo_fin, len(pendiente) - CMF_STREAM_TAIL):]
+
+    if not folletos:
+        return _parse_cmf_folletos_html(b''.join(recibidos))
+
+    logger.info(f"[CMF] Total folletos encontrados: {len(folletos)}, rutAdmin: {rut_admin}")
+    return folletos, rut_admin
+
+
+# inotify para esperar descargas sin polling (opcional, solo Linux)
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
+
+def _wait_for_download_inotify(download_dir: str, timeout: int, min_size_kb: int, existing_files: set) -> Optional[str]:
+    """Esperar un PDF nuevo en download_dir bloqueando en eventos de inotify
+
+    Chrome escribe en un .crdownload y lo renombra al terminar (MOVED_TO); un
+    writer directo cierra el archivo al terminar (CLOSE_WRITE). En ambos casos
+    el PDF ya está completo cuando llega el evento: no hace falta esperar a que
+    el tamaño se estabilice.
+    """
+    with INotify() as inotify:
+        inotify.add_watch(download_dir, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+
+        # Descargas que terminaron antes de registrar el watch
+        candidatos = [f for f in os.listdir(download_dir) if f.endswith('.pdf') and f not in existing_files]
+        deadline = time.monotonic() + timeout
+
+        while True:
+            for nombre in candidatos:
+                pdf_path = os.path.join(download_dir, nombre)
+                try:
+                    size = os.path.getsize(pdf_path)
+                except OSError:
+                    continue
+                if size > min_size_kb * 1024:
+                    logger.info(f"[DOWNLOAD INOTIFY] ✅ PDF downloaded: {nombre} ({size / 1024:.2f} KB)")
+                    return pdf_path
+
+            restante = deadline - time.monotonic()
+            if restante <= 0:
+                logger.error(f"[DOWNLOAD INOTIFY] Timeout after {timeout}s")
+                return None
+
+            eventos = inotify.read(timeout=int(restante * 1000))
+            candidatos = [e.name for e in eventos if e.name.endswith('.pdf') and e.name not in existing_files]
+
+
+# watchdog como alternativa multiplataforma a inotify (FSEvents en macOS,
+# ReadDirectoryChangesW en Windows); opcional
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+if WATCHDOG_AVAILABLE:
+    class _NuevosArchivosHandler(FileSystemEventHandler):
+        """Encolar los nombres de archivos creados, modificados o renombrados en el directorio vigilado"""
+
+        def __init__(self, cola: queue.Queue):
+            self.cola = cola
+
+        def on_created(self, event):
+            if not event.is_directory:
+                self.cola.put(os.path.basename(event.src_path))
+
+        def on_modified(self, event):
+            # Un .pdf escrito directamente puede crearse vacío y crecer después
+            if not event.is_directory:
+                self.cola.put(os.path.basename(event.src_path))
+
+        def on_moved(self, event):
+            # Chrome descarga a .crdownload y renombra al .pdf final al terminar
+            if not event.is_directory:
+                self.cola.put(os.path.basename(event.dest_path))
+
+
+def _wait_for_download_watchdog(download_dir: str, timeout: int, min_size_kb: int, existing_files: set) -> Optional[str]:
+    """Esperar un PDF nuevo en download_dir con eventos de watchdog (sin releer el directorio)
+
+    A diferencia de inotify no hay evento de cierre en todas las plataformas: un
+    .pdf recién creado se acepta cuando su tamaño deja de cambiar.
+    """
+    cola: queue.Queue = queue.Queue()
+    observer = Observer()
+    observer.schedule(_NuevosArchivosHandler(cola), download_dir, recursive=False)
+    observer.start()
+    try:
+        # Descargas que terminaron antes de iniciar el observer
+        candidatos = [f for f in os.listdir(download_dir) if f.endswith('.pdf') and f not in existing_files]
+        deadline = time.monotonic() + timeout
+
+        while True:
+            for nombre in candidatos:
+                pdf_path = os.path.join(download_dir, nombre)
+                size = _pdf_file_size(pdf_path)
+                if size > min_size_kb * 1024:
+                    time.sleep(0.2)
+                    if _pdf_file_size(pdf_path) == size:
+                        logger.info(f"[DOWNLOAD WATCHDOG] ✅ PDF downloaded: {nombre} ({size / 1024:.2f} KB)")
+                        return pdf_path
+                    # Todavía escribiéndose: volver a mirarlo en la próxima vuelta
+                    cola.put(nombre)
+
+            restante = deadline - time.monotonic()
+            if restante <= 0:
+                logger.error(f"[DOWNLOAD WATCHDOG] Timeout after {timeout}s")
+                return None
+
+            try:
+                nombres = [cola.get(timeout=restante)]
+            except queue.Empty:
+                continue
+            while not cola.empty():
+                nombres.append(cola.get_nowait())
+            # Los .crdownload se ignoran hasta que llega el .pdf final
+            candidatos = list(dict.fromkeys(n for n in nombres if n.endswith('.pdf') and n not in existing_files))
+    finally:
+        observer.stop()
+        observer.join(timeout=1)
+
+
 def _wait_for_download_complete(download_dir: str, timeout: int = 60, min_size_kb: int = 10, existing_files: set = None) -> Optional[str]:
     """Poll download directory until PDF download completes (no .crdownload)
 
@@ -145,18 +730,33 @@ def _wait_for_download_complete(download_dir: str, timeout: int = 60, min_size_k
         existing_files = set(os.listdir(download_dir))
         logger.warning(f"[DOWNLOAD POLL] No se pasó existing_files - usando estado actual ({len(existing_files)} archivos)")
 
+    if INOTIFY_AVAILABLE:
+        try:
+            return _wait_for_download_inotify(download_dir, timeout, min_size_kb, existing_files)
+        except OSError as e:
+            # Límite de watches agotado, filesystem sin soporte, etc.: seguir con polling
+            logger.debug(f"[DOWNLOAD POLL] inotify no disponible ({e}), usando polling")
+    elif WATCHDOG_AVAILABLE:
+        try:
+            return _wait_for_download_watchdog(download_dir, timeout, min_size_kb, existing_files)
+        except OSError as e:
+            logger.debug(f"[DOWNLOAD POLL] watchdog no disponible ({e}), usando polling")
+
     last_files = existing_files.copy()
 
     while time.time() - start_time < timeout:
         try:
-            all_files = set(os.listdir(download_dir))
-            pdf_files = [f for f in all_files if f.endswith('.pdf')]
-            new_pdfs = [f for f in pdf_files if f not in last_files]
+            # scandir: DirEntry trae nombre y path armados y cachea su stat()
+            with os.scandir(download_dir) as it:
+                pdf_entries = {entry.name: entry for entry in it if entry.name.endswith('.pdf')}
+            # Diferencia de conjuntos en C (keys() es set-like), sin otra pasada en Python
+            new_pdfs = list(pdf_entries.keys() - last_files)
 
             if new_pdfs:
-                pdf_path = os.path.join(download_dir, new_pdfs[0])
-                initial_size = os.path.getsize(pdf_path)
+                pdf_path = pdf_entries[new_pdfs[0]].path
+                initial_size = pdf_entries[new_pdfs[0]].stat().st_size
                 time.sleep(1)
+                # Stat fresco: el cacheado del DirEntry es de antes de la espera
                 current_size = os.path.getsize(pdf_path)
 
                 if current_size == initial_size and current_size > (min_size_kb * 1024):
@@ -164,7 +764,7 @@ def _wait_for_download_complete(download_dir: str, timeout: int = 60, min_size_k
                     logger.info(f"[DOWNLOAD POLL] ✅ PDF downloaded: {new_pdfs[0]} ({size_kb:.2f} KB)")
                     return pdf_path
 
-            last_files = all_files
+            last_files = set(pdf_entries)
             time.sleep(0.5)
 
         except Exception as e:
@@ -175,6 +775,701 @@ def _wait_for_download_complete(download_dir: str, timeout: int = 60, min_size_k
     return None
 
 
+def _drain_cdp_events(driver) -> None:
+    """Descartar los eventos acumulados en el performance log de ChromeDriver"""
+    try:
+        driver.get_log('performance')
+    except Exception:
+        pass
+
+
+def _cdp_download_path(download_dir: str, nombre: str, existing_files: Optional[set]) -> Optional[str]:
+    """
+    Path real de una descarga terminada cuyo nombre sugerido es `nombre`.
+
+    Si ya existía un archivo con ese nombre Chrome guarda la descarga como
+    "nombre (1).pdf", "nombre (2).pdf", ...: el nombre sugerido apuntaría al PDF
+    viejo (de otro fondo), así que se busca el renombrado que no estaba antes.
+
+    Args:
+        download_dir: Directorio de descargas configurado en el navegador
+        nombre: suggestedFilename del evento Page.downloadWillBegin
+        existing_files: Archivos del directorio antes del click (None = no se conocen)
+
+    Returns:
+        Path del archivo nuevo, o None si no se encuentra
+    """
+    if existing_files is None or nombre not in existing_files:
+        return os.path.join(download_dir, nombre)
+
+    base, ext = os.path.splitext(nombre)
+    renombrado = re.compile(rf'^{re.escape(base)} \(\d+\){re.escape(ext)}$')
+    try:
+        nuevos = [entry for entry in os.scandir(download_dir)
+                  if entry.name not in existing_files and renombrado.match(entry.name)]
+    except OSError:
+        return None
+    if not nuevos:
+        return None
+    return max(nuevos, key=lambda entry: entry.stat().st_mtime).path
+
+
+def _wait_for_download_cdp(driver, download_dir: str, timeout: int = 60, min_size_kb: int = 10,
+                           existing_files: set = None) -> Optional[str]:
+    """Esperar una descarga usando los eventos DevTools de Chrome (sin mirar el disco)
+
+    ChromeDriver reenvía al performance log los eventos CDP Page.downloadWillBegin
+    (guid + suggestedFilename) y Page.downloadProgress (state). El PDF está
+    completo cuando llega state == 'completed' para ese guid, así que no hay que
+    comparar listados del directorio ni esperar a que el tamaño se estabilice.
+
+    Args:
+        driver: webdriver.Chrome creado con goog:loggingPrefs performance=ALL
+        download_dir: Directorio de descargas configurado en el navegador
+        timeout: Maximum seconds to wait
+        min_size_kb: Minimum file size in KB to consider valid
+        existing_files: Archivos del directorio antes del click, para no tomar un
+            PDF viejo con el mismo nombre sugerido (ver _cdp_download_path)
+
+    Returns:
+        Path exacto del PDF descargado, o None si no llegó el evento de fin
+    """
+    nombres: Dict[str, str] = {}
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        for entry in driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+
+            if method == 'Page.downloadWillBegin':
+                nombres[params.get('guid')] = params.get('suggestedFilename', '')
+                logger.debug(f"[DOWNLOAD CDP] Inicio: {params.get('suggestedFilename')} ({params.get('guid')})")
+            elif method == 'Page.downloadProgress' and params.get('guid') in nombres:
+                state = params.get('state')
+                if state == 'canceled':
+                    logger.error(f"[DOWNLOAD CDP] Descarga cancelada: {nombres[params['guid']]}")
+                    return None
+                if state == 'completed':
+                    pdf_path = _cdp_download_path(download_dir, nombres[params['guid']], existing_files)
+                    if pdf_path is None:
+                        logger.warning(f"[DOWNLOAD CDP] Descarga completa pero no se encontró el archivo nuevo: {nombres[params['guid']]}")
+                        return None
+                    size = _pdf_file_size(pdf_path)
+                    if size > min_size_kb * 1024:
+                        logger.info(f"[DOWNLOAD CDP] ✅ PDF downloaded: {nombres[params['guid']]} ({size / 1024:.2f} KB)")
+                        return pdf_path
+                    logger.warning(f"[DOWNLOAD CDP] Descarga completa pero inválida: {pdf_path} ({size} bytes)")
+                    return None
+
+        time.sleep(0.1)
+
+    logger.warning(f"[DOWNLOAD CDP] Sin evento de fin de descarga tras {timeout}s")
+    return None
+
+
+@dataclass(frozen=True)
+class FundRecord:
+    """
+    Registro de un fondo del listado CMF (arrays JavaScript fondos_XXX).
+
+    Usa __slots__ en lugar de un dict por fondo: el listado CMF tiene miles de
+    fondos y todos comparten el mismo esquema fijo. Expone get(), [] e `in` para
+    que los callers que esperaban un dict sigan funcionando.
+    """
+    __slots__ = ('rut_fondo', 'rut_admin', 'nombre', 'full_id', 'source')
+
+    rut_fondo: str  # RUT del fondo (ej: "9049-2")
+    rut_admin: str  # RUT de la administradora (ej: "96767630")
+    nombre: str
+    full_id: str
+    source: str
+
+    def get(self, key: str, default=None):
+        """Acceso compatible con dict.get()"""
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str):
+        """Acceso compatible con dict[key]"""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def to_dict(self) -> Dict:
+        """Convertir a dict (para serializar en JSON/Excel)"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+# orjson para parsear respuestas JSON (opcional, fallback a json stdlib)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def parse_json_response(response: requests.Response):
+    """
+    Parsear el cuerpo JSON de una respuesta HTTP.
+
+    Usa orjson directamente sobre los bytes de response.content si está
+    instalado; si no, cae a response.json().
+
+    Args:
+        response: Respuesta HTTP con cuerpo JSON
+
+    Returns:
+        Objeto Python decodificado (dict/list)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def write_json_atomic(path: str, data) -> None:
+    """
+    Escribir un JSON a disco de forma atómica (archivo temporal + os.replace).
+
+    Serializa con orjson si está instalado. Si el proceso muere a mitad de la
+    escritura, el archivo anterior queda intacto en lugar de truncado.
+
+    Args:
+        path: Ruta del archivo JSON
+        data: Objeto serializable (dict/list)
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+    # Temporal por proceso: varios workers pueden escribir el mismo caché
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+# Aho-Corasick para matching de nombres de fondos (opcional)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Separador del blob de nombres/symbols del índice Fintual
+FINTUAL_INDEX_SEP = '\x00'
+
+# Tablas de clasificación de instrumentos: (categoría, patrones) en orden de prioridad.
+# Los patrones se buscan como substrings, no como tokens: deben coincidir con plurales
+# y compuestos ('bono' en 'Bonos Gobierno', 'accion' en 'Acciones Chilenas'), que son
+# justamente las categorías que luego recibe _classify_investment_type
+CLASIFICACION_INSTRUMENTOS_DINAMICA = (
+    ('Bonos Gobierno', ('bono gobierno', 'treasury', 'btc', 'bono central', 'bcp', 'tesoreria')),
+    ('Bonos Corporativos', ('bono empresa', 'corporate bond', 'bono corporativo', 'empresa', 'corp')),
+    ('Acciones Chilenas', ('accion chile', 'equity chile', 'bolsa santiago', 'ipsa', 'chile')),
+    ('Acciones Extranjeras', ('accion extranjera', 'foreign equity', 'international', 'usa', 'europe', 'global')),
+    ('Depósitos a Plazo', ('deposito plazo', 'deposit', 'plazo fijo', 'tiempo deposito')),
+    ('Cuotas de Fondos', ('cuota fondo', 'fund share', 'mutual fund', 'fondo mutuo', 'etf')),
+    ('Instrumentos Moneda', ('moneda', 'currency', 'forex', 'divisa', 'cambio')),
+    ('Derivados Financieros', ('derivado', 'forward', 'future', 'swap', 'option')),
+    ('Bienes Raíces', ('real estate', 'inmobiliario', 'property', 'reit')),
+    ('Materias Primas', ('commodity', 'oro', 'gold', 'petroleo', 'oil', 'copper', 'cobre')),
+)
+
+CLASIFICACION_INSTRUMENTOS = (
+    ('Bonos', ('bono', 'bond', 'btc', 'treasury')),
+    ('Acciones', ('accion', 'equity', 'stock', 'share')),
+    ('Depósitos a Plazo', ('deposito', 'plazo', 'deposit')),
+    ('Cuotas de Fondos', ('cuota', 'fondo', 'fund')),
+    ('Instrumentos de Moneda', ('moneda', 'currency', 'forex')),
+)
+
+CLASIFICACION_TIPO_INVERSION = (
+    ('Renta Fija', ('bono', 'bond', 'treasury', 'btc')),
+    ('Renta Variable', ('accion', 'equity', 'stock')),
+    ('Depósito', ('deposito', 'plazo', 'deposit')),
+    ('Fondo de Inversión', ('cuota', 'fondo', 'fund')),
+)
+
+# Tipo de fondo declarado en el folleto: se busca sobre el texto completo del PDF
+CLASIFICACION_TIPO_FONDO_PDF = (
+    ('Conservador', ('conservador', 'capital garantizado', 'preservation', 'preservación')),
+    ('Agresivo', ('agresivo', 'aggressive', 'growth', 'crecimiento', 'accionario')),
+    ('Balanceado', ('balanceado', 'balanced', 'mixto', 'mixed', 'moderado')),
+    ('Dinámico', ('dinámico', 'dynamic', 'flexible')),
+    ('Liquidez', ('liquidez', 'liquidity', 'money market', 'monetario', 'disponible')),
+)
+
+
+# Un patrón por cada campo que lee _extract_extended_data_from_pdf, con el mismo
+# disparador que usa el extractor y, cuando está en la misma línea, un valor (un
+# índice que solo nombra las secciones no basta). La extracción de texto se detiene
+# cuando aparecieron todos más PDF_PAGINAS_EXTRA páginas (secciones que siguen en
+# la página siguiente); si un campo no aparece se lee el documento completo
+PDF_CAMPOS_OBJETIVO = (
+    # Tipo de fondo (Patrón 1)
+    re.compile('|'.join(re.escape(k) for _, keywords in CLASIFICACION_TIPO_FONDO_PDF for k in keywords),
+               re.IGNORECASE),
+    # Escala de riesgo R1-R7 (Patrón 2, distingue mayúsculas igual que el extractor)
+    re.compile(r'\bR[1-7]\b'),
+    # Tolerancia / perfil del inversionista (Patrón 2B)
+    re.compile(r'perfil (?:del )?inversionista[^\n]*(?:conservador|moderado|balanceado|agresivo|arriesgado)',
+               re.IGNORECASE),
+    # Horizonte de inversión (Patrón 3)
+    re.compile(r'horizonte[^\n]*(?:plazo|\d+\s*(?:meses|años?))', re.IGNORECASE),
+    # Comisión de administración (Patrón 4)
+    re.compile(r'(?:remun|tac serie)[^\n]*\d', re.IGNORECASE),
+    # Comisión de rescate (Patrón 5)
+    re.compile(r'(?:comisión máxima|comision rescate)[^\n]*\d+[.,]\d+', re.IGNORECASE),
+    # Rescatable / plazo de rescate / duración (Patrón 5B)
+    re.compile(r'rescatable|sin rescate|liquidez|reembolso', re.IGNORECASE),
+    re.compile(r'(?:plazo de rescate|días para rescate|plazo para rescate)[^\n]*\d+\s*días?', re.IGNORECASE),
+    re.compile(r'(?:duración|plazo del fondo|vigencia del fondo)[^\n]*\d+\s*(?:años?|meses)|indefinido|sin plazo',
+               re.IGNORECASE),
+    # Monto mínimo (Patrón 5C; el valor puede estar en las líneas siguientes)
+    re.compile(r'monto mínimo|inversión mínima|aporte mínimo|capital mínimo|monto inicial|inversión inicial|cuota mínima',
+               re.IGNORECASE),
+    # Rentabilidad a 1 año (Patrón 6)
+    REGEX_RENT_1ANO,
+    # Patrimonio (Patrón 7)
+    re.compile(r'patrimonio (?:serie|total)[^\n]*\d', re.IGNORECASE),
+    # Composición: líneas "Activo XX,XX%" (Patrón 8)
+    re.compile(r'[A-Za-záéíóúñÁÉÍÓÚÑ\s\.]+\s+\d+[\.,]?\d*\s*%'),
+)
+
+# Páginas que se siguen leyendo después de la que completa PDF_CAMPOS_OBJETIVO
+PDF_PAGINAS_EXTRA = 1
+
+
+def _build_pattern_automaton(tabla: Tuple) -> Optional['ahocorasick.Automaton']:
+    """
+    Construir un autómata Aho-Corasick para una tabla de clasificación.
+
+    Cada patrón guarda la prioridad (índice) de su categoría; si un patrón
+    se repite se conserva la categoría de mayor prioridad.
+
+    Args:
+        tabla (Tuple): Pares (categoría, patrones) en orden de prioridad
+
+    Returns:
+        Autómata listo para buscar, o None si pyahocorasick no está instalado
+    """
+    if not AHOCORASICK_AVAILABLE:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for prioridad, (_, patrones) in enumerate(tabla):
+        for patron in patrones:
+            if patron not in automaton:
+                automaton.add_word(patron, prioridad)
+    automaton.make_automaton()
+    return automaton
+
+
+def _match_pattern_category(texto_lower: str, tabla: Tuple, automaton) -> Optional[str]:
+    """
+    Retornar la primera categoría de la tabla con algún patrón contenido en el texto.
+
+    Con autómata se hace una sola pasada sobre el texto y se elige la categoría
+    de mayor prioridad entre las coincidencias; sin él, se recorre la tabla.
+
+    Args:
+        texto_lower (str): Texto ya en minúsculas
+        tabla (Tuple): Pares (categoría, patrones) en orden de prioridad
+        automaton: Autómata de _build_pattern_automaton o None
+
+    Returns:
+        Nombre de la categoría o None si ningún patrón coincide
+    """
+    if automaton is not None:
+        prioridad = min((p for _, p in automaton.iter(texto_lower)), default=None)
+        return tabla[prioridad][0] if prioridad is not None else None
+
+    for categoria, patrones in tabla:
+        if any(patron in texto_lower for patron in patrones):
+            return categoria
+    return None
+
+
+AUTOMATON_INSTRUMENTOS_DINAMICA = _build_pattern_automaton(CLASIFICACION_INSTRUMENTOS_DINAMICA)
+AUTOMATON_INSTRUMENTOS = _build_pattern_automaton(CLASIFICACION_INSTRUMENTOS)
+AUTOMATON_TIPO_INVERSION = _build_pattern_automaton(CLASIFICACION_TIPO_INVERSION)
+AUTOMATON_TIPO_FONDO_PDF = _build_pattern_automaton(CLASIFICACION_TIPO_FONDO_PDF)
+
+# Los nombres de instrumentos se repiten mucho dentro de una cartera (y entre fondos):
+# las clasificaciones son puras, así que se memoizan por nombre crudo a nivel de módulo
+CLASIFICACION_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CLASIFICACION_CACHE_SIZE)
+def _classify_instrument_dynamic_cached(instrument_name: str) -> str:
+    """Versión memoizada de FondosMutuosProcessor._classify_instrument_dynamic"""
+    name_lower = instrument_name.lower()
+
+    # Buscar coincidencias (patrones expandidos, una pasada con Aho-Corasick si está disponible)
+    category = _match_pattern_category(name_lower, CLASIFICACION_INSTRUMENTOS_DINAMICA,
+                                       AUTOMATON_INSTRUMENTOS_DINAMICA)
+    if category:
+        return category
+
+    # Clasificación por longitud y características del texto
+    if len(name_lower) < 10:
+        return 'Instrumentos de Corto Plazo'
+    elif any(char.isdigit() for char in name_lower):
+        return 'Instrumentos con Vencimiento'
+    else:
+        return 'Otros Instrumentos'
+
+
+@lru_cache(maxsize=CLASIFICACION_CACHE_SIZE)
+def _classify_instrument_cached(instrument_name: str) -> str:
+    """Versión memoizada de FondosMutuosProcessor._classify_instrument"""
+    category = _match_pattern_category(instrument_name.lower(), CLASIFICACION_INSTRUMENTOS, AUTOMATON_INSTRUMENTOS)
+    return category or 'Otros Instrumentos'
+
+
+@lru_cache(maxsize=CLASIFICACION_CACHE_SIZE)
+def _classify_investment_type_cached(activo: str) -> str:
+    """Versión memoizada de FondosMutuosProcessor._classify_investment_type"""
+    category = _match_pattern_category(activo.lower(), CLASIFICACION_TIPO_INVERSION, AUTOMATON_TIPO_INVERSION)
+    return category or 'Otros Instrumentos'
+
+# httpx para descargar páginas CMF en paralelo (opcional, async + HTTP/2 si h2 está instalado)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# lxml como parser de BeautifulSoup: tokenizer en C, varias veces más rápido que
+# html.parser (puro Python) en las páginas de CMF (opcional)
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# PyMuPDF para extraer texto de PDFs (opcional, fallback a pdfplumber)
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# pdftotext (poppler) como alternativa rápida a pdfplumber cuando PyMuPDF no está.
+# Lanzar subprocesos debe habilitarse explícitamente (despliegues sandboxed)
+PDFTOTEXT_PATH = shutil.which('pdftotext') if os.getenv('FDP_ALLOW_SUBPROCESS') == '1' else None
+# pdfinfo (mismo paquete poppler) da el total de páginas cuando pdftotext se corta con -l
+PDFINFO_PATH = shutil.which('pdfinfo') if PDFTOTEXT_PATH else None
+PDFTOTEXT_TIMEOUT = 20
+# Páginas por llamada a pdftotext (la extracción se corta entre bloques)
+PDFTOTEXT_PAGES_PER_CALL = 5
+
+# xlsxwriter para escribir Excel en streaming (opcional, fallback a openpyxl)
+try:
+    import xlsxwriter  # noqa: F401
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+# Sin constant_memory: DataFrame.to_excel escribe las celdas columna por columna y
+# en ese modo xlsxwriter descarta las filas ya "cerradas" (se pierden datos)
+EXCEL_ENGINE = 'xlsxwriter' if XLSXWRITER_AVAILABLE else 'openpyxl'
+
+
+def _pdf_page_count_pdfinfo(pdf_path: str) -> Optional[int]:
+    """Total de páginas según pdfinfo, o None si no está disponible o falla"""
+    if not PDFINFO_PATH:
+        return None
+    try:
+        proc = subprocess.run([PDFINFO_PATH, pdf_path], capture_output=True, timeout=PDFTOTEXT_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug(f"[PDF] pdfinfo falló: {e}")
+        return None
+    match = re.search(rb'^Pages:\s+(\d+)', proc.stdout, re.MULTILINE)
+    return int(match.group(1)) if proc.returncode == 0 and match else None
+
+
+def _pdftotext_pages(pdf_path: str, primera: int, ultima: int) -> Optional[List[str]]:
+    """
+    Texto de las páginas primera..ultima (1-based, inclusive) con el binario pdftotext.
+
+    Returns:
+        Lista con el texto de cada página (menos páginas si el documento termina
+        antes de ultima), o None si pdftotext falla (también si primera está
+        después de la última página)
+    """
+    cmd = [PDFTOTEXT_PATH, '-enc', 'UTF-8', '-f', str(primera), '-l', str(ultima), pdf_path, '-']
+
+    try:
+        proc = subprocess.run(cmd, capture_output=True, timeout=PDFTOTEXT_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug(f"[PDF] pdftotext falló: {e}")
+        return None
+
+    if proc.returncode != 0:
+        logger.debug(f"[PDF] pdftotext terminó con código {proc.returncode} (páginas {primera}-{ultima})")
+        return None
+
+    # pdftotext cierra cada página con un form feed
+    return proc.stdout.decode('utf-8', 'ignore').split('\f')[:-1]
+
+
+def _extract_pdf_text_pdftotext(pdf_path: str, max_pages: Optional[int] = None) -> Optional[Tuple[Iterator[str], Callable[[], Optional[int]]]]:
+    """
+    Extraer texto con el binario pdftotext, de a PDFTOTEXT_PAGES_PER_CALL páginas.
+
+    Las páginas se piden a medida que se consumen: si el llamador deja de iterar
+    (campos objetivo encontrados) no se extrae el resto del documento.
+
+    Args:
+        pdf_path (str): Ruta al archivo PDF
+        max_pages (int): Máximo de páginas a extraer (None = todas)
+
+    Returns:
+        Tuple (iterador de páginas, función que da el total de páginas del PDF) o
+        None si pdftotext falla en el primer bloque. El total es None si la
+        extracción no llegó al final del documento y pdfinfo no puede darlo
+    """
+    ultima = PDFTOTEXT_PAGES_PER_CALL if not max_pages else min(PDFTOTEXT_PAGES_PER_CALL, max_pages)
+    primer_bloque = _pdftotext_pages(pdf_path, 1, ultima)
+    if primer_bloque is None:
+        return None
+
+    estado = {'leidas': 0, 'fin': False}
+
+    def _paginas():
+        bloque, primera, ultima_bloque = primer_bloque, 1, ultima
+        while True:
+            yield from bloque
+            estado['leidas'] += len(bloque)
+            if len(bloque) < ultima_bloque - primera + 1:
+                # Bloque incompleto: se llegó a la última página
+                estado['fin'] = True
+                return
+            primera = ultima_bloque + 1
+            if max_pages and primera > max_pages:
+                return
+            ultima_bloque = primera + PDFTOTEXT_PAGES_PER_CALL - 1
+            if max_pages:
+                ultima_bloque = min(ultima_bloque, max_pages)
+            bloque = _pdftotext_pages(pdf_path, primera, ultima_bloque)
+            if bloque is None:
+                # pdftotext rechaza un rango que empieza después de la última página:
+                # el bloque anterior terminaba justo en el final del documento
+                estado['fin'] = True
+                return
+
+    def _total() -> Optional[int]:
+        if estado['fin']:
+            return estado['leidas']
+        # Cortado antes del final: las páginas leídas no son el total del documento
+        return _pdf_page_count_pdfinfo(pdf_path)
+
+    return _paginas(), _total
+
+
+def _join_pages_until(paginas, stop_patterns, extra_pages: int = PDF_PAGINAS_EXTRA) -> Tuple[str, int]:
+    """
+    Concatenar el texto de las páginas, cortando cuando todos los patrones aparecieron.
+
+    Args:
+        paginas: Iterable con el texto de cada página (se consume a demanda)
+        stop_patterns: Regex compilados; sin patrones se leen todas las páginas
+        extra_pages: Páginas que se leen después de la que completa los patrones
+            (una tabla o sección que sigue en la página siguiente)
+
+    Returns:
+        Tuple (texto, páginas leídas)
+    """
+    pendientes = list(stop_patterns or ())
+    partes = []
+    restantes = None
+    for pagina in paginas:
+        partes.append(pagina)
+        if restantes is not None:
+            restantes -= 1
+        elif pendientes:
+            pendientes = [p for p in pendientes if not p.search(pagina)]
+            if not pendientes:
+                restantes = extra_pages
+        if restantes == 0:
+            break
+    return ''.join(partes), len(partes)
+
+
+def extract_pdf_text(pdf_path: str, max_pages: Optional[int] = None, stop_patterns=None) -> Tuple[str, int, str]:
+    """
+    Extraer el texto de un PDF.
+
+    Usa PyMuPDF si está instalado (mucho más rápido), luego pdftotext si está
+    habilitado (FDP_ALLOW_SUBPROCESS=1) y pdfplumber como último fallback.
+
+    Args:
+        pdf_path (str): Ruta al archivo PDF
+        max_pages (int): Máximo de páginas a extraer (None = todas)
+        stop_patterns: Regex compilados; la extracción se detiene PDF_PAGINAS_EXTRA
+            páginas después de la primera en la que ya aparecieron todos (None = no detenerse)
+
+    Returns:
+        Tuple (texto, cantidad total de páginas, backend usado). Con pdftotext
+        cortado por max_pages y sin pdfinfo la cantidad es None (desconocida)
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+    """
+    # Los backends lanzan excepciones distintas; normalizar a FileNotFoundError
+    if not os.path.exists(pdf_path):
+        raise FileNotFoundError(pdf_path)
+
+    def _log_corte(texto, leidas, total, backend):
+        if stop_patterns and total and leidas < total:
+            logger.info(f"[PDF] Campos objetivo encontrados, leídas {leidas}/{total} páginas: "
+                        f"se omiten las {total - leidas} restantes")
+        return texto, total, backend
+
+    def _resultado(texto_paginas, total, backend):
+        texto, leidas = _join_pages_until(texto_paginas, stop_patterns)
+        return _log_corte(texto, leidas, total, backend)
+
+    if PYMUPDF_AVAILABLE:
+        with pymupdf.open(pdf_path) as doc:
+            return _resultado((page.get_text('text') for page in islice(doc, max_pages)),
+                              doc.page_count, 'pymupdf')
+
+    if PDFTOTEXT_PATH:
+        extraido = _extract_pdf_text_pdftotext(pdf_path, max_pages)
+        if extraido is not None:
+            paginas, total = extraido
+            texto, leidas = _join_pages_until(paginas, stop_patterns)
+            return _log_corte(texto, leidas, total(), 'pdftotext')
+
+    # pdfplumber (y pdfminer) solo se importan si se llega al último fallback
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return _resultado((page.extract_text() or '' for page in pdf.pages[:max_pages]),
+                          len(pdf.pages), 'pdfplumber')
+
+
+def _pdf_file_size(path: str) -> int:
+    """Tamaño del archivo en bytes con un solo stat, o -1 si no existe"""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return -1
+
+
+@lru_cache(maxsize=1)
+def _detect_chrome_binary() -> Optional[str]:
+    """
+    Ubicar el ejecutable de Chrome (una vez por proceso: no cambia durante la ejecución).
+
+    Revisa primero CHROME_BINARY_PATH y después las ubicaciones típicas de cada plataforma.
+
+    Returns:
+        Path al binario de Chrome, o None para usar el default del sistema
+    """
+    chrome_binary = os.getenv('CHROME_BINARY_PATH')
+
+    if not chrome_binary:
+        # Auto-detect based on platform
+        import platform
+        system = platform.system()
+
+        if system == 'Darwin':  # macOS
+            chrome_binary = '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
+        elif system == 'Linux':
+            # Try common Linux locations
+            for path in ['/usr/bin/google-chrome', '/usr/bin/chromium-browser', '/usr/bin/chromium']:
+                if os.path.exists(path):
+                    chrome_binary = path
+                    break
+        elif system == 'Windows':
+            # Try common Windows locations
+            for path in [
+                r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+                r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe'
+            ]:
+                if os.path.exists(path):
+                    chrome_binary = path
+                    break
+
+    if chrome_binary and os.path.exists(chrome_binary):
+        return chrome_binary
+    return None
+
+
+def _portfolio_stats(composicion: List[Dict]) -> Tuple[int, float]:
+    """
+    Cantidad de activos y concentración máxima de una composición, en una pasada.
+
+    Args:
+        composicion (List[Dict]): Items con clave 'porcentaje' (fracción 0-1)
+
+    Returns:
+        Tuple (total de activos, porcentaje máximo); porcentajes None cuentan como 0
+    """
+    concentracion_max = 0.0
+    total = 0
+    for item in composicion:
+        porcentaje = item.get('porcentaje', 0) or 0
+        if porcentaje > concentracion_max:
+            concentracion_max = porcentaje
+        total += 1
+    return total, concentracion_max
+
+
+def _filas_encabezado(columnas: pd.Index) -> List[List[str]]:
+    """
+    Filas de encabezado (<thead>/<th>) que pandas.read_html movió a los nombres de columna.
+
+    Args:
+        columnas (pd.Index): df.columns de una tabla leída con read_html
+
+    Returns:
+        Una lista de celdas por fila de encabezado ([] si la tabla no tiene encabezado).
+        Las celdas vacías ('Unnamed: ...') se devuelven como ''
+    """
+    if columnas.nlevels == 1 and columnas.inferred_type == 'integer':
+        # Sin encabezado read_html numera las columnas 0..n-1
+        return []
+    return [['' if str(celda).startswith('Unnamed:') else str(celda) for celda in columnas.get_level_values(nivel)]
+            for nivel in range(columnas.nlevels)]
+
+
+def _excel_column_widths(df: pd.DataFrame, max_width: int = 100) -> List[int]:
+    """
+    Calcular el ancho de cada columna de una hoja Excel a partir del DataFrame.
+
+    Args:
+        df (pd.DataFrame): Datos de la hoja (el header cuenta como una celda más)
+        max_width (int): Ancho máximo permitido por columna
+
+    Returns:
+        Lista de anchos en el orden de df.columns
+    """
+    widths = []
+    for col in df.columns:
+        max_length = max(df[col].astype(str).str.len().max() if len(df) else 0, len(str(col)))
+        widths.append(min(int(max_length) + 2, max_width))
+    return widths
+
+
 # Importar monitor de CMF (opcional)
 try:
     from cmf_monitor import CMFMonitor
@@ -183,14 +1478,61 @@ except ImportError:
     CMF_MONITOR_AVAILABLE = False
     logger.debug("cmf_monitor no disponible, salteando validación de salud")
 
+
+# Procesadores con un Chrome abierto. Un único hook de atexit cierra los que sigan vivos
+# al terminar el proceso; el WeakSet no los mantiene vivos ni acumula un hook por driver
+_PROCESADORES_CON_DRIVER: 'weakref.WeakSet' = weakref.WeakSet()
+
+
+def _cerrar_drivers_abiertos() -> None:
+    """Cerrar los navegadores que quedaron abiertos al terminar el proceso"""
+    for procesador in list(_PROCESADORES_CON_DRIVER):
+        procesador._close_driver()
+
+
+atexit.register(_cerrar_drivers_abiertos)
+
 class FondosMutuosProcessor:
     """Clase para procesar datos de fondos mutuos desde múltiples fuentes CON SCRAPING REAL"""
 
+    # UserAgent() carga su base de user agents al construirse: una sola instancia
+    # compartida por todos los procesadores, creada en el primer uso
+    _UA = None
+    _UA_LOCK = threading.Lock()
+
+    @classmethod
+    def _get_ua(cls) -> UserAgent:
+        """Obtener (creando una sola vez) el UserAgent compartido"""
+        if cls._UA is None:
+            with cls._UA_LOCK:
+                if cls._UA is None:
+                    cls._UA = UserAgent()
+        return cls._UA
+
+    @property
+    def ua(self) -> UserAgent:
+        """UserAgent compartido (se crea recién al primer acceso)"""
+        return self._get_ua()
+
+    # ChromeDriverManager().install() revisa su caché en disco, parsea JSON y compara
+    # versiones en cada llamada: el path del chromedriver se resuelve una vez por proceso
+    _CHROMEDRIVER_PATH: Optional[str] = None
+
+    @classmethod
+    def _get_chromedriver_path(cls) -> str:
+        """Obtener (resolviendo una sola vez) el path del chromedriver"""
+        if cls._CHROMEDRIVER_PATH is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            cls._CHROMEDRIVER_PATH = ChromeDriverManager().install()
+        return cls._CHROMEDRIVER_PATH
+
     def __init__(self):
         self.openai_key = os.getenv('OPENAI_API_KEY')
-        self.ua = UserAgent()
         self.session = requests.Session()
 
+        # Índice del listado de Fintual (se construye en la primera búsqueda)
+        self._fintual_index = None
+
         # Headers realistas para evitar bloqueos (mejorados para evitar 403)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -205,21 +1547,101 @@ class FondosMutuosProcessor:
             'Cache-Control': 'max-age=0'
         })
 
+        # Retry a nivel de transporte para errores de conexión (DNS, connect timeout, reset)
+        # con backoff exponencial. Los reintentos por status HTTP (404/503) siguen a cargo
+        # de request_with_retry, por eso read/status no se reintentan aquí.
+        transport_retry = Retry(total=3, connect=3, read=0, backoff_factor=0.5,
+                                allowed_methods=None, raise_on_status=False)
+        # Pool de 32 conexiones keep-alive (default 10): con descargas concurrentes el
+        # pool chico descarta conexiones y obliga a repetir el handshake TLS
+        adapter = HTTPAdapter(max_retries=transport_retry, pool_connections=32,
+                              pool_maxsize=32, pool_block=False)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # CMF (un solo host): además reintentar 502/504 del gateway, que también afectan
+        # al POST de ver_folleto_fm.php y a la descarga del PDF (no pasan por
+        # request_with_retry). 503 queda fuera para no multiplicar los reintentos de
+        # request_with_retry. requests elige el adapter por el prefijo más largo.
+        cmf_retry = Retry(total=3, connect=3, read=0, status=2, backoff_factor=0.5,
+                          status_forcelist=[502, 504], allowed_methods=None,
+                          raise_on_status=False)
+        self.session.mount('https://www.cmfchile.cl/',
+                           HTTPAdapter(max_retries=cmf_retry, pool_connections=1,
+                                       pool_maxsize=32, pool_block=False))
+
         if not self.openai_key:
             logger.warning("OPENAI_API_KEY no encontrada, la generación de descripciones no funcionará")
 
+        # Prompt de descripciones: se lee una sola vez (no en cada fondo)
+        prompt_path = 'prompts/fondos_prompt.txt'
+        try:
+            with open(prompt_path, 'r', encoding='utf-8') as f:
+                self._prompt_template = f.read()
+        except FileNotFoundError:
+            self._prompt_template = self._get_default_prompt()
+
+        # Clientes OpenAI reutilizables (se crean en la primera descripción)
+        self._openai_client = None
+        self._async_openai_client = None
+
+        # Executor para descargar el folleto PDF en paralelo a la búsqueda CMF (se crea al usarlo).
+        # Solo corre los pasos HTTP: nunca toma el navegador compartido
+        self._pdf_executor: Optional[ThreadPoolExecutor] = None
+
+        # Chrome headless compartido entre descargas (se crea en el primer uso). El lock
+        # serializa su uso: la descarga especulativa corre en otro hilo
+        self._driver = None
+        self._driver_download_dir: Optional[str] = None
+        self._driver_cdp_downloads = False
+        # Screenshot de la página cuando Selenium no encuentra el folleto (debugging)
+        self.debug_screenshots = os.getenv('FONDO_DEBUG_SCREENSHOTS', '0') == '1'
+        self._driver_lock = threading.Lock()
+
+        # Caché de descripciones IA: el prompt es función determinista de los datos del fondo
+        self.ai_cache_path = 'cache/ai_description_cache.json'
+        self._ai_description_cache: Optional[Dict[str, str]] = None
+
         # SISTEMA DE CACHÉ DE PDFs
         self.cache_dir = 'cache/pdfs'
+        self.cache_db_path = 'cache/pdf_cache_index.db'
+        # Índice JSON anterior: se migra a SQLite al inicializar
         self.cache_index_path = 'cache/pdf_cache_index.json'
+        self._cache_conn: Optional[sqlite3.Connection] = None
+        self._cache_lock = threading.Lock()
         self.cache_expiration_days = int(os.getenv('PDF_CACHE_EXPIRATION_DAYS', '30'))
 
         # Estadísticas de caché
         self.cache_stats = {
             'hits': 0,
             'misses': 0,
-            'downloads': 0
+            'downloads': 0,
+            'cmf_hits': 0,
+            'cmf_misses': 0
         }
 
+        # Primer nivel en memoria: evita consultar el índice en cada búsqueda.
+        # clave -> (path, expires_at epoch); se llena desde SQLite en la primera consulta
+        self._pdf_memory_cache: Dict[str, Tuple[str, float]] = {}
+        self._pdf_memory_loaded = False
+        # Claves cuyo PDF ya se verificó en disco en esta ejecución: los hits repetidos
+        # no vuelven a hacer stat() del archivo (solo lookup en dict + set)
+        self._pdf_verified: set = set()
+        # Claves inválidas detectadas en lecturas: se borran del índice en lote (_flush_cache_deletes)
+        self._pending_cache_deletes: set = set()
+
+        # CACHÉ DE BÚSQUEDAS CMF (memoria + disco)
+        # Las búsquedas por RUT y la lista de fondos se repiten entre fondos y ejecuciones
+        self.cmf_cache_path = 'cache/cmf_lookup_cache.json'
+        self.cmf_cache_ttl = timedelta(hours=int(os.getenv('CMF_CACHE_TTL_HOURS', '24')))
+        # Expiraciones en epoch (float): comparar contra time.time() sin parsear fechas
+        self._cmf_lookup_memory: Dict[str, Tuple[Dict, float]] = {}
+        self._cmf_funds_list_cache: Optional[Tuple[List[FundRecord], float]] = None
+
+        # Resultados de prefetch_cmf_folletos: RUT -> URL de entidad, URL de folletos -> (folletos, rutAdmin)
+        self._cmf_entidad_prefetch: Dict[str, str] = {}
+        self._cmf_folletos_prefetch: Dict[str, Tuple[List[Dict], Optional[str]]] = {}
+
         # Inicializar sistema de caché
         self._init_cache_system()
 
@@ -229,27 +1651,91 @@ class FondosMutuosProcessor:
         # Validar salud de CMF al inicio (opcional)
         self._validate_cmf_health()
 
+    def close(self) -> None:
+        """Cerrar la sesión HTTP (libera las conexiones keep-alive del pool)"""
+        if self._pdf_executor is not None:
+            # Esperar descargas especulativas en curso antes de cerrar la sesión
+            self._pdf_executor.shutdown(wait=True)
+            self._pdf_executor = None
+        self._close_driver()
+        if self._cache_conn is not None:
+            self._flush_cache_deletes()
+            self._cache_conn.close()
+            self._cache_conn = None
+        self.session.close()
+
+    def __enter__(self) -> 'FondosMutuosProcessor':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def _init_cache_system(self):
         """
         Inicializar el sistema de caché de PDFs.
-        Crea los directorios necesarios y el archivo de índice si no existen.
+        Crea los directorios necesarios y el índice SQLite si no existen, y migra
+        el índice JSON anterior si todavía está presente.
         """
         try:
             # Crear directorio de caché si no existe
             os.makedirs(self.cache_dir, exist_ok=True)
+            os.makedirs(os.path.dirname(self.cache_db_path), exist_ok=True)
             logger.info(f"[CACHE] Directorio de caché inicializado: {self.cache_dir}")
 
-            # Crear archivo de índice si no existe
-            if not os.path.exists(self.cache_index_path):
-                os.makedirs(os.path.dirname(self.cache_index_path), exist_ok=True)
-                with open(self.cache_index_path, 'w', encoding='utf-8') as f:
-                    json.dump({}, f, indent=2)
-                logger.info(f"[CACHE] Archivo de índice creado: {self.cache_index_path}")
-            else:
-                logger.info(f"[CACHE] Sistema de caché ya inicializado")
+            # Una fila por PDF: consultas y upserts puntuales en vez de reescribir
+            # todo el índice en cada operación. WAL permite lecturas concurrentes
+            self._cache_conn = sqlite3.connect(self.cache_db_path, check_same_thread=False,
+                                               isolation_level=None)
+            self._cache_conn.execute("PRAGMA journal_mode=WAL")
+            self._cache_conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, rut TEXT, serie TEXT, pdf_path TEXT, "
+                "downloaded_at INTEGER, expires_at INTEGER, file_size INTEGER)"
+            )
+            self._cache_conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries(expires_at)")
+            self._cache_conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_rut ON entries(rut)")
 
-        except Exception as e:
+            if os.path.exists(self.cache_index_path):
+                self._migrate_json_cache_index()
+
+        except (OSError, sqlite3.Error) as e:
             logger.error(f"[CACHE] Error inicializando sistema de caché: {e}")
+            self._cache_conn = None
+
+    def _migrate_json_cache_index(self):
+        """Importar las entradas del índice JSON anterior a SQLite y eliminar el archivo"""
+        try:
+            with open(self.cache_index_path, 'r', encoding='utf-8') as f:
+                cache_index = json.load(f)
+
+            filas = [
+                (key, entry.get('rut'), entry.get('serie'), entry.get('pdf_path'),
+                 int(datetime.fromisoformat(entry['downloaded_at']).timestamp()),
+                 int(datetime.fromisoformat(entry['expires_at']).timestamp()),
+                 entry.get('file_size'))
+                for key, entry in cache_index.items()
+            ]
+            with self._cache_lock:
+                self._cache_conn.executemany(
+                    "INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", filas)
+            os.remove(self.cache_index_path)
+            logger.info(f"[CACHE] Índice JSON migrado a SQLite: {len(filas)} entradas")
+
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            logger.warning(f"[CACHE] No se pudo migrar el índice JSON: {e}")
+
+    def _load_pdf_memory_cache(self):
+        """Cargar todo el índice SQLite al nivel en memoria (una sola consulta)"""
+        self._pdf_memory_loaded = True
+        if self._cache_conn is None:
+            return
+        try:
+            with self._cache_lock:
+                filas = self._cache_conn.execute("SELECT key, pdf_path, expires_at FROM entries").fetchall()
+            for cache_key, pdf_path, expires_at in filas:
+                self._pdf_memory_cache.setdefault(cache_key, (pdf_path, expires_at))
+        except sqlite3.Error as e:
+            logger.debug(f"[CACHE] Error cargando índice en memoria: {e}")
 
     def _get_cached_pdf(self, rut: str, serie: str) -> Optional[str]:
         """
@@ -266,58 +1752,111 @@ class FondosMutuosProcessor:
             # Generar clave de caché
             cache_key = f"{rut}_{serie}"
 
-            # Cargar índice de caché
-            if not os.path.exists(self.cache_index_path):
+            # Nivel 1: memoria (sin I/O sobre el índice)
+            if not self._pdf_memory_loaded:
+                self._load_pdf_memory_cache()
+            memory_entry = self._pdf_memory_cache.get(cache_key)
+            if memory_entry:
+                pdf_path, expires_at = memory_entry
+                if time.time() <= expires_at and (cache_key in self._pdf_verified or _pdf_file_size(pdf_path) > 0):
+                    logger.info(f"[CACHE] HIT (memoria) - PDF encontrado en caché: {cache_key}")
+                    self.cache_stats['hits'] += 1
+                    self._pdf_verified.add(cache_key)
+                    return pdf_path
+                del self._pdf_memory_cache[cache_key]
+                self._pdf_verified.discard(cache_key)
+
+            # Nivel 2: índice SQLite
+            if self._cache_conn is None:
                 return None
 
-            with open(self.cache_index_path, 'r', encoding='utf-8') as f:
-                cache_index = json.load(f)
+            with self._cache_lock:
+                row = self._cache_conn.execute(
+                    "SELECT pdf_path, expires_at FROM entries WHERE key = ?", (cache_key,)).fetchone()
 
             # Verificar si existe entrada en el índice
-            if cache_key not in cache_index:
+            if row is None:
                 logger.debug(f"[CACHE] MISS - No se encontró entrada para {cache_key}")
                 self.cache_stats['misses'] += 1
                 return None
 
-            entry = cache_index[cache_key]
-            pdf_path = entry.get('pdf_path')
-            expires_at = entry.get('expires_at')
+            pdf_path, expires_at = row
 
-            # Verificar si el archivo existe
-            if not os.path.exists(pdf_path):
-                logger.warning(f"[CACHE] MISS - Archivo no existe: {pdf_path}")
-                # Limpiar entrada inválida
-                del cache_index[cache_key]
-                with open(self.cache_index_path, 'w', encoding='utf-8') as f:
-                    json.dump(cache_index, f, indent=2, ensure_ascii=False)
+            # Verificar si el archivo existe y no quedó vacío (descarga cortada)
+            file_size = _pdf_file_size(pdf_path)
+            if file_size <= 0:
+                if file_size < 0:
+                    logger.warning(f"[CACHE] MISS - Archivo no existe: {pdf_path}")
+                else:
+                    logger.warning(f"[CACHE] MISS - Archivo vacío: {pdf_path}")
+                    try:
+                        os.remove(pdf_path)
+                    except OSError:
+                        pass
+                # Limpiar entrada inválida (diferido: se borra en lote)
+                self._pending_cache_deletes.add(cache_key)
                 self.cache_stats['misses'] += 1
                 return None
 
             # Verificar si expiró
-            expires_datetime = datetime.fromisoformat(expires_at)
-            if datetime.now() > expires_datetime:
+            if time.time() > expires_at:
                 logger.info(f"[CACHE] MISS - PDF expirado: {cache_key}")
                 # Eliminar archivo y entrada
                 try:
                     os.remove(pdf_path)
-                except:
+                except OSError:
                     pass
-                del cache_index[cache_key]
-                with open(self.cache_index_path, 'w', encoding='utf-8') as f:
-                    json.dump(cache_index, f, indent=2, ensure_ascii=False)
+                self._pending_cache_deletes.add(cache_key)
                 self.cache_stats['misses'] += 1
                 return None
 
             # PDF válido encontrado
             logger.info(f"[CACHE] HIT - PDF encontrado en caché: {cache_key}")
             self.cache_stats['hits'] += 1
+            self._pdf_memory_cache[cache_key] = (pdf_path, expires_at)
+            self._pdf_verified.add(cache_key)
             return pdf_path
 
-        except Exception as e:
+        except (OSError, sqlite3.Error) as e:
             logger.error(f"[CACHE] Error verificando caché: {e}")
             self.cache_stats['misses'] += 1
             return None
 
+    def _get_cached_pdf_for_rut(self, rut: str) -> Optional[str]:
+        """
+        Buscar en caché el folleto de un fondo sin conocer la serie.
+
+        El camino HTTP guarda el PDF con su serie real y el de Selenium bajo UNICA:
+        esta búsqueda encuentra cualquiera de los dos (UNICA primero, luego el más
+        reciente), así ambos caminos comparten el mismo caché.
+
+        Args:
+            rut (str): RUT del fondo
+
+        Returns:
+            Path al PDF cacheado si existe y es válido, None en caso contrario
+        """
+        series = []
+        if self._cache_conn is not None:
+            try:
+                with self._cache_lock:
+                    series = self._cache_conn.execute(
+                        "SELECT serie FROM entries WHERE rut = ? AND expires_at >= ? "
+                        "ORDER BY serie = 'UNICA' DESC, downloaded_at DESC",
+                        (rut, int(time.time()))).fetchall()
+            except sqlite3.Error as e:
+                logger.debug(f"[CACHE] Error buscando series de {rut}: {e}")
+
+        for (serie,) in series:
+            cached_pdf = self._get_cached_pdf(rut, serie)
+            if cached_pdf:
+                return cached_pdf
+
+        if not series:
+            logger.debug(f"[CACHE] MISS - No hay PDFs en caché para RUT {rut}")
+            self.cache_stats['misses'] += 1
+        return None
+
     def _save_to_cache(self, rut: str, serie: str, pdf_path: str) -> bool:
         """
         Guardar un PDF en el sistema de caché con metadata.
@@ -336,12 +1875,22 @@ class FondosMutuosProcessor:
             cached_pdf_path = os.path.join(self.cache_dir, f"{cache_key}.pdf")
 
             # Copiar archivo a directorio de caché
-            import shutil
             if not os.path.exists(pdf_path):
                 logger.error(f"[CACHE] No se puede cachear - archivo no existe: {pdf_path}")
                 return False
 
-            shutil.copy2(pdf_path, cached_pdf_path)
+            if self._cache_conn is None:
+                return False
+
+            # Hard link: mismo filesystem => solo metadata, sin copiar bytes. El archivo
+            # en temp/ sigue existiendo (los callers retornan ese path)
+            try:
+                if os.path.exists(cached_pdf_path):
+                    os.remove(cached_pdf_path)
+                os.link(pdf_path, cached_pdf_path)
+            except OSError:
+                # Otro filesystem (EXDEV) o sin soporte de links: copia normal
+                shutil.copy2(pdf_path, cached_pdf_path)
 
             # Calcular fecha de expiración
             downloaded_at = datetime.now()
@@ -350,84 +1899,154 @@ class FondosMutuosProcessor:
             # Obtener tamaño del archivo
             file_size = os.path.getsize(cached_pdf_path)
 
-            # Crear entrada de metadata
-            metadata = {
-                "rut": rut,
-                "serie": serie,
-                "pdf_path": cached_pdf_path,
-                "downloaded_at": downloaded_at.isoformat(),
-                "expires_at": expires_at.isoformat(),
-                "file_size": file_size
-            }
-
-            # Cargar índice existente
-            cache_index = {}
-            if os.path.exists(self.cache_index_path):
-                with open(self.cache_index_path, 'r', encoding='utf-8') as f:
-                    cache_index = json.load(f)
-
-            # Agregar o actualizar entrada
-            cache_index[cache_key] = metadata
-
-            # Guardar índice actualizado
-            with open(self.cache_index_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_index, f, indent=2, ensure_ascii=False)
+            # Agregar o actualizar entrada (una fila, sin reescribir el índice)
+            with self._cache_lock:
+                # La entrada vuelve a ser válida: que el flush pendiente no la borre
+                self._pending_cache_deletes.discard(cache_key)
+                self._cache_conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (cache_key, rut, serie, cached_pdf_path, int(downloaded_at.timestamp()),
+                     int(expires_at.timestamp()), file_size))
+            self._pdf_memory_cache[cache_key] = (cached_pdf_path, expires_at.timestamp())
+            self._pdf_verified.add(cache_key)
 
             logger.info(f"[CACHE] PDF guardado en caché: {cache_key} (expira: {expires_at.strftime('%Y-%m-%d')})")
             return True
 
-        except Exception as e:
+        except (OSError, sqlite3.Error) as e:
             logger.error(f"[CACHE] Error guardando en caché: {e}")
             return False
 
+    def _flush_cache_deletes(self) -> None:
+        """
+        Borrar del índice, en una sola transacción, las entradas invalidadas por
+        _get_cached_pdf (archivo inexistente, vacío o expirado).
+        """
+        if not self._pending_cache_deletes or self._cache_conn is None:
+            return
+
+        try:
+            with self._cache_lock:
+                claves = [(cache_key,) for cache_key in self._pending_cache_deletes]
+                self._cache_conn.execute("BEGIN")
+                self._cache_conn.executemany("DELETE FROM entries WHERE key = ?", claves)
+                self._cache_conn.execute("COMMIT")
+                self._pending_cache_deletes.clear()
+            logger.debug(f"[CACHE] {len(claves)} entradas inválidas eliminadas del índice")
+        except sqlite3.Error as e:
+            logger.warning(f"[CACHE] Error eliminando entradas inválidas: {e}")
+
     def _clean_expired_cache(self):
         """
         Limpiar PDFs expirados del sistema de caché.
         Se ejecuta automáticamente al inicializar el processor.
         """
+        if self._cache_conn is None:
+            logger.debug("[CACHE] No hay índice de caché para limpiar")
+            return
+
+        self._flush_cache_deletes()
+
         try:
-            if not os.path.exists(self.cache_index_path):
-                logger.debug("[CACHE] No hay índice de caché para limpiar")
+            # Identificar entradas expiradas (usa el índice sobre expires_at)
+            now = int(time.time())
+            with self._cache_lock:
+                expiradas = self._cache_conn.execute(
+                    "SELECT key, pdf_path FROM entries WHERE expires_at < ?", (now,)).fetchall()
+
+            if not expiradas:
+                logger.debug("[CACHE] No hay PDFs expirados para eliminar")
                 return
 
-            with open(self.cache_index_path, 'r', encoding='utf-8') as f:
-                cache_index = json.load(f)
+            def _safe_unlink(entry):
+                cache_key, pdf_path = entry
+                try:
+                    os.remove(pdf_path)
+                    logger.info(f"[CACHE] PDF expirado eliminado: {cache_key}")
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"[CACHE] Error eliminando PDF expirado: {e}")
+
+            # Eliminar archivos en paralelo: cada unlink es un syscall bloqueante y
+            # con cientos de PDFs vencidos la latencia serial domina
+            with ThreadPoolExecutor(max_workers=min(16, len(expiradas))) as executor:
+                list(executor.map(_safe_unlink, expiradas))
+
+            # Eliminar entradas del índice (y del nivel en memoria)
+            with self._cache_lock:
+                self._cache_conn.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+            for cache_key, _ in expiradas:
+                self._pdf_memory_cache.pop(cache_key, None)
+                self._pdf_verified.discard(cache_key)
+            logger.info(f"[CACHE] Limpieza completada: {len(expiradas)} PDFs expirados eliminados")
+
+        except sqlite3.Error as e:
+            logger.error(f"[CACHE] Error limpiando caché expirado: {e}")
 
-            if not cache_index:
-                logger.debug("[CACHE] Índice de caché vacío")
-                return
+    def _get_cached_cmf_lookup(self, rut: str) -> Optional[Dict]:
+        """
+        Buscar el resultado de una búsqueda CMF por RUT en caché (memoria y luego disco).
 
-            now = datetime.now()
-            expired_keys = []
-
-            # Identificar entradas expiradas
-            for cache_key, entry in cache_index.items():
-                expires_at = datetime.fromisoformat(entry.get('expires_at'))
-                if now > expires_at:
-                    expired_keys.append(cache_key)
-                    pdf_path = entry.get('pdf_path')
-                    # Eliminar archivo si existe
-                    if os.path.exists(pdf_path):
-                        try:
-                            os.remove(pdf_path)
-                            logger.info(f"[CACHE] PDF expirado eliminado: {cache_key}")
-                        except Exception as e:
-                            logger.warning(f"[CACHE] Error eliminando PDF expirado: {e}")
+        Args:
+            rut (str): RUT del fondo sin dígito verificador
 
-            # Eliminar entradas del índice
-            for key in expired_keys:
-                del cache_index[key]
+        Returns:
+            Copia del dict de información del fondo o None si no hay entrada válida
+        """
+        now = time.time()
 
-            # Guardar índice actualizado
-            if expired_keys:
-                with open(self.cache_index_path, 'w', encoding='utf-8') as f:
-                    json.dump(cache_index, f, indent=2, ensure_ascii=False)
-                logger.info(f"[CACHE] Limpieza completada: {len(expired_keys)} PDFs expirados eliminados")
-            else:
-                logger.debug("[CACHE] No hay PDFs expirados para eliminar")
+        memory_entry = self._cmf_lookup_memory.get(rut)
+        if memory_entry and now <= memory_entry[1]:
+            logger.info(f"[CACHE CMF] HIT (memoria) - RUT {rut}")
+            self.cache_stats['cmf_hits'] += 1
+            return dict(memory_entry[0])
 
-        except Exception as e:
-            logger.error(f"[CACHE] Error limpiando caché expirado: {e}")
+        try:
+            if os.path.exists(self.cmf_cache_path):
+                with open(self.cmf_cache_path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f).get(rut)
+                if entry:
+                    expires_at = entry['expires_at']
+                    if isinstance(expires_at, str):
+                        # Entradas escritas antes del cambio a epoch (ISO)
+                        expires_at = datetime.fromisoformat(expires_at).timestamp()
+                    if now <= expires_at:
+                        logger.info(f"[CACHE CMF] HIT (disco) - RUT {rut}")
+                        self.cache_stats['cmf_hits'] += 1
+                        self._cmf_lookup_memory[rut] = (entry['fund_info'], expires_at)
+                        return dict(entry['fund_info'])
+        except (OSError, ValueError, KeyError) as e:
+            logger.debug(f"[CACHE CMF] Error leyendo caché: {e}")
+
+        self.cache_stats['cmf_misses'] += 1
+        return None
+
+    def _save_cmf_lookup(self, rut: str, fund_info: Dict) -> None:
+        """
+        Guardar el resultado de una búsqueda CMF por RUT en memoria y en disco.
+
+        Args:
+            rut (str): RUT del fondo sin dígito verificador
+            fund_info (Dict): Información del fondo obtenida desde CMF
+        """
+        expires_at = int(time.time() + self.cmf_cache_ttl.total_seconds())
+        self._cmf_lookup_memory[rut] = (dict(fund_info), expires_at)
+
+        try:
+            cache_index = {}
+            if os.path.exists(self.cmf_cache_path):
+                with open(self.cmf_cache_path, 'r', encoding='utf-8') as f:
+                    cache_index = json.load(f)
+
+            cache_index[rut] = {
+                'fund_info': fund_info,
+                'expires_at': expires_at
+            }
+
+            write_json_atomic(self.cmf_cache_path, cache_index)
+        except (OSError, ValueError) as e:
+            logger.debug(f"[CACHE CMF] Error guardando caché: {e}")
 
     def _validate_cmf_health(self):
         """
@@ -468,6 +2087,9 @@ class FondosMutuosProcessor:
         Mostrar estadísticas de uso del caché.
         Incluye hits, misses, descargas y tasa de aciertos.
         """
+        # Fin de la ejecución: aplicar las invalidaciones pendientes antes de contar
+        self._flush_cache_deletes()
+
         try:
             total_requests = self.cache_stats['hits'] + self.cache_stats['misses']
             if total_requests == 0:
@@ -484,25 +2106,19 @@ class FondosMutuosProcessor:
             logger.info(f"[CACHE] Nuevas Descargas:  {self.cache_stats['downloads']}")
             logger.info(f"[CACHE] Total Consultas:   {total_requests}")
             logger.info(f"[CACHE] Tasa de Aciertos:  {hit_rate:.1f}%")
+            logger.info(f"[CACHE] Búsquedas CMF:     {self.cache_stats['cmf_hits']} hits / {self.cache_stats['cmf_misses']} misses")
             logger.info("=" * 60)
 
-            # Mostrar información del caché actual
-            if os.path.exists(self.cache_index_path):
-                with open(self.cache_index_path, 'r', encoding='utf-8') as f:
-                    cache_index = json.load(f)
-                    num_pdfs_cached = len(cache_index)
-                    logger.info(f"[CACHE] PDFs en caché:     {num_pdfs_cached}")
-
-                    # Calcular tamaño total del caché
-                    total_size = 0
-                    for entry in cache_index.values():
-                        pdf_path = entry.get('pdf_path')
-                        if os.path.exists(pdf_path):
-                            total_size += os.path.getsize(pdf_path)
+            # Mostrar información del caché actual (tamaños ya registrados en el índice)
+            if self._cache_conn is not None:
+                with self._cache_lock:
+                    num_pdfs_cached, total_size = self._cache_conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(file_size), 0) FROM entries").fetchone()
+                logger.info(f"[CACHE] PDFs en caché:     {num_pdfs_cached}")
 
-                    total_size_mb = total_size / (1024 * 1024)
-                    logger.info(f"[CACHE] Tamaño total:      {total_size_mb:.2f} MB")
-                    logger.info("=" * 60)
+                total_size_mb = total_size / (1024 * 1024)
+                logger.info(f"[CACHE] Tamaño total:      {total_size_mb:.2f} MB")
+                logger.info("=" * 60)
 
         except Exception as e:
             logger.error(f"[CACHE] Error mostrando estadísticas: {e}")
@@ -526,66 +2142,39 @@ class FondosMutuosProcessor:
 
             logger.info(f"[CMF] Buscando página de entidad para RUT: {rut}, pestaña: {pestania}")
 
-            # Buscar en el listado de fondos
-            listado_url = "https://www.cmfchile.cl/institucional/mercados/consulta.php?mercado=V&Estado=VI&entidad=RGFMU"
+            # Precargada por prefetch_cmf_folletos: no volver a bajar el listado
+            url_prefetch = self._cmf_entidad_prefetch.get(rut)
+            if url_prefetch:
+                return _set_url_pestania(url_prefetch, pestania)
 
             # FIX 2.2: Usar request_with_retry en lugar de session.get directo
-            response = request_with_retry(self.session, listado_url, timeout=30)
-            if not response or response.status_code != 200:
-                logger.warning(f"[CMF] No se pudo acceder al listado: {response.status_code if response else 'None'}")
+            # stream=True: el listado pesa cientos de KB y basta con leer hasta el link del RUT
+            response = request_with_retry(self.session, CMF_LISTADO_URL, timeout=30, stream=True)
+            if response is None or response.status_code != 200:
+                # Response es falsy con status >= 400: comparar con None para cerrarla igual
+                if response is not None:
+                    response.close()
+                logger.warning(f"[CMF] No se pudo acceder al listado: {response.status_code if response is not None else 'None'}")
                 return None
 
-            soup = BeautifulSoup(response.content, 'html.parser')
-
             # ESTRATEGIA 1: Buscar enlaces en el HTML que contengan el RUT
-            enlaces = soup.find_all('a', href=True)
-
-            for enlace in enlaces:
-                href = enlace['href']
-                if f'rut={rut}' in href and 'entidad.php' in href and 'row=' in href:
-                    # Construir URL completa
-                    if href.startswith('http'):
-                        url_base = href
-                    elif href.startswith('/'):
-                        url_base = f"https://www.cmfchile.cl{href}"
-                    else:
-                        url_base = f"https://www.cmfchile.cl/institucional/mercados/{href}"
-
-                    # Parsear para reemplazar la pestaña
-                    from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-                    parsed = urlparse(url_base)
-                    params = parse_qs(parsed.query)
-
-                    # Actualizar pestaña
-                    params['pestania'] = [pestania]
-
-                    # Reconstruir query string (convertir listas a valores únicos)
-                    new_params = {k: v[0] if isinstance(v, list) else v for k, v in params.items()}
-                    new_query = urlencode(new_params)
-
-                    # Reconstruir URL
-                    url_completa = urlunparse((
-                        parsed.scheme,
-                        parsed.netloc,
-                        parsed.path,
-                        parsed.params,
-                        new_query,
-                        parsed.fragment
-                    ))
-
-                    logger.info(f"[CMF] ✓ URL encontrada con row ID: {url_completa[:100]}...")
-                    return url_completa
+            url_completa = _find_entidad_url_in_stream(response, rut, pestania)
+            if url_completa:
+                logger.info(f"[CMF] ✓ URL encontrada con row ID: {url_completa[:100]}...")
+                return url_completa
 
             # ESTRATEGIA 2: Acceso directo sin row parameter (funciona para fondos en JavaScript arrays)
             logger.info(f"[CMF] RUT no encontrado en HTML, intentando acceso directo...")
-            url_directa = f"https://www.cmfchile.cl/institucional/mercados/entidad.php?mercado=V&rut={rut}&tipoentidad=RGFMU&vig=VI&control=svs&pestania={pestania}"
+            url_directa = CMF_ENTIDAD_DIRECT_URL.format(rut=rut, pestania=pestania)
 
-            # Verificar si la URL directa funciona
+            # Verificar si la URL directa funciona: solo importan status y URL final,
+            # stream=True + cerrar evita bajar el cuerpo de la página (GET y no HEAD:
+            # no todas las páginas PHP de CMF responden HEAD igual que GET)
             try:
-                response_direct = self.session.get(url_directa, timeout=10)
-                if response_direct.status_code == 200 and 'PAGE_NOT_FOUND' not in response_direct.url:
-                    logger.info(f"[CMF] ✓ Acceso directo exitoso (sin row parameter)")
-                    return url_directa
+                with self.session.get(url_directa, timeout=10, stream=True) as response_direct:
+                    if response_direct.status_code == 200 and 'PAGE_NOT_FOUND' not in response_direct.url:
+                        logger.info(f"[CMF] ✓ Acceso directo exitoso (sin row parameter)")
+                        return url_directa
             except:
                 pass
 
@@ -614,13 +2203,12 @@ class FondosMutuosProcessor:
             logger.info(f"[CMF] Extrayendo folletos desde: {page_url}")
 
             # Agregar o reemplazar pestania=68 para ver folletos informativos
-            import re as regex_module
-            if 'pestania=' in page_url:
-                # Reemplazar la pestania existente con 68
-                page_url = regex_module.sub(r'pestania=\d+', 'pestania=68', page_url)
-            else:
-                # Agregar pestania=68
-                page_url = f"{page_url}&pestania=68" if '?' in page_url else f"{page_url}?pestania=68"
+            page_url = _set_url_pestania(page_url, "68")
+
+            # Precargada por prefetch_cmf_folletos
+            prefetch = self._cmf_folletos_prefetch.get(page_url)
+            if prefetch is not None:
+                return prefetch
 
             # Headers de navegador para evitar bloqueos
             headers = {
@@ -630,102 +2218,106 @@ class FondosMutuosProcessor:
             }
 
             # FIX 2.2: Usar request_with_retry para folletos
-            response = request_with_retry(self.session, page_url, headers=headers, timeout=30)
-            if not response or response.status_code != 200:
-                logger.warning(f"[CMF] Error accediendo a página: {response.status_code if response else 'None'}")
+            # stream=True: los onclick se escanean a medida que llega la página
+            response = request_with_retry(self.session, page_url, headers=headers, timeout=30, stream=True)
+            if response is None or response.status_code != 200:
+                # Response es falsy con status >= 400: comparar con None para cerrarla igual
+                if response is not None:
+                    response.close()
+                logger.warning(f"[CMF] Error accediendo a página: {response.status_code if response is not None else 'None'}")
                 return [], None
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            with response:
+                return _parse_cmf_folletos_stream(
+                    response.iter_content(chunk_size=CMF_STREAM_CHUNK_SIZE), response.encoding)
 
-            folletos = []
-            rut_admin = None
+        except Exception as e:
+            logger.error(f"[CMF] Error extrayendo folletos: {e}")
+            import traceback
+            logger.debug(traceback.format_exc())
+            return [], None
 
-            # MÉTODO 1: Extraer de onclick="verFolleto(...)"
-            # Buscar todos los elementos con onclick que llaman a verFolleto
-            onclick_elements = soup.find_all(attrs={'onclick': re.compile(r'verFolleto')})
+    def _new_async_client(self, max_connections: int):
+        """
+        Crear un httpx.AsyncClient con los headers de self.session.
 
-            logger.info(f"[CMF] Encontrados {len(onclick_elements)} elementos con verFolleto")
+        HTTP/2 si h2 está instalado (una conexión TLS multiplexada); los errores de
+        conexión los reintenta el transporte.
+        """
+        transport = httpx.AsyncHTTPTransport(retries=3, http2=HTTP2_AVAILABLE,
+                                             limits=httpx.Limits(max_keepalive_connections=max_connections))
+        return httpx.AsyncClient(transport=transport, headers=dict(self.session.headers),
+                                 follow_redirects=True)
 
-            for elem in onclick_elements:
-                onclick = elem.get('onclick', '')
-                # Extraer parámetros: verFolleto('runFondo','serie','rutAdmin')
-                match = re.search(r"verFolleto\('([^']*)',\s*'([^']*)',\s*'([^']*)'\)", onclick)
-                if match:
-                    run_fondo, serie, rut_admin_found = match.groups()
-
-                    # Guardar el primer rutAdmin encontrado
-                    if rut_admin_found and not rut_admin:
-                        rut_admin = rut_admin_found
-                        logger.info(f"[CMF] ✅ rutAdmin extraído: {rut_admin}")
-
-                    # Agregar serie única
-                    if serie and serie not in [f['serie'] for f in folletos]:
-                        folletos.append({
-                            'serie': serie,
-                            'runFondo': run_fondo,
-                            'rutAdmin': rut_admin_found,
-                            'encontrado': True
-                        })
-                        logger.debug(f"[CMF] Folleto encontrado: Serie={serie}, runFondo={run_fondo}, rutAdmin={rut_admin_found}")
-
-            # MÉTODO 2 (fallback): Buscar en tabla si no encontramos con onclick
-            if not folletos:
-                texto_folletos = soup.find(string=re.compile('Folletos Informativos.*VIGENTES', re.IGNORECASE))
-
-                if texto_folletos:
-                    tabla = texto_folletos.find_parent('table')
-                    if not tabla:
-                        elemento_actual = texto_folletos.parent
-                        for _ in range(10):
-                            if elemento_actual:
-                                tabla = elemento_actual.find_next('table')
-                                if tabla:
-                                    break
-                                elemento_actual = elemento_actual.parent
+    async def _fetch_cmf_pair(self, client, rut: str, listado_html: Optional[bytes]) -> Tuple[Optional[str], List[Dict], Optional[str]]:
+        """
+        Resolver la página de entidad de un RUT y extraer sus folletos (async).
+
+        Args:
+            client: httpx.AsyncClient compartido por el batch
+            rut (str): RUT del fondo SIN guión
+            listado_html (bytes): HTML del listado CMF (descargado una vez por batch)
+
+        Returns:
+            Tuple con URL de folletos (o None), lista de folletos y rutAdmin
+        """
+        page_url = _find_entidad_url_in_listado(listado_html, rut, "68") if listado_html else None
+        if not page_url:
+            page_url = CMF_ENTIDAD_DIRECT_URL.format(rut=rut, pestania="68")
+
+        response = await async_request_with_retry(client, page_url, timeout=30)
+        if response is None or response.status_code != 200 or 'PAGE_NOT_FOUND' in str(response.url):
+            logger.warning(f"[CMF] No se pudo obtener página de folletos para RUT {rut}")
+            return None, [], None
 
-                    if tabla:
-                        filas = tabla.find_all('tr')
+        folletos, rut_admin = _parse_cmf_folletos_stream((response.content,), response.encoding)
+        return page_url, folletos, rut_admin
 
-                        for fila in filas:
-                            celdas = fila.find_all('td')
+    async def fetch_cmf_folletos(self, ruts: List[str],
+                                 max_concurrency: int = CMF_FETCH_CONCURRENCY) -> Dict[str, Tuple[List[Dict], Optional[str]]]:
+        """
+        Descargar en paralelo las páginas de folletos CMF de varios fondos.
 
-                            if len(celdas) >= 4:
-                                icono_doc = fila.find('img', src=re.compile('doc\\.gif', re.IGNORECASE))
+        Todas las requests comparten un httpx.AsyncClient (HTTP/2 si h2 está instalado:
+        una sola conexión TLS multiplexada). El listado se descarga una sola vez. Los
+        resultados quedan precargados para _get_cmf_page_with_params y
+        _extract_pdf_links_from_cmf_page.
 
-                                if icono_doc:
-                                    serie = None
-                                    fecha_envio = None
+        Args:
+            ruts (List[str]): RUTs de los fondos SIN guión
+            max_concurrency (int): Máximo de requests simultáneos
 
-                                    for i, celda in enumerate(celdas):
-                                        texto = celda.get_text().strip()
+        Returns:
+            Dict RUT -> (folletos, rutAdmin) para los RUTs resueltos
 
-                                        if re.match(r'\d{2}/\d{2}/\d{4}', texto):
-                                            if not fecha_envio:
-                                                fecha_envio = texto
+        Ejemplo:
+            asyncio.run(processor.fetch_cmf_folletos(ruts))
+        """
+        if not HTTPX_AVAILABLE:
+            logger.warning("[CMF] httpx no está instalado, se omite la precarga de folletos")
+            return {}
 
-                                        if texto and len(texto) < 20 and texto.isupper():
-                                            serie = texto
+        async with self._new_async_client(max_concurrency) as client:
+            response = await async_request_with_retry(client, CMF_LISTADO_URL, timeout=30)
+            listado_html = response.content if response is not None and response.status_code == 200 else None
 
-                                    if serie or fecha_envio:
-                                        folletos.append({
-                                            'serie': serie or 'UNICA',
-                                            'fecha_envio': fecha_envio,
-                                            'encontrado': True
-                                        })
-                                        logger.debug(f"[CMF] Folleto encontrado (método tabla): Serie={serie}, Fecha={fecha_envio}")
-###toda esta parte se puede optimizar mas no me gustan tantos ifs y demas
-            if not folletos:
-                logger.warning("[CMF] No se encontraron folletos, intentando serie UNICA")
-                folletos = [{'serie': 'UNICA', 'fecha_envio': None, 'encontrado': False}]
+            semaphore = asyncio.Semaphore(max_concurrency)
 
-            logger.info(f"[CMF] Total folletos encontrados: {len(folletos)}, rutAdmin: {rut_admin}")
-            return folletos, rut_admin
+            async def _one(rut: str):
+                async with semaphore:
+                    return await self._fetch_cmf_pair(client, rut, listado_html)
 
-        except Exception as e:
-            logger.error(f"[CMF] Error extrayendo folletos: {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
-            return [], None
+            pares = await asyncio.gather(*(_one(rut) for rut in ruts))
+
+        resultados = {}
+        for rut, (page_url, folletos, rut_admin) in zip(ruts, pares):
+            if page_url:
+                self._cmf_entidad_prefetch[rut] = page_url
+                self._cmf_folletos_prefetch[page_url] = (folletos, rut_admin)
+                resultados[rut] = (folletos, rut_admin)
+
+        logger.info(f"[CMF] Folletos precargados: {len(resultados)}/{len(ruts)} fondos")
+        return resultados
 
     def _extract_rut_base(self, run: str) -> str:
         """
@@ -734,13 +2326,14 @@ class FondosMutuosProcessor:
         """
         if not run:
             return ""
-        # Remover guión y dígito verificador
-        rut_base = run.split('-')[0] if '-' in run else run
-        return rut_base.strip()
+        # Remover guión y dígito verificador (partition: una pasada, sin armar lista;
+        # sin guión devuelve el string completo)
+        return run.partition('-')[0].strip()
 
     def _download_pdf_from_cmf_improved(self, rut: str, run_completo: str = None) -> Optional[str]:
         """
-        Método mejorado: Usar Selenium para acceder a la página de folletos y descargar PDF.
+        Método mejorado: descargar el PDF por HTTP directo con los parámetros de la página
+        de folletos; Selenium queda como último recurso.
 
         Args:
             rut (str): RUT del fondo sin guión ni dígito verificador (ej: "8638")
@@ -749,39 +2342,98 @@ class FondosMutuosProcessor:
         Returns:
             Path al PDF descargado o None
         """
+        pdf_path, page_url = self._download_pdf_from_cmf_http(rut, run_completo)
+        if pdf_path or not page_url:
+            return pdf_path
+        return self._download_pdf_selenium_fallback(page_url, rut, run_completo)
+
+    def _download_pdf_from_cmf_http(self, rut: str, run_completo: str = None,
+                                    cancel_event: Optional[threading.Event] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Pasos HTTP de _download_pdf_from_cmf_improved: caché, página de folletos y
+        descarga directa (POST ver_folleto_fm.php + GET del PDF). No usa Selenium, así
+        que se puede correr en otro hilo sin tomar el navegador compartido.
+
+        Args:
+            rut (str): RUT del fondo sin guión ni dígito verificador (ej: "8638")
+            run_completo (str): RUN completo con guión (ej: "8638-K")
+            cancel_event (threading.Event): Si se activa, se abandona antes del próximo paso de red
+
+        Returns:
+            Tuple (path al PDF o None, URL de la página de folletos para el fallback Selenium o None)
+        """
         try:
             # FIX: Validate RUT parameter to prevent NoneType errors
             if not rut or not isinstance(rut, str):
                 logger.warning(f"[CMF PDF] RUT inválido recibido: {rut}")
-                return None
+                return None, None
 
             logger.info(f"[CMF PDF SELENIUM] Iniciando descarga para RUT: {rut}")
 
-            # VERIFICAR CACHÉ PRIMERO
-            cached_pdf = self._get_cached_pdf(rut, "UNICA")
+            # VERIFICAR CACHÉ PRIMERO (cualquier serie del fondo)
+            cached_pdf = self._get_cached_pdf_for_rut(rut)
             if cached_pdf:
                 logger.info(f"[CACHE] ✓ PDF encontrado en caché")
-                return cached_pdf
+                return cached_pdf, None
 
-            self.cache_stats['downloads'] += 1
+            if cancel_event is not None and cancel_event.is_set():
+                return None, None
 
             # PASO 1: Obtener URL con pestaña de folletos (pestania=68)
             page_url = self._get_cmf_page_with_params(rut, pestania="68")
 
             if not page_url:
                 logger.warning(f"[CMF PDF] ❌ No se encontró URL para RUT {rut}")
-                return None
+                return None, None
 
             logger.info(f"[CMF PDF] ✓ URL folletos: {page_url[:80]}...")
 
-            # PASO 2: Usar Selenium para cargar la página y extraer PDF
-            # TODO: Por ahora intentamos con requests/BeautifulSoup
-            # Si no funciona, implementar Selenium
+            if cancel_event is not None and cancel_event.is_set():
+                return None, None
+
+            # PASO 2: Camino rápido por HTTP (POST ver_folleto_fm.php + GET del PDF) con
+            # los parámetros del onclick verFolleto; evita levantar Chrome (decenas de segundos)
+            folletos, rut_admin = self._extract_pdf_links_from_cmf_page(page_url)
+            folleto = next((f for f in folletos if f.get('encontrado')), None)
+            if folleto:
+                if cancel_event is not None and cancel_event.is_set():
+                    return None, None
+                serie = folleto['serie']
+                pdf_path = self._download_pdf_from_cmf(rut, folleto.get('runFondo') or run_completo, serie,
+                                                       folleto.get('rutAdmin') or rut_admin)
+                if pdf_path:
+                    # Ya quedó en caché con su serie real (_get_cached_pdf_for_rut lo encuentra)
+                    return pdf_path, None
+                logger.info(f"[CMF PDF] Descarga HTTP directa falló, usando Selenium")
+
+            return None, page_url
+
+        except Exception as e:
+            logger.error(f"[CMF PDF MEJORADO] Error: {e}")
+            import traceback
+            logger.debug(traceback.format_exc())
+            return None, None
+
+    def _download_pdf_selenium_fallback(self, page_url: str, rut: str, run_completo: str = None) -> Optional[str]:
+        """
+        PASO 3 de _download_pdf_from_cmf_improved: descargar con Selenium y cachear.
+
+        Args:
+            page_url (str): URL de la página de folletos (pestania=68)
+            rut (str): RUT del fondo
+            run_completo (str): RUN completo con guión
+
+        Returns:
+            Path al PDF descargado o None
+        """
+        try:
+            # PASO 3: Usar Selenium para cargar la página y extraer PDF (último recurso)
+            self.cache_stats['downloads'] += 1
             pdf_path = self._download_pdf_with_selenium(page_url, rut, run_completo)
 
             if pdf_path:
                 logger.info(f"[CMF PDF] ✅ PDF descargado exitosamente")
-                # Guardar en caché
+                # Guardar en caché (Selenium no informa la serie del folleto: UNICA)
                 self._save_to_cache(rut, "UNICA", pdf_path)
                 return pdf_path
             else:
@@ -794,6 +2446,84 @@ class FondosMutuosProcessor:
             logger.debug(traceback.format_exc())
             return None
 
+    def _get_or_create_driver(self):
+        """
+        Obtener el Chrome headless compartido, creándolo en el primer uso.
+
+        Levantar Chrome (ChromeDriverManager + arranque del proceso + perfil) cuesta
+        varios segundos: se paga una vez por procesador y no por cada PDF.
+
+        Returns:
+            webdriver.Chrome listo para usar
+        """
+        if self._driver is not None:
+            return self._driver
+
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        logger.info(f"[SELENIUM] Iniciando navegador Chrome headless...")
+
+        # Configurar Chrome en modo headless
+        chrome_options = Options()
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+
+        # Set Chrome binary location (cross-platform)
+        chrome_binary = _detect_chrome_binary()
+
+        if chrome_binary:
+            chrome_options.binary_location = chrome_binary
+            logger.info(f"[SELENIUM] Using Chrome binary: {chrome_binary}")
+        else:
+            logger.warning(f"[SELENIUM] Chrome binary not found, using system default")
+
+        # Directorio de descargas (fijo para toda la vida del navegador)
+        download_dir = os.path.abspath('temp')
+        os.makedirs(download_dir, exist_ok=True)
+
+        prefs = {
+            'download.default_directory': download_dir,
+            'download.prompt_for_download': False,
+            'plugins.always_open_pdf_externally': True  # Descargar PDF en lugar de abrirlo
+        }
+        chrome_options.add_experimental_option('prefs', prefs)
+        # Eventos DevTools (Page.download*) en el performance log para detectar descargas
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+        # Inicializar driver (cross-platform)
+        service = Service(self._get_chromedriver_path())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        logger.info(f"[SELENIUM] ✓ Chrome started")
+
+        try:
+            driver.execute_cdp_cmd('Page.setDownloadBehavior', {'behavior': 'allow', 'downloadPath': download_dir})
+            self._driver_cdp_downloads = True
+        except Exception as e:
+            logger.debug(f"[SELENIUM] CDP no disponible ({e}), descargas detectadas por filesystem")
+            self._driver_cdp_downloads = False
+
+        self._driver = driver
+        self._driver_download_dir = download_dir
+        _PROCESADORES_CON_DRIVER.add(self)
+        return driver
+
+    def _close_driver(self) -> None:
+        """Cerrar el navegador compartido (si hay uno abierto)"""
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+                logger.info(f"[SELENIUM] Navegador cerrado")
+            except Exception as e:
+                logger.debug(f"[SELENIUM] Error cerrando navegador: {e}")
+            self._driver = None
+        _PROCESADORES_CON_DRIVER.discard(self)
+
     def _download_pdf_with_selenium(self, page_url: str, rut: str, run_completo: str = None) -> Optional[str]:
         """
         Usar Selenium para acceder a la página de folletos y descargar el PDF.
@@ -806,252 +2536,226 @@ class FondosMutuosProcessor:
         Returns:
             Path al PDF descargado o None
         """
-        try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.chrome.service import Service
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            from webdriver_manager.chrome import ChromeDriverManager
-            import time
-
-            logger.info(f"[SELENIUM] Iniciando navegador Chrome headless...")
-
-            # Configurar Chrome en modo headless
-            chrome_options = Options()
-            chrome_options.add_argument('--headless=new')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
-
-            # Set Chrome binary location (cross-platform)
-            # Check environment variable first, then fallback to platform defaults
-            chrome_binary = os.getenv('CHROME_BINARY_PATH')
-
-            if not chrome_binary:
-                # Auto-detect based on platform
-                import platform
-                system = platform.system()
-
-                if system == 'Darwin':  # macOS
-                    chrome_binary = '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'
-                elif system == 'Linux':
-                    # Try common Linux locations
-                    for path in ['/usr/bin/google-chrome', '/usr/bin/chromium-browser', '/usr/bin/chromium']:
-                        if os.path.exists(path):
-                            chrome_binary = path
-                            break
-                elif system == 'Windows':
-                    # Try common Windows locations
-                    for path in [
-                        r'C:\Program Files\Google\Chrome\Application\chrome.exe',
-                        r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe'
-                    ]:
-                        if os.path.exists(path):
-                            chrome_binary = path
-                            break
-
-            if chrome_binary and os.path.exists(chrome_binary):
-                chrome_options.binary_location = chrome_binary
-                logger.info(f"[SELENIUM] Using Chrome binary: {chrome_binary}")
-            else:
-                logger.warning(f"[SELENIUM] Chrome binary not found, using system default")
-
-            # Directorio de descargas
-            download_dir = os.path.abspath('temp')
-            os.makedirs(download_dir, exist_ok=True)
-
-            # FIX CRITICO: Limpiar archivos .crdownload antiguos que pueden interferir
+        # Un solo navegador por procesador: no lo usan dos hilos a la vez
+        with self._driver_lock:
             try:
-                crdownload_files = [f for f in os.listdir(download_dir) if f.endswith('.crdownload')]
-                if crdownload_files:
-                    logger.warning(f"[SELENIUM] Limpiando {len(crdownload_files)} archivos .crdownload antiguos...")
-                    for f in crdownload_files:
-                        try:
-                            os.remove(os.path.join(download_dir, f))
-                        except:
-                            pass
-            except Exception as e:
-                logger.debug(f"[SELENIUM] Error limpiando .crdownload: {e}")
+                from selenium.webdriver.common.by import By
+                from selenium.common.exceptions import TimeoutException
+                from selenium.webdriver.support.ui import WebDriverWait
+                import time
 
-            prefs = {
-                'download.default_directory': download_dir,
-                'download.prompt_for_download': False,
-                'plugins.always_open_pdf_externally': True  # Descargar PDF en lugar de abrirlo
-            }
-            chrome_options.add_experimental_option('prefs', prefs)
+                driver = self._get_or_create_driver()
+                download_dir = self._driver_download_dir
 
-            # Inicializar driver (cross-platform)
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-            logger.info(f"[SELENIUM] ✓ Chrome started")
+                # FIX CRITICO: Limpiar archivos .crdownload antiguos que pueden interferir
+                # Una pasada con scandir (DirEntry ya trae el path armado)
+                try:
+                    eliminados = 0
+                    with os.scandir(download_dir) as it:
+                        for entry in it:
+                            if entry.name.endswith('.crdownload'):
+                                try:
+                                    os.remove(entry.path)
+                                    eliminados += 1
+                                except OSError:
+                                    pass
+                    if eliminados:
+                        logger.warning(f"[SELENIUM] Limpiados {eliminados} archivos .crdownload antiguos")
+                except OSError as e:
+                    logger.debug(f"[SELENIUM] Error limpiando .crdownload: {e}")
 
-            try:
-                logger.info(f"[SELENIUM] Navegando a: {page_url[:80]}...")
-                driver.get(page_url)
+                try:
+                    logger.info(f"[SELENIUM] Navegando a: {page_url[:80]}...")
+                    driver.get(page_url)
 
-                # Esperar que cargue la página
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
+                    # FIX 3.3: Wait for JavaScript tabs to load (aumentado de 10s a 20s)
+                    # Una sola espera para documento cargado + #tabs + AJAX de jQuery
+                    # terminado: el tiempo total es el de la condición más lenta, no la suma
+                    logger.info(f"[SELENIUM] Waiting for JavaScript load...")
+                    try:
+                        WebDriverWait(driver, 20).until(lambda d: d.execute_script(SELENIUM_PAGE_READY_JS))
+                    except TimeoutException:
+                        logger.warning(f"[SELENIUM] Timeout waiting for tabs, continuando...")
 
-                page_title = driver.title
-                logger.info(f"[SELENIUM] ✓ Page loaded: {page_title}")
+                    page_title = driver.title
+                    logger.info(f"[SELENIUM] ✓ Page loaded: {page_title}")
 
-                # FIX 3.3: Wait for JavaScript tabs to load (aumentado de 10s a 20s)
-                logger.info(f"[SELENIUM] Waiting for JavaScript load...")
-                try:
-                    WebDriverWait(driver, 20).until(
-                        EC.presence_of_element_located((By.ID, "tabs"))
-                    )
-                except:
-                    logger.warning(f"[SELENIUM] Timeout waiting for tabs, continuando...")
-
-                # FIX 3.2: Scroll page para cargar lazy-loaded content
-                logger.info(f"[SELENIUM] Scrolling page para lazy-load content...")
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)  # Esperar que cargue contenido lazy-loaded
-
-                # FIX 3.1: Élargir selectors con fallbacks múltiples
-                logger.info(f"[SELENIUM] Looking for PDF links (múltiples selectors)...")
-
-                # Lista de selectores en orden de prioridad
-                selectors = [
-                    "//a[contains(@onclick, 'verFolleto') or contains(@onclick, 'abrirFolleto')]",
-                    "//button[contains(@onclick, 'verFolleto') or contains(@onclick, 'abrirFolleto')]",
-                    "//a[contains(@href, '.pdf')]",
-                    "//*[contains(text(), 'Folleto') or contains(text(), 'FOLLETO')]/ancestor::a",
-                    "//a[contains(@class, 'folleto')]"
-                ]
+                    # FIX 3.2: Scroll page para cargar lazy-loaded content
+                    logger.info(f"[SELENIUM] Scrolling page para lazy-load content...")
+                    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                    # Esperar a que aparezca algún enlace de folleto (no un sleep fijo)
+                    try:
+                        WebDriverWait(driver, 5).until(
+                            lambda d: d.find_elements(By.XPATH, SELENIUM_FOLLETO_ANY_XPATH)
+                        )
+                    except TimeoutException:
+                        logger.debug(f"[SELENIUM] Sin enlaces de folleto tras el scroll, probando selectores igual")
 
-                pdf_links = []
-                selector_usado = None
+                    # FIX 3.1: Élargir selectors con fallbacks múltiples
+                    logger.info(f"[SELENIUM] Looking for PDF links (múltiples selectors)...")
 
-                for selector in selectors:
+                    # Todos los selectores en un solo round-trip: el navegador los evalúa en
+                    # orden de prioridad y devuelve los enlaces del primero que encuentra algo
+                    pdf_links = []
+                    link_attrs = []
                     try:
-                        pdf_links = driver.find_elements(By.XPATH, selector)
+                        indice, pdf_links, link_attrs = driver.execute_script(SELENIUM_FIND_FOLLETOS_JS, list(SELENIUM_FOLLETO_SELECTORS))
                         if pdf_links:
-                            selector_usado = selector
+                            selector = SELENIUM_FOLLETO_SELECTORS[indice]
                             logger.info(f"[SELENIUM] ✓ Encontrados {len(pdf_links)} enlaces con selector: {selector[:60]}...")
-                            break
                     except Exception as e:
-                        logger.debug(f"[SELENIUM] Selector falló: {selector[:60]}... - {e}")
-                        continue
-
-                if pdf_links:
-                    logger.info(f"[SELENIUM] ✓ Encontrados {len(pdf_links)} enlaces potenciales")
-
-                    # Tomar el primer enlace
-                    first_link = pdf_links[0]
-                    pdf_url = first_link.get_attribute('href')
+                        logger.debug(f"[SELENIUM] Búsqueda combinada falló ({e}), probando selectores uno a uno")
+                        for selector in SELENIUM_FOLLETO_SELECTORS:
+                            try:
+                                pdf_links = driver.find_elements(By.XPATH, selector)
+                                if pdf_links:
+                                    logger.info(f"[SELENIUM] ✓ Encontrados {len(pdf_links)} enlaces con selector: {selector[:60]}...")
+                                    link_attrs = driver.execute_script(SELENIUM_LINK_ATTRS_JS, pdf_links)
+                                    break
+                            except Exception as e:
+                                logger.debug(f"[SELENIUM] Selector falló: {selector[:60]}... - {e}")
+                                continue
 
-                    logger.info(f"[SELENIUM] onclick: {pdf_url[:80]}...")
+                    if pdf_links:
+                        logger.info(f"[SELENIUM] ✓ Encontrados {len(pdf_links)} enlaces potenciales")
 
-                    # FIX CRITICO: Eliminar PDF anterior del mismo RUT si existe
-                    # Esto evita conflictos y asegura que siempre tenemos la versión más reciente
-                    expected_final_name = f"folleto_{rut}.pdf"
-                    expected_final_path = os.path.join(download_dir, expected_final_name)
-                    if os.path.exists(expected_final_path):
-                        logger.warning(f"[SELENIUM] Eliminando PDF anterior: {expected_final_name}")
-                        try:
-                            os.remove(expected_final_path)
-                        except Exception as e:
-                            logger.error(f"[SELENIUM] No se pudo eliminar PDF anterior: {e}")
+                        # Tomar el primer enlace (atributos ya leídos junto con los enlaces)
+                        first_link = pdf_links[0]
+                        onclick, href = link_attrs[0] if link_attrs else ('', '')
 
-                    # FIX CRITICO: Capturar estado del directorio ANTES del click
-                    # Esto permite detectar solo archivos NUEVOS descargados
-                    files_before_download = set(os.listdir(download_dir))
-                    logger.info(f"[SELENIUM] Archivos existentes antes del click: {len(files_before_download)}")
+                        logger.info(f"[SELENIUM] onclick: {(onclick or href)[:80]}...")
 
-                    # Click triggers AJAX POST and window.open(pdf_url)
-                    logger.info(f"[SELENIUM] Executing click...")
-                    driver.execute_script("arguments[0].click();", first_link)
+                        # FIX CRITICO: Eliminar PDF anterior del mismo RUT si existe
+                        # Esto evita conflictos y asegura que siempre tenemos la versión más reciente
+                        expected_final_name = f"folleto_{rut}.pdf"
+                        expected_final_path = os.path.join(download_dir, expected_final_name)
+                        if os.path.exists(expected_final_path):
+                            logger.warning(f"[SELENIUM] Eliminando PDF anterior: {expected_final_name}")
+                            try:
+                                os.remove(expected_final_path)
+                            except Exception as e:
+                                logger.error(f"[SELENIUM] No se pudo eliminar PDF anterior: {e}")
 
-                    # Wait for download with polling - PASAR existing_files para evitar detectar PDFs viejos
-                    pdf_path = _wait_for_download_complete(download_dir, timeout=60, existing_files=files_before_download)
+                        # FIX CRITICO: Capturar estado del directorio ANTES del click
+                        # Esto permite detectar solo archivos NUEVOS descargados
+                        files_before_download = set(os.listdir(download_dir))
+                        logger.info(f"[SELENIUM] Archivos existentes antes del click: {len(files_before_download)}")
 
-                    if pdf_path:
-                        latest_file = pdf_path
+                        # Eventos de navegaciones anteriores no deben confundirse con esta descarga
+                        if self._driver_cdp_downloads:
+                            _drain_cdp_events(driver)
 
-                        # Renombrar con formato estándar
-                        final_name = f"folleto_{rut}.pdf"
-                        final_path = os.path.join(download_dir, final_name)
+                        # Click triggers AJAX POST and window.open(pdf_url)
+                        logger.info(f"[SELENIUM] Executing click...")
+                        driver.execute_script("arguments[0].click();", first_link)
 
-                        # FIX: Solo renombrar si el archivo descargado NO es el archivo final
-                        # Esto evita errores cuando latest_file == final_path
-                        if latest_file != final_path:
-                            # Si el destino ya existe, sobrescribir
-                            if os.path.exists(final_path):
-                                logger.warning(f"[SELENIUM] Sobrescribiendo PDF existente: {final_name}")
-                                os.remove(final_path)
+                        pdf_path = None
+                        if self._driver_cdp_downloads:
+                            try:
+                                pdf_path = _wait_for_download_cdp(driver, download_dir, timeout=60,
+                                                                  existing_files=files_before_download)
+                            except Exception as e:
+                                logger.debug(f"[SELENIUM] Performance log no disponible ({e})")
+                                self._driver_cdp_downloads = False
+
+                        if pdf_path is None:
+                            # Sin eventos CDP (o no llegaron): mirar el directorio - PASAR existing_files para evitar detectar PDFs viejos
+                            wait_timeout = 5 if self._driver_cdp_downloads else 60
+                            pdf_path = _wait_for_download_complete(download_dir, timeout=wait_timeout, existing_files=files_before_download)
+
+                        if pdf_path:
+                            latest_file = pdf_path
+
+                            # Renombrar con formato estándar
+                            final_name = f"folleto_{rut}.pdf"
+                            final_path = os.path.join(download_dir, final_name)
+
+                            # FIX: Solo renombrar si el archivo descargado NO es el archivo final
+                            # Esto evita errores cuando latest_file == final_path
+                            if latest_file != final_path:
+                                # Si el destino ya existe, sobrescribir
+                                if os.path.exists(final_path):
+                                    logger.warning(f"[SELENIUM] Sobrescribiendo PDF existente: {final_name}")
+                                    os.remove(final_path)
+
+                                os.rename(latest_file, final_path)
+                                logger.info(f"[SELENIUM] PDF renombrado: {os.path.basename(latest_file)} -> {final_name}")
+                            else:
+                                logger.info(f"[SELENIUM] PDF ya tiene el nombre correcto: {final_name}")
 
-                            os.rename(latest_file, final_path)
-                            logger.info(f"[SELENIUM] PDF renombrado: {os.path.basename(latest_file)} -> {final_name}")
+                            logger.info(f"[SELENIUM] ✅ PDF downloaded: {final_path}")
+                            return final_path
                         else:
-                            logger.info(f"[SELENIUM] PDF ya tiene el nombre correcto: {final_name}")
-
-                        logger.info(f"[SELENIUM] ✅ PDF downloaded: {final_path}")
-                        return final_path
+                            logger.warning(f"[SELENIUM] ❌ Download failed or timeout")
+                            return None
                     else:
-                        logger.warning(f"[SELENIUM] ❌ Download failed or timeout")
-                        return None
-                else:
-                    # FIX 3.4: Fallback BeautifulSoup si XPath falla
-                    logger.warning(f"[SELENIUM] ❌ XPath no encontró enlaces, intentando fallback BeautifulSoup...")
-
-                    try:
-                        page_source = driver.page_source
-                        soup = BeautifulSoup(page_source, 'html.parser')
-
-                        # Buscar enlaces con onclick que contenga 'folleto' o 'verFolleto'
-                        links_onclick = soup.find_all(['a', 'button'], onclick=re.compile(r'(ver|abrir)?[Ff]olleto', re.IGNORECASE))
-
-                        if links_onclick:
-                            logger.info(f"[SELENIUM BEAUTIFULSOUP] ✓ Encontrados {len(links_onclick)} enlaces con BeautifulSoup")
-
-                            # Intentar extraer parámetros del onclick
-                            for link in links_onclick:
-                                onclick = link.get('onclick', '')
-                                logger.debug(f"[SELENIUM BEAUTIFULSOUP] onclick encontrado: {onclick[:100]}...")
-
-                                # Patrón para extraer parámetros verFolleto('run', 'serie', 'rutAdmin')
-                                match = re.search(r"verFolleto\('([^']*)',\s*'([^']*)',\s*'([^']*)'\)", onclick)
-                                if match:
-                                    logger.info(f"[SELENIUM BEAUTIFULSOUP] Parámetros extraídos, pero descarga directa no implementada")
-                                    # TODO: Implementar descarga directa con parámetros extraídos
-                                    break
-
-                        # También buscar enlaces directos a PDF
-                        links_pdf = soup.find_all('a', href=re.compile(r'\.pdf$', re.IGNORECASE))
-                        if links_pdf:
-                            logger.info(f"[SELENIUM BEAUTIFULSOUP] ✓ Encontrados {len(links_pdf)} enlaces directos PDF")
-                            # TODO: Implementar descarga de enlaces directos
+                        # FIX 3.4: Fallback BeautifulSoup si XPath falla
+                        logger.warning(f"[SELENIUM] ❌ XPath no encontró enlaces, intentando fallback BeautifulSoup...")
 
-                    except Exception as e:
-                        logger.error(f"[SELENIUM BEAUTIFULSOUP] Error en fallback: {e}")
+                        try:
+                            page_source = driver.page_source
+                            logger.info(f"[SELENIUM] Página sin folleto: {driver.current_url} ({len(page_source)} chars)")
+                            # Solo <a>/<button>: el resto del DOM (page_source completo) no se arma
+                            soup = BeautifulSoup(page_source, HTML_PARSER, parse_only=SoupStrainer(['a', 'button']))
+
+                            # Buscar enlaces con onclick que contenga 'folleto' o 'verFolleto'
+                            links_onclick = soup.find_all(['a', 'button'], onclick=REGEX_FOLLETO_ONCLICK)
+
+                            if links_onclick:
+                                logger.info(f"[SELENIUM BEAUTIFULSOUP] ✓ Encontrados {len(links_onclick)} enlaces con BeautifulSoup")
+
+                                # Intentar extraer parámetros del onclick
+                                for link in links_onclick:
+                                    onclick = link.get('onclick', '')
+                                    logger.debug(f"[SELENIUM BEAUTIFULSOUP] onclick encontrado: {onclick[:100]}...")
+
+                                    # Patrón para extraer parámetros verFolleto('run', 'serie', 'rutAdmin')
+                                    match = REGEX_VERFOLLETO_ARGS.search(onclick)
+                                    if match:
+                                        logger.info(f"[SELENIUM BEAUTIFULSOUP] Parámetros extraídos, pero descarga directa no implementada")
+                                        # TODO: Implementar descarga directa con parámetros extraídos
+                                        break
+
+                            # También buscar enlaces directos a PDF
+                            links_pdf = soup.find_all('a', href=REGEX_PDF_HREF)
+                            if links_pdf:
+                                logger.info(f"[SELENIUM BEAUTIFULSOUP] ✓ Encontrados {len(links_pdf)} enlaces directos PDF")
+                                # TODO: Implementar descarga de enlaces directos
 
-                    # Guardar screenshot para debugging
-                    screenshot_path = f"temp/debug_screenshot_{rut}.png"
-                    driver.save_screenshot(screenshot_path)
-                    logger.info(f"[SELENIUM] Screenshot guardado: {screenshot_path}")
-                    return None
+                        except Exception as e:
+                            logger.error(f"[SELENIUM BEAUTIFULSOUP] Error en fallback: {e}")
+
+                        # Guardar screenshot para debugging (solo con FONDO_DEBUG_SCREENSHOTS=1:
+                        # render + PNG a disco en cada fondo fallido)
+                        if self.debug_screenshots:
+                            screenshot_path = f"temp/debug_screenshot_{rut}.png"
+                            driver.save_screenshot(screenshot_path)
+                            logger.info(f"[SELENIUM] Screenshot guardado: {screenshot_path}")
+                        return None
 
-            finally:
-                driver.quit()
-                logger.info(f"[SELENIUM] Navegador cerrado")
+                except Exception:
+                    # Navegador en estado desconocido (crash, sesión perdida): descartarlo
+                    self._close_driver()
+                    raise
 
-        except ImportError as e:
-            logger.error(f"[SELENIUM] ❌ Error de importación: {e}")
-            logger.error(f"[SELENIUM] Instalar dependencias: pip install selenium webdriver-manager")
-            return None
-        except Exception as e:
-            logger.error(f"[SELENIUM] Error: {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
-            return None
+                finally:
+                    # Dejar el navegador limpio para el próximo fondo en lugar de cerrarlo
+                    if self._driver is not None:
+                        try:
+                            driver.delete_all_cookies()
+                            driver.get('about:blank')
+                        except Exception:
+                            self._close_driver()
+
+            except ImportError as e:
+                logger.error(f"[SELENIUM] ❌ Error de importación: {e}")
+                logger.error(f"[SELENIUM] Instalar dependencias: pip install selenium webdriver-manager")
+                return None
+            except Exception as e:
+                logger.error(f"[SELENIUM] Error: {e}")
+                import traceback
+                logger.debug(traceback.format_exc())
+                return None
 
     def _download_pdf_from_cmf(self, rut: str, run_completo: str = None, serie: str = "UNICA", rut_admin: str = None) -> Optional[str]:
         """
@@ -1087,20 +2791,11 @@ class FondosMutuosProcessor:
             os.makedirs('temp', exist_ok=True)
 
             # PASO 1: POST request para obtener la URL del PDF viewer
-            # CORRECCION: URL correcta del endpoint (antes: /institucional/inc/)
             # Probando SIN /pages/ (cmf_monitor.py línea 308 usa sin /pages/)
-            pdf_request_url = "https://www.cmfchile.cl/603/ver_folleto_fm.php"
+            pdf_request_url = CMF_FOLLETO_URL
 
             # Headers críticos para que funcione la descarga
-            # CORRECCION: Simplificados, removiendo Content-Type y X-Requested-With que pueden causar rechazo
-            # FIX 1.1: Proteger concatenation RUT en Referer header (evitar NoneType crash)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'es-CL,es;q=0.9',
-                'Origin': 'https://www.cmfchile.cl',
-                'Referer': f'https://www.cmfchile.cl/institucional/mercados/entidad.php?mercado=V&rut={rut or ""}'
-            }
+            headers = _cmf_folleto_headers(rut)
 
             # CORRECCION: Usar run_completo si está disponible, sino usar rut
             # CMF necesita el RUN con guión (ej: "10446-9" o "76.113.534-5")
@@ -1128,64 +2823,47 @@ class FondosMutuosProcessor:
                 logger.warning(f"[CMF PDF] Response text (primeros 500 chars): {response.text[:500]}")
                 return None
 
-            # La respuesta debe ser un path relativo al PDF viewer o "ERROR"
-            pdf_viewer_path = response.text.strip()
-
-            logger.debug(f"[CMF PDF] Respuesta PASO 1: {pdf_viewer_path[:200]}")
-
-            # CORRECCION: Validar que no sea HTML de error antes de intentar usarla como path
-            if pdf_viewer_path.startswith('<!DOCTYPE') or pdf_viewer_path.startswith('<html'):
-                logger.error(f"[CMF PDF] Respuesta HTML recibida en lugar de path. Primeros 500 chars: {pdf_viewer_path[:500]}")
-                return None
-
-            if pdf_viewer_path == 'ERROR' or not pdf_viewer_path:
-                logger.warning(f"[CMF PDF] No se encontró folleto para RUT {rut}, Serie {serie}")
-                return None
-
             # PASO 2: Descargar el PDF desde la URL del viewer
-            logger.debug(f"[CMF PDF] PASO 2 - Descargando PDF desde viewer: {pdf_viewer_path}")
-
-            # FIX 1.2: Validar pdf_viewer_path antes de construir URL (evitar NoneType crash)
-            if not pdf_viewer_path or pdf_viewer_path == 'ERROR':
-                logger.warning(f"[CMF PDF] Path de viewer inválido: {pdf_viewer_path}")
+            pdf_url = _cmf_viewer_url(response.text, rut, serie)
+            if not pdf_url:
                 return None
 
-            # Construir URL completa (siempre es un path relativo que comienza con /)
-            if pdf_viewer_path.startswith('/'):
-                pdf_url = f"https://www.cmfchile.cl{pdf_viewer_path}"
-            else:
-                pdf_url = f"https://www.cmfchile.cl/{pdf_viewer_path}"
-
             logger.info(f"[CMF PDF] URL completa del PDF viewer: {pdf_url}")
 
-            # Descargar el PDF con headers de navegador
-            pdf_response = self.session.get(pdf_url, headers=headers, timeout=60, allow_redirects=True)
+            # Descargar el PDF con headers de navegador, en streaming directo a disco:
+            # el folleto completo nunca queda en memoria
+            with self.session.get(pdf_url, headers=headers, timeout=60, allow_redirects=True,
+                                  stream=True) as pdf_response:
+                if pdf_response.status_code != 200:
+                    logger.warning(f"[CMF PDF] Error HTTP {pdf_response.status_code} al descargar PDF")
+                    return None
 
-            if pdf_response.status_code == 200:
-                # Verificar que es un PDF
+                # Verificar que es un PDF (Content-Type o firma %PDF del primer bloque)
                 content_type = pdf_response.headers.get('Content-Type', '')
+                chunks = pdf_response.iter_content(chunk_size=PDF_DOWNLOAD_CHUNK_SIZE)
+                first_chunk = next(chunks, b'')
+
+                if 'pdf' not in content_type.lower() and first_chunk[:4] != b'%PDF':
+                    logger.warning(f"[CMF PDF] La respuesta no es un PDF válido. Content-Type: {content_type}")
+                    logger.debug(f"[CMF PDF] Primeros 500 bytes: {first_chunk[:500]}")
+                    return None
 
-                if 'pdf' in content_type.lower() or pdf_response.content[:4] == b'%PDF':
-                    # Guardar PDF en temp
-                    pdf_path = f'temp/fondo_{rut}_{serie}.pdf'
-                    with open(pdf_path, 'wb') as f:
-                        f.write(pdf_response.content)
+                # Guardar PDF en temp
+                pdf_path = f'temp/fondo_{rut}_{serie}.pdf'
+                file_size = len(first_chunk)
+                with open(pdf_path, 'wb') as f:
+                    f.write(first_chunk)
+                    for chunk in chunks:
+                        f.write(chunk)
+                        file_size += len(chunk)
 
-                    file_size = len(pdf_response.content)
-                    logger.info(f"[CMF PDF] ✅ PDF descargado exitosamente: {pdf_path} ({file_size} bytes)")
+            logger.info(f"[CMF PDF] ✅ PDF descargado exitosamente: {pdf_path} ({file_size} bytes)")
 
-                    # GUARDAR EN CACHÉ
-                    if self._save_to_cache(rut, serie, pdf_path):
-                        logger.info(f"[CACHE] PDF guardado en caché para futuras consultas")
+            # GUARDAR EN CACHÉ
+            if self._save_to_cache(rut, serie, pdf_path):
+                logger.info(f"[CACHE] PDF guardado en caché para futuras consultas")
 
-                    return pdf_path
-                else:
-                    logger.warning(f"[CMF PDF] La respuesta no es un PDF válido. Content-Type: {content_type}")
-                    logger.debug(f"[CMF PDF] Primeros 500 bytes: {pdf_response.content[:500]}")
-                    return None
-            else:
-                logger.warning(f"[CMF PDF] Error HTTP {pdf_response.status_code} al descargar PDF")
-                return None
+            return pdf_path
 
         except Exception as e:
             logger.error(f"[CMF PDF] Error descargando PDF: {e}")
@@ -1244,630 +2922,622 @@ class FondosMutuosProcessor:
                 'pdf_procesado': True
             }
 
-            # Abrir PDF con pdfplumber
-            with pdfplumber.open(pdf_path) as pdf:
-                texto_completo = ""
-                for page in pdf.pages:
-                    texto_completo += page.extract_text() or ""
+            # Extraer texto (PyMuPDF si está instalado, pdfplumber como fallback) hasta
+            # que aparecieron todos los campos que se buscan, más una página
+            texto_completo, num_paginas, pdf_backend = extract_pdf_text(pdf_path, stop_patterns=PDF_CAMPOS_OBJETIVO)
+            resultado['total_paginas_pdf'] = num_paginas
 
-                logger.debug(f"[PDF EXTENDED] Extraídas {len(pdf.pages)} páginas, {len(texto_completo)} caracteres")
+            logger.debug(f"[PDF EXTENDED] Extraídas {num_paginas} páginas con {pdf_backend}, {len(texto_completo)} caracteres")
 
-                # FIX 5.2 & 5.4: OCR fallback si extracción text es muy pobre
-                if len(texto_completo.strip()) < 100:
-                    logger.warning(f"[PDF OCR] Text extraction pobre ({len(texto_completo)} chars), intentando OCR fallback...")
+            # FIX 5.2 & 5.4: OCR fallback si extracción text es muy pobre
+            if len(texto_completo.strip()) < 100:
+                logger.warning(f"[PDF OCR] Text extraction pobre ({len(texto_completo)} chars), intentando OCR fallback...")
 
-                    # FIX 5.1: Verificar si pytesseract está instalado
-                    try:
-                        from pdf2image import convert_from_path
-                        import pytesseract
-
-                        # FIX 5.3: Convertir solo primeras 3 páginas con dpi=300
-                        logger.info(f"[PDF OCR] Convirtiendo primeras 3 páginas (dpi=300)...")
-                        images = convert_from_path(
-                            pdf_path,
-                            dpi=300,
-                            first_page=1,
-                            last_page=min(3, len(pdf.pages))
-                        )
+                # FIX 5.1: Verificar si pytesseract está instalado
+                try:
+                    from pdf2image import convert_from_path
+                    import pytesseract
+
+                    # FIX 5.3: Convertir solo primeras 3 páginas con dpi=300
+                    logger.info(f"[PDF OCR] Convirtiendo primeras 3 páginas (dpi=300)...")
+                    images = convert_from_path(
+                        pdf_path,
+                        dpi=300,
+                        first_page=1,
+                        last_page=min(3, num_paginas or 3)
+                    )
 
-                        texto_ocr = ""
-                        for i, img in enumerate(images):
-                            logger.debug(f"[PDF OCR] Procesando página {i+1}/{len(images)}...")
-                            page_text = pytesseract.image_to_string(img, lang='spa')
-                            texto_ocr += f"\n--- OCR PÁGINA {i+1} ---\n{page_text}"
+                    texto_ocr = ""
+                    for i, img in enumerate(images):
+                        logger.debug(f"[PDF OCR] Procesando página {i+1}/{len(images)}...")
+                        page_text = pytesseract.image_to_string(img, lang='spa')
+                        texto_ocr += f"\n--- OCR PÁGINA {i+1} ---\n{page_text}"
 
-                        if len(texto_ocr.strip()) > len(texto_completo.strip()):
-                            texto_completo = texto_ocr
-                            logger.info(f"[PDF OCR] ✅ OCR exitoso: {len(texto_completo)} chars extraídos")
-                            resultado['extraction_method'] = 'OCR'
-                        else:
-                            logger.warning(f"[PDF OCR] OCR no mejoró extracción ({len(texto_ocr)} vs {len(texto_completo)})")
-                            resultado['extraction_method'] = 'pdfplumber (poor)'
+                    if len(texto_ocr.strip()) > len(texto_completo.strip()):
+                        texto_completo = texto_ocr
+                        logger.info(f"[PDF OCR] ✅ OCR exitoso: {len(texto_completo)} chars extraídos")
+                        resultado['extraction_method'] = 'OCR'
+                    else:
+                        logger.warning(f"[PDF OCR] OCR no mejoró extracción ({len(texto_ocr)} vs {len(texto_completo)})")
+                        resultado['extraction_method'] = f'{pdf_backend} (poor)'
 
-                    except ImportError:
-                        logger.warning(f"[PDF OCR] pytesseract/pdf2image no instalados - install: pip install pytesseract pdf2image")
-                        logger.warning(f"[PDF OCR] También instalar Tesseract: brew install tesseract poppler (macOS)")
-                        resultado['extraction_method'] = 'pdfplumber (poor, OCR unavailable)'
+                except ImportError:
+                    logger.warning(f"[PDF OCR] pytesseract/pdf2image no instalados - install: pip install pytesseract pdf2image")
+                    logger.warning(f"[PDF OCR] También instalar Tesseract: brew install tesseract poppler (macOS)")
+                    resultado['extraction_method'] = f'{pdf_backend} (poor, OCR unavailable)'
 
-                    except Exception as e:
-                        logger.error(f"[PDF OCR] Error en OCR fallback: {type(e).__name__}: {e}")
-                        resultado['extraction_method'] = 'pdfplumber (poor, OCR failed)'
+                except Exception as e:
+                    logger.error(f"[PDF OCR] Error en OCR fallback: {type(e).__name__}: {e}")
+                    resultado['extraction_method'] = f'{pdf_backend} (poor, OCR failed)'
+            else:
+                # FIX 5.4: Logger método de extracción
+                logger.info(f"[PDF EXTRACTION] ✅ {pdf_backend} exitoso: {len(texto_completo)} chars")
+                resultado['extraction_method'] = pdf_backend
+
+            resultado['texto_completo'] = texto_completo
+            texto_lower = texto_completo.lower()
+            lineas = texto_completo.split('\n')
+
+            # Contador de campos extraídos para calcular confianza
+            campos_extraidos = 0
+            campos_totales = 12  # Total de campos clave
+
+            # ============================================================
+            # PATRÓN 1: TIPO DE FONDO (Mejorado)
+            # ============================================================
+            # Una sola pasada sobre el texto del folleto (antes: una por keyword)
+            tipo = _match_pattern_category(texto_lower, CLASIFICACION_TIPO_FONDO_PDF,
+                                           AUTOMATON_TIPO_FONDO_PDF)
+            if tipo:
+                resultado['tipo_fondo'] = tipo
+                campos_extraidos += 1
+                logger.info(f"[PDF EXTENDED] Tipo de fondo: {tipo}")
+
+            # ============================================================
+            # PATRÓN 2: PERFIL DE RIESGO MEJORADO
+            # ============================================================
+            # A. Buscar escala R1-R7 (común en fondos chilenos)
+            match_r_scale = re.search(r'\bR([1-7])\b', texto_completo)
+            if match_r_scale:
+                r_numero = int(match_r_scale.group(1))
+                resultado['perfil_riesgo_escala'] = f'R{r_numero}'
+
+                # Convertir R1-R7 a categorías bajo/medio/alto
+                if r_numero <= 2:
+                    resultado['perfil_riesgo'] = 'Bajo'
+                elif r_numero <= 4:
+                    resultado['perfil_riesgo'] = 'Medio'
                 else:
-                    # FIX 5.4: Logger método de extracción
-                    logger.info(f"[PDF EXTRACTION] ✅ pdfplumber exitoso: {len(texto_completo)} chars")
-                    resultado['extraction_method'] = 'pdfplumber'
-
-                resultado['texto_completo'] = texto_completo
-                texto_lower = texto_completo.lower()
-                lineas = texto_completo.split('\n')
-
-                # Contador de campos extraídos para calcular confianza
-                campos_extraidos = 0
-                campos_totales = 12  # Total de campos clave
-
-                # ============================================================
-                # PATRÓN 1: TIPO DE FONDO (Mejorado)
-                # ============================================================
-                patrones_tipo = {
-                    'Conservador': ['conservador', 'capital garantizado', 'preservation', 'preservación'],
-                    'Agresivo': ['agresivo', 'aggressive', 'growth', 'crecimiento', 'accionario'],
-                    'Balanceado': ['balanceado', 'balanced', 'mixto', 'mixed', 'moderado'],
-                    'Dinámico': ['dinámico', 'dynamic', 'flexible'],
-                    'Liquidez': ['liquidez', 'liquidity', 'money market', 'monetario', 'disponible']
+                    resultado['perfil_riesgo'] = 'Alto'
+
+                campos_extraidos += 1
+                logger.info(f"[PDF EXTENDED] Perfil riesgo: {resultado['perfil_riesgo']} ({resultado['perfil_riesgo_escala']})")
+
+            # B. Buscar palabras clave de riesgo
+            if not resultado['perfil_riesgo']:
+                patrones_riesgo = {
+                    'Bajo': ['riesgo bajo', 'bajo riesgo', 'conservador', 'risk: low'],
+                    'Alto': ['riesgo alto', 'alto riesgo', 'agresivo', 'risk: high'],
+                    'Medio': ['riesgo medio', 'riesgo moderado', 'moderado', 'risk: medium']
                 }
 
-                for tipo, keywords in patrones_tipo.items():
+                for nivel, keywords in patrones_riesgo.items():
                     if any(keyword in texto_lower for keyword in keywords):
-                        resultado['tipo_fondo'] = tipo
+                        resultado['perfil_riesgo'] = nivel
                         campos_extraidos += 1
-                        logger.info(f"[PDF EXTENDED] Tipo de fondo: {tipo}")
+                        logger.info(f"[PDF EXTENDED] Perfil riesgo (keywords): {nivel}")
                         break
 
-                # ============================================================
-                # PATRÓN 2: PERFIL DE RIESGO MEJORADO
-                # ============================================================
-                # A. Buscar escala R1-R7 (común en fondos chilenos)
-                match_r_scale = re.search(r'\bR([1-7])\b', texto_completo)
-                if match_r_scale:
-                    r_numero = int(match_r_scale.group(1))
-                    resultado['perfil_riesgo_escala'] = f'R{r_numero}'
-
-                    # Convertir R1-R7 a categorías bajo/medio/alto
-                    if r_numero <= 2:
-                        resultado['perfil_riesgo'] = 'Bajo'
-                    elif r_numero <= 4:
-                        resultado['perfil_riesgo'] = 'Medio'
-                    else:
-                        resultado['perfil_riesgo'] = 'Alto'
+            # ============================================================
+            # PATRÓN 2B: TOLERANCIA AL RIESGO (NUEVO)
+            # ============================================================
+            patrones_tolerancia = {
+                'Baja': ['tolerancia baja', 'baja tolerancia', 'aversión al riesgo', 'averso al riesgo'],
+                'Media': ['tolerancia media', 'tolerancia moderada', 'moderada tolerancia'],
+                'Alta': ['tolerancia alta', 'alta tolerancia', 'tolerante al riesgo']
+            }
 
+            for nivel, keywords in patrones_tolerancia.items():
+                if any(keyword in texto_lower for keyword in keywords):
+                    resultado['tolerancia_riesgo'] = nivel
                     campos_extraidos += 1
-                    logger.info(f"[PDF EXTENDED] Perfil riesgo: {resultado['perfil_riesgo']} ({resultado['perfil_riesgo_escala']})")
-
-                # B. Buscar palabras clave de riesgo
-                if not resultado['perfil_riesgo']:
-                    patrones_riesgo = {
-                        'Bajo': ['riesgo bajo', 'bajo riesgo', 'conservador', 'risk: low'],
-                        'Alto': ['riesgo alto', 'alto riesgo', 'agresivo', 'risk: high'],
-                        'Medio': ['riesgo medio', 'riesgo moderado', 'moderado', 'risk: medium']
-                    }
-
-                    for nivel, keywords in patrones_riesgo.items():
-                        if any(keyword in texto_lower for keyword in keywords):
-                            resultado['perfil_riesgo'] = nivel
-                            campos_extraidos += 1
-                            logger.info(f"[PDF EXTENDED] Perfil riesgo (keywords): {nivel}")
-                            break
-
-                # ============================================================
-                # PATRÓN 2B: TOLERANCIA AL RIESGO (NUEVO)
-                # ============================================================
-                patrones_tolerancia = {
-                    'Baja': ['tolerancia baja', 'baja tolerancia', 'aversión al riesgo', 'averso al riesgo'],
-                    'Media': ['tolerancia media', 'tolerancia moderada', 'moderada tolerancia'],
-                    'Alta': ['tolerancia alta', 'alta tolerancia', 'tolerante al riesgo']
-                }
+                    logger.info(f"[PDF EXTENDED] Tolerancia riesgo: {nivel}")
+                    break
 
-                for nivel, keywords in patrones_tolerancia.items():
-                    if any(keyword in texto_lower for keyword in keywords):
-                        resultado['tolerancia_riesgo'] = nivel
+            # Buscar también frases como "perfil del inversionista"
+            for linea in lineas:
+                linea_lower = linea.lower()
+                if 'perfil del inversionista' in linea_lower or 'perfil inversionista' in linea_lower:
+                    if 'conservador' in linea_lower:
+                        resultado['tolerancia_riesgo'] = 'Baja'
+                        resultado['perfil_inversionista_ideal'] = 'Conservador'
                         campos_extraidos += 1
-                        logger.info(f"[PDF EXTENDED] Tolerancia riesgo: {nivel}")
-                        break
+                        logger.info(f"[PDF EXTENDED] Perfil inversionista: Conservador (tolerancia baja)")
+                    elif 'moderado' in linea_lower or 'balanceado' in linea_lower:
+                        resultado['tolerancia_riesgo'] = 'Media'
+                        resultado['perfil_inversionista_ideal'] = 'Moderado'
+                        campos_extraidos += 1
+                        logger.info(f"[PDF EXTENDED] Perfil inversionista: Moderado (tolerancia media)")
+                    elif 'agresivo' in linea_lower or 'arriesgado' in linea_lower:
+                        resultado['tolerancia_riesgo'] = 'Alta'
+                        resultado['perfil_inversionista_ideal'] = 'Agresivo'
+                        campos_extraidos += 1
+                        logger.info(f"[PDF EXTENDED] Perfil inversionista: Agresivo (tolerancia alta)")
+                    break
 
-                # Buscar también frases como "perfil del inversionista"
-                for linea in lineas:
+            # ============================================================
+            # PATRÓN 3: HORIZONTE DE INVERSIÓN
+            # ============================================================
+            for linea in lineas:
+                if 'horizonte' in linea.lower():
                     linea_lower = linea.lower()
-                    if 'perfil del inversionista' in linea_lower or 'perfil inversionista' in linea_lower:
-                        if 'conservador' in linea_lower:
-                            resultado['tolerancia_riesgo'] = 'Baja'
-                            resultado['perfil_inversionista_ideal'] = 'Conservador'
-                            campos_extraidos += 1
-                            logger.info(f"[PDF EXTENDED] Perfil inversionista: Conservador (tolerancia baja)")
-                        elif 'moderado' in linea_lower or 'balanceado' in linea_lower:
-                            resultado['tolerancia_riesgo'] = 'Media'
-                            resultado['perfil_inversionista_ideal'] = 'Moderado'
-                            campos_extraidos += 1
-                            logger.info(f"[PDF EXTENDED] Perfil inversionista: Moderado (tolerancia media)")
-                        elif 'agresivo' in linea_lower or 'arriesgado' in linea_lower:
-                            resultado['tolerancia_riesgo'] = 'Alta'
-                            resultado['perfil_inversionista_ideal'] = 'Agresivo'
-                            campos_extraidos += 1
-                            logger.info(f"[PDF EXTENDED] Perfil inversionista: Agresivo (tolerancia alta)")
-                        break
 
-                # ============================================================
-                # PATRÓN 3: HORIZONTE DE INVERSIÓN
-                # ============================================================
-                for linea in lineas:
-                    if 'horizonte' in linea.lower():
-                        linea_lower = linea.lower()
+                    # Buscar categorías
+                    if 'corto plazo' in linea_lower:
+                        resultado['horizonte_inversion'] = 'Corto Plazo'
+                        resultado['horizonte_inversion_meses'] = 12
+                        campos_extraidos += 1
+                    elif 'mediano plazo' in linea_lower or 'medio plazo' in linea_lower:
+                        resultado['horizonte_inversion'] = 'Mediano Plazo'
+                        resultado['horizonte_inversion_meses'] = 24
+                        campos_extraidos += 1
+                    elif 'largo plazo' in linea_lower:
+                        resultado['horizonte_inversion'] = 'Largo Plazo'
+                        resultado['horizonte_inversion_meses'] = 60
+                        campos_extraidos += 1
+
+                    # Buscar meses/años específicos: "24 meses", "5 años"
+                    match_meses = re.search(r'(\d+)\s*meses', linea_lower)
+                    match_anos = re.search(r'(\d+)\s*años?', linea_lower)
 
-                        # Buscar categorías
-                        if 'corto plazo' in linea_lower:
+                    if match_meses:
+                        meses = int(match_meses.group(1))
+                        resultado['horizonte_inversion_meses'] = meses
+                        if meses < 12:
                             resultado['horizonte_inversion'] = 'Corto Plazo'
-                            resultado['horizonte_inversion_meses'] = 12
-                            campos_extraidos += 1
-                        elif 'mediano plazo' in linea_lower or 'medio plazo' in linea_lower:
+                        elif meses <= 36:
                             resultado['horizonte_inversion'] = 'Mediano Plazo'
-                            resultado['horizonte_inversion_meses'] = 24
-                            campos_extraidos += 1
-                        elif 'largo plazo' in linea_lower:
+                        else:
+                            resultado['horizonte_inversion'] = 'Largo Plazo'
+                    elif match_anos:
+                        anos = int(match_anos.group(1))
+                        resultado['horizonte_inversion_meses'] = anos * 12
+                        if anos <= 1:
+                            resultado['horizonte_inversion'] = 'Corto Plazo'
+                        elif anos <= 3:
+                            resultado['horizonte_inversion'] = 'Mediano Plazo'
+                        else:
                             resultado['horizonte_inversion'] = 'Largo Plazo'
-                            resultado['horizonte_inversion_meses'] = 60
-                            campos_extraidos += 1
 
-                        # Buscar meses/años específicos: "24 meses", "5 años"
-                        match_meses = re.search(r'(\d+)\s*meses', linea_lower)
-                        match_anos = re.search(r'(\d+)\s*años?', linea_lower)
-
-                        if match_meses:
-                            meses = int(match_meses.group(1))
-                            resultado['horizonte_inversion_meses'] = meses
-                            if meses < 12:
-                                resultado['horizonte_inversion'] = 'Corto Plazo'
-                            elif meses <= 36:
-                                resultado['horizonte_inversion'] = 'Mediano Plazo'
-                            else:
-                                resultado['horizonte_inversion'] = 'Largo Plazo'
-                        elif match_anos:
-                            anos = int(match_anos.group(1))
-                            resultado['horizonte_inversion_meses'] = anos * 12
-                            if anos <= 1:
-                                resultado['horizonte_inversion'] = 'Corto Plazo'
-                            elif anos <= 3:
-                                resultado['horizonte_inversion'] = 'Mediano Plazo'
-                            else:
-                                resultado['horizonte_inversion'] = 'Largo Plazo'
+                    if resultado['horizonte_inversion']:
+                        logger.info(f"[PDF EXTENDED] Horizonte: {resultado['horizonte_inversion']} ({resultado['horizonte_inversion_meses']} meses)")
+                        break
 
-                        if resultado['horizonte_inversion']:
-                            logger.info(f"[PDF EXTENDED] Horizonte: {resultado['horizonte_inversion']} ({resultado['horizonte_inversion_meses']} meses)")
-                            break
+            # ============================================================
+            # PATRÓN 4: COMISIÓN DE ADMINISTRACIÓN
+            # ============================================================
+            for linea in lineas:
+                if 'remun' in linea.lower() or 'tac serie' in linea.lower():
+                    # FIX 4.1 & 4.4: Usar regex compilado module-level
+                    match_comision = REGEX_COMISION.search(linea)
+                    if match_comision:
+                        try:
+                            comision_str = match_comision.group(1).replace(',', '.')
 
-                # ============================================================
-                # PATRÓN 4: COMISIÓN DE ADMINISTRACIÓN
-                # ============================================================
-                for linea in lineas:
-                    if 'remun' in linea.lower() or 'tac serie' in linea.lower():
-                        # FIX 4.1 & 4.4: Usar regex compilado module-level
-                        match_comision = REGEX_COMISION.search(linea)
-                        if match_comision:
-                            try:
-                                comision_str = match_comision.group(1).replace(',', '.')
+                            # FIX 4.2: Validar que no sea string vacío o solo punto
+                            if not comision_str or comision_str == '.' or comision_str == '':
+                                continue
 
-                                # FIX 4.2: Validar que no sea string vacío o solo punto
-                                if not comision_str or comision_str == '.' or comision_str == '':
-                                    continue
+                            comision_num = float(comision_str)
+
+                            # Si es mayor a 10, probablemente está en porcentaje
+                            if comision_num > 10:
+                                resultado['comision_administracion'] = comision_num / 100
+                            else:
+                                resultado['comision_administracion'] = comision_num / 100
 
-                                comision_num = float(comision_str)
+                            campos_extraidos += 1
+                            logger.info(f"[PDF EXTENDED] Comisión admin: {resultado['comision_administracion']:.4f} ({comision_num}%)")
+                            break
+                        except ValueError as e:
+                            logger.debug(f"[PDF EXTENDED] Error parseando comisión: {e}")
+                            continue
 
-                                # Si es mayor a 10, probablemente está en porcentaje
-                                if comision_num > 10:
-                                    resultado['comision_administracion'] = comision_num / 100
-                                else:
-                                    resultado['comision_administracion'] = comision_num / 100
+            # ============================================================
+            # PATRÓN 5: COMISIÓN DE RESCATE
+            # ============================================================
+            for linea in lineas:
+                if 'comisión máxima' in linea.lower() or 'comision rescate' in linea.lower():
+                    matches = re.findall(r'(\d+[\.,]\d+)', linea)
+                    if matches:
+                        try:
+                            # Tomar el primer valor encontrado
+                            comision_str = matches[0].replace(',', '.')
+                            comision_num = float(comision_str)
 
+                            if comision_num > 0:
+                                resultado['comision_rescate'] = comision_num / 100
                                 campos_extraidos += 1
-                                logger.info(f"[PDF EXTENDED] Comisión admin: {resultado['comision_administracion']:.4f} ({comision_num}%)")
+                                logger.info(f"[PDF EXTENDED] Comisión rescate: {resultado['comision_rescate']:.4f} ({comision_num}%)")
                                 break
-                            except ValueError as e:
-                                logger.debug(f"[PDF EXTENDED] Error parseando comisión: {e}")
-                                continue
+                        except ValueError:
+                            continue
 
-                # ============================================================
-                # PATRÓN 5: COMISIÓN DE RESCATE
-                # ============================================================
-                for linea in lineas:
-                    if 'comisión máxima' in linea.lower() or 'comision rescate' in linea.lower():
-                        matches = re.findall(r'(\d+[\.,]\d+)', linea)
-                        if matches:
-                            try:
-                                # Tomar el primer valor encontrado
-                                comision_str = matches[0].replace(',', '.')
-                                comision_num = float(comision_str)
+            # ============================================================
+            # PATRÓN 5B: INFORMACIÓN DE RESCATE (NUEVO)
+            # ============================================================
+            # Buscar si el fondo es rescatable
+            for linea in lineas:
+                linea_lower = linea.lower()
+                if 'rescatable' in linea_lower:
+                    if 'no rescatable' in linea_lower or 'sin rescate' in linea_lower:
+                        resultado['fondo_rescatable'] = False
+                        logger.info(f"[PDF EXTENDED] Fondo NO rescatable")
+                    else:
+                        resultado['fondo_rescatable'] = True
+                        logger.info(f"[PDF EXTENDED] Fondo rescatable")
+                    campos_extraidos += 1
+                    break
+                elif 'liquidez' in linea_lower or 'reembolso' in linea_lower:
+                    resultado['fondo_rescatable'] = True
+                    campos_extraidos += 1
+                    logger.info(f"[PDF EXTENDED] Fondo rescatable (por mención liquidez/reembolso)")
+                    break
 
-                                if comision_num > 0:
-                                    resultado['comision_rescate'] = comision_num / 100
-                                    campos_extraidos += 1
-                                    logger.info(f"[PDF EXTENDED] Comisión rescate: {resultado['comision_rescate']:.4f} ({comision_num}%)")
-                                    break
-                            except ValueError:
-                                continue
+            # Buscar plazos de rescate
+            for linea in lineas:
+                linea_lower = linea.lower()
+                if 'plazo de rescate' in linea_lower or 'días para rescate' in linea_lower or 'plazo para rescate' in linea_lower:
+                    # Buscar número de días
+                    match_dias = re.search(r'(\d+)\s*días?', linea_lower)
+                    if match_dias:
+                        dias = match_dias.group(1)
+                        resultado['plazos_rescates'] = f"{dias} días"
+                        campos_extraidos += 1
+                        logger.info(f"[PDF EXTENDED] Plazo rescate: {dias} días")
+                        break
 
-                # ============================================================
-                # PATRÓN 5B: INFORMACIÓN DE RESCATE (NUEVO)
-                # ============================================================
-                # Buscar si el fondo es rescatable
-                for linea in lineas:
-                    linea_lower = linea.lower()
-                    if 'rescatable' in linea_lower:
-                        if 'no rescatable' in linea_lower or 'sin rescate' in linea_lower:
-                            resultado['fondo_rescatable'] = False
-                            logger.info(f"[PDF EXTENDED] Fondo NO rescatable")
-                        else:
-                            resultado['fondo_rescatable'] = True
-                            logger.info(f"[PDF EXTENDED] Fondo rescatable")
+            # Buscar duración del fondo
+            for linea in lineas:
+                linea_lower = linea.lower()
+                if 'duración' in linea_lower or 'plazo del fondo' in linea_lower or 'vigencia del fondo' in linea_lower:
+                    # Buscar años o meses
+                    match_anos = re.search(r'(\d+)\s*años?', linea_lower)
+                    match_meses = re.search(r'(\d+)\s*meses', linea_lower)
+                    if match_anos:
+                        anos = match_anos.group(1)
+                        resultado['duracion'] = f"{anos} años"
                         campos_extraidos += 1
+                        logger.info(f"[PDF EXTENDED] Duración: {anos} años")
                         break
-                    elif 'liquidez' in linea_lower or 'reembolso' in linea_lower:
-                        resultado['fondo_rescatable'] = True
+                    elif match_meses:
+                        meses = match_meses.group(1)
+                        resultado['duracion'] = f"{meses} meses"
                         campos_extraidos += 1
-                        logger.info(f"[PDF EXTENDED] Fondo rescatable (por mención liquidez/reembolso)")
+                        logger.info(f"[PDF EXTENDED] Duración: {meses} meses")
                         break
+                elif 'indefinido' in linea_lower or 'sin plazo' in linea_lower:
+                    resultado['duracion'] = 'Indefinido'
+                    campos_extraidos += 1
+                    logger.info(f"[PDF EXTENDED] Duración: Indefinido")
+                    break
 
-                # Buscar plazos de rescate
-                for linea in lineas:
-                    linea_lower = linea.lower()
-                    if 'plazo de rescate' in linea_lower or 'días para rescate' in linea_lower or 'plazo para rescate' in linea_lower:
-                        # Buscar número de días
-                        match_dias = re.search(r'(\d+)\s*días?', linea_lower)
-                        if match_dias:
-                            dias = match_dias.group(1)
-                            resultado['plazos_rescates'] = f"{dias} días"
+            # ============================================================
+            # PATRÓN 5C: MONTO MÍNIMO DE INVERSIÓN (NUEVO)
+            # ============================================================
+            patrones_monto_minimo = [
+                'monto mínimo', 'inversión mínima', 'aporte mínimo',
+                'capital mínimo', 'monto inicial', 'inversión inicial',
+                'cuota mínima', 'aporte inicial mínimo'
+            ]
+
+            for i, linea in enumerate(lineas):
+                linea_lower = linea.lower()
+                if any(patron in linea_lower for patron in patrones_monto_minimo):
+                    # Buscar en línea actual y próximas 3 líneas
+                    texto_busqueda = ' '.join(lineas[i:min(i+4, len(lineas))]).lower()
+
+                    # Patrón 1: UF (común en fondos chilenos)
+                    # Ejemplos: "UF 100", "100 UF", "UF 1.000", "UF100"
+                    match_uf = re.search(r'(?:UF|uf)\s*[:\.]?\s*(\d+(?:[\.,]\d+)*)', texto_busqueda, re.IGNORECASE)
+                    if match_uf:
+                        uf = match_uf.group(1).replace('.', '').replace(',', '.')
+                        try:
+                            uf_num = float(uf)
+                            resultado['monto_minimo'] = f"{uf_num:.2f} UF"
+                            resultado['monto_minimo_moneda'] = 'UF'
+                            resultado['monto_minimo_valor'] = uf_num
                             campos_extraidos += 1
-                            logger.info(f"[PDF EXTENDED] Plazo rescate: {dias} días")
+                            logger.info(f"[PDF EXTENDED] Monto mínimo: {uf_num:.2f} UF")
                             break
+                        except ValueError:
+                            pass
+
+                    # Patrón 2: Pesos chilenos con símbolo $
+                    # Ejemplos: "$100.000", "$ 1.000.000", "$100,000"
+                    match_pesos_simbolo = re.search(r'\$\s*(\d{1,3}(?:[\.,]\d{3})*(?:[\.,]\d{1,2})?)', texto_busqueda)
+                    if match_pesos_simbolo:
+                        monto = match_pesos_simbolo.group(1).replace('.', '').replace(',', '')
+                        try:
+                            monto_num = float(monto)
+                            if monto_num > 1000:  # Filtrar valores muy bajos que podrían ser errores
+                                resultado['monto_minimo'] = f"${monto_num:,.0f} CLP"
+                                resultado['monto_minimo_moneda'] = 'CLP'
+                                resultado['monto_minimo_valor'] = monto_num
+                                campos_extraidos += 1
+                                logger.info(f"[PDF EXTENDED] Monto mínimo: ${monto_num:,.0f} CLP")
+                                break
+                        except ValueError:
+                            pass
+
+                    # Patrón 3: Números seguidos de "pesos", "CLP", "pesos chilenos"
+                    # Ejemplos: "100.000 pesos", "1000000 CLP", "500 mil pesos"
+                    match_pesos_texto = re.search(r'(\d{1,3}(?:[\.,]\d{3})*)\s*(?:pesos|clp|peso)', texto_busqueda)
+                    if match_pesos_texto:
+                        monto = match_pesos_texto.group(1).replace('.', '').replace(',', '')
+                        try:
+                            monto_num = float(monto)
+                            if monto_num > 1000:
+                                resultado['monto_minimo'] = f"${monto_num:,.0f} CLP"
+                                resultado['monto_minimo_moneda'] = 'CLP'
+                                resultado['monto_minimo_valor'] = monto_num
+                                campos_extraidos += 1
+                                logger.info(f"[PDF EXTENDED] Monto mínimo: ${monto_num:,.0f} CLP")
+                                break
+                        except ValueError:
+                            pass
+
+                    # Patrón 4: "X mil", "X millones"
+                    # Ejemplos: "100 mil pesos", "1 millón"
+                    match_miles = re.search(r'(\d+(?:[\.,]\d+)?)\s*mil(?:\s+(?:pesos|clp))?', texto_busqueda)
+                    match_millones = re.search(r'(\d+(?:[\.,]\d+)?)\s*mill[oó]n(?:es)?(?:\s+(?:pesos|clp))?', texto_busqueda)
 
-                # Buscar duración del fondo
-                for linea in lineas:
-                    linea_lower = linea.lower()
-                    if 'duración' in linea_lower or 'plazo del fondo' in linea_lower or 'vigencia del fondo' in linea_lower:
-                        # Buscar años o meses
-                        match_anos = re.search(r'(\d+)\s*años?', linea_lower)
-                        match_meses = re.search(r'(\d+)\s*meses', linea_lower)
-                        if match_anos:
-                            anos = match_anos.group(1)
-                            resultado['duracion'] = f"{anos} años"
+                    if match_millones:
+                        num = match_millones.group(1).replace(',', '.')
+                        try:
+                            num_float = float(num)
+                            monto_num = num_float * 1_000_000
+                            resultado['monto_minimo'] = f"${monto_num:,.0f} CLP"
+                            resultado['monto_minimo_moneda'] = 'CLP'
+                            resultado['monto_minimo_valor'] = monto_num
                             campos_extraidos += 1
-                            logger.info(f"[PDF EXTENDED] Duración: {anos} años")
+                            logger.info(f"[PDF EXTENDED] Monto mínimo: ${monto_num:,.0f} CLP ({num_float} millones)")
                             break
-                        elif match_meses:
-                            meses = match_meses.group(1)
-                            resultado['duracion'] = f"{meses} meses"
+                        except ValueError:
+                            pass
+                    elif match_miles:
+                        num = match_miles.group(1).replace(',', '.')
+                        try:
+                            num_float = float(num)
+                            monto_num = num_float * 1_000
+                            resultado['monto_minimo'] = f"${monto_num:,.0f} CLP"
+                            resultado['monto_minimo_moneda'] = 'CLP'
+                            resultado['monto_minimo_valor'] = monto_num
                             campos_extraidos += 1
-                            logger.info(f"[PDF EXTENDED] Duración: {meses} meses")
+                            logger.info(f"[PDF EXTENDED] Monto mínimo: ${monto_num:,.0f} CLP ({num_float} mil)")
                             break
-                    elif 'indefinido' in linea_lower or 'sin plazo' in linea_lower:
-                        resultado['duracion'] = 'Indefinido'
-                        campos_extraidos += 1
-                        logger.info(f"[PDF EXTENDED] Duración: Indefinido")
-                        break
-
-                # ============================================================
-                # PATRÓN 5C: MONTO MÍNIMO DE INVERSIÓN (NUEVO)
-                # ============================================================
-                patrones_monto_minimo = [
-                    'monto mínimo', 'inversión mínima', 'aporte mínimo',
-                    'capital mínimo', 'monto inicial', 'inversión inicial',
-                    'cuota mínima', 'aporte inicial mínimo'
-                ]
+                        except ValueError:
+                            pass
 
-                for i, linea in enumerate(lineas):
-                    linea_lower = linea.lower()
-                    if any(patron in linea_lower for patron in patrones_monto_minimo):
-                        # Buscar en línea actual y próximas 3 líneas
-                        texto_busqueda = ' '.join(lineas[i:min(i+4, len(lineas))]).lower()
-
-                        # Patrón 1: UF (común en fondos chilenos)
-                        # Ejemplos: "UF 100", "100 UF", "UF 1.000", "UF100"
-                        match_uf = re.search(r'(?:UF|uf)\s*[:\.]?\s*(\d+(?:[\.,]\d+)*)', texto_busqueda, re.IGNORECASE)
-                        if match_uf:
-                            uf = match_uf.group(1).replace('.', '').replace(',', '.')
-                            try:
-                                uf_num = float(uf)
-                                resultado['monto_minimo'] = f"{uf_num:.2f} UF"
-                                resultado['monto_minimo_moneda'] = 'UF'
-                                resultado['monto_minimo_valor'] = uf_num
-                                campos_extraidos += 1
-                                logger.info(f"[PDF EXTENDED] Monto mínimo: {uf_num:.2f} UF")
-                                break
-                            except ValueError:
-                                pass
+                    # Patrón 5: USD (algunos fondos internacionales)
+                    match_usd = re.search(r'(?:USD|US\$|U\.S\.\$)\s*(\d+(?:[\.,]\d+)*)', texto_busqueda, re.IGNORECASE)
+                    if match_usd:
+                        usd = match_usd.group(1).replace(',', '')
+                        try:
+                            usd_num = float(usd)
+                            resultado['monto_minimo'] = f"${usd_num:,.2f} USD"
+                            resultado['monto_minimo_moneda'] = 'USD'
+                            resultado['monto_minimo_valor'] = usd_num
+                            campos_extraidos += 1
+                            logger.info(f"[PDF EXTENDED] Monto mínimo: ${usd_num:,.2f} USD")
+                            break
+                        except ValueError:
+                            pass
 
-                        # Patrón 2: Pesos chilenos con símbolo $
-                        # Ejemplos: "$100.000", "$ 1.000.000", "$100,000"
-                        match_pesos_simbolo = re.search(r'\$\s*(\d{1,3}(?:[\.,]\d{3})*(?:[\.,]\d{1,2})?)', texto_busqueda)
-                        if match_pesos_simbolo:
-                            monto = match_pesos_simbolo.group(1).replace('.', '').replace(',', '')
+            # ============================================================
+            # PATRÓN 6: RENTABILIDAD HISTÓRICA
+            # ============================================================
+            # FIX 4.3: Regex robustificado para rentabilidades (acepta ".5", "9.5", "-2.3")
+            for i, linea in enumerate(lineas):
+                if 'rentabilidades anualizadas' in linea.lower() or '1 año' in linea.lower():
+                    # Buscar en las siguientes 10 líneas
+                    for j in range(i, min(i + 10, len(lineas))):
+                        linea_busqueda = lineas[j]
+
+                        # Patrón: "1 Año 0,48%" - FIX 4.4: usar regex compilado
+                        match_1ano = REGEX_RENT_1ANO.search(linea_busqueda)
+                        if match_1ano:
                             try:
-                                monto_num = float(monto)
-                                if monto_num > 1000:  # Filtrar valores muy bajos que podrían ser errores
-                                    resultado['monto_minimo'] = f"${monto_num:,.0f} CLP"
-                                    resultado['monto_minimo_moneda'] = 'CLP'
-                                    resultado['monto_minimo_valor'] = monto_num
+                                rent_str = match_1ano.group(1).replace(',', '.')
+                                # FIX 4.2: Validar no vacío
+                                if rent_str and rent_str not in ['.', '-', '-.']:
+                                    resultado['rentabilidad_12m'] = float(rent_str) / 100
                                     campos_extraidos += 1
-                                    logger.info(f"[PDF EXTENDED] Monto mínimo: ${monto_num:,.0f} CLP")
-                                    break
-                            except ValueError:
+                                    logger.info(f"[PDF EXTENDED] Rentabilidad 12m: {resultado['rentabilidad_12m']:.2%}")
+                            except ValueError as e:
+                                logger.debug(f"[PDF EXTENDED] Error parseando rent 12m: {e}")
                                 pass
 
-                        # Patrón 3: Números seguidos de "pesos", "CLP", "pesos chilenos"
-                        # Ejemplos: "100.000 pesos", "1000000 CLP", "500 mil pesos"
-                        match_pesos_texto = re.search(r'(\d{1,3}(?:[\.,]\d{3})*)\s*(?:pesos|clp|peso)', texto_busqueda)
-                        if match_pesos_texto:
-                            monto = match_pesos_texto.group(1).replace('.', '').replace(',', '')
+                        # Patrón: "2 Años 5,5%" - FIX 4.4: usar regex compilado
+                        match_2anos = REGEX_RENT_2ANOS.search(linea_busqueda)
+                        if match_2anos:
                             try:
-                                monto_num = float(monto)
-                                if monto_num > 1000:
-                                    resultado['monto_minimo'] = f"${monto_num:,.0f} CLP"
-                                    resultado['monto_minimo_moneda'] = 'CLP'
-                                    resultado['monto_minimo_valor'] = monto_num
+                                rent_str = match_2anos.group(1).replace(',', '.')
+                                if rent_str and rent_str not in ['.', '-', '-.']:
+                                    resultado['rentabilidad_24m'] = float(rent_str) / 100
                                     campos_extraidos += 1
-                                    logger.info(f"[PDF EXTENDED] Monto mínimo: ${monto_num:,.0f} CLP")
-                                    break
-                            except ValueError:
+                                    logger.info(f"[PDF EXTENDED] Rentabilidad 24m: {resultado['rentabilidad_24m']:.2%}")
+                            except ValueError as e:
+                                logger.debug(f"[PDF EXTENDED] Error parseando rent 24m: {e}")
                                 pass
 
-                        # Patrón 4: "X mil", "X millones"
-                        # Ejemplos: "100 mil pesos", "1 millón"
-                        match_miles = re.search(r'(\d+(?:[\.,]\d+)?)\s*mil(?:\s+(?:pesos|clp))?', texto_busqueda)
-                        match_millones = re.search(r'(\d+(?:[\.,]\d+)?)\s*mill[oó]n(?:es)?(?:\s+(?:pesos|clp))?', texto_busqueda)
-
-                        if match_millones:
-                            num = match_millones.group(1).replace(',', '.')
-                            try:
-                                num_float = float(num)
-                                monto_num = num_float * 1_000_000
-                                resultado['monto_minimo'] = f"${monto_num:,.0f} CLP"
-                                resultado['monto_minimo_moneda'] = 'CLP'
-                                resultado['monto_minimo_valor'] = monto_num
-                                campos_extraidos += 1
-                                logger.info(f"[PDF EXTENDED] Monto mínimo: ${monto_num:,.0f} CLP ({num_float} millones)")
-                                break
-                            except ValueError:
-                                pass
-                        elif match_miles:
-                            num = match_miles.group(1).replace(',', '.')
+                        # Patrón: "3 Años" o "5 Años" - FIX 4.4: usar regex compilado
+                        match_3anos = REGEX_RENT_3ANOS.search(linea_busqueda)
+                        if match_3anos:
                             try:
-                                num_float = float(num)
-                                monto_num = num_float * 1_000
-                                resultado['monto_minimo'] = f"${monto_num:,.0f} CLP"
-                                resultado['monto_minimo_moneda'] = 'CLP'
-                                resultado['monto_minimo_valor'] = monto_num
-                                campos_extraidos += 1
-                                logger.info(f"[PDF EXTENDED] Monto mínimo: ${monto_num:,.0f} CLP ({num_float} mil)")
-                                break
-                            except ValueError:
+                                rent_str = match_3anos.group(1).replace(',', '.')
+                                if rent_str and rent_str not in ['.', '-', '-.']:
+                                    resultado['rentabilidad_36m'] = float(rent_str) / 100
+                                    campos_extraidos += 1
+                                    logger.info(f"[PDF EXTENDED] Rentabilidad 36m: {resultado['rentabilidad_36m']:.2%}")
+                            except ValueError as e:
+                                logger.debug(f"[PDF EXTENDED] Error parseando rent 36m: {e}")
                                 pass
 
-                        # Patrón 5: USD (algunos fondos internacionales)
-                        match_usd = re.search(r'(?:USD|US\$|U\.S\.\$)\s*(\d+(?:[\.,]\d+)*)', texto_busqueda, re.IGNORECASE)
-                        if match_usd:
-                            usd = match_usd.group(1).replace(',', '')
-                            try:
-                                usd_num = float(usd)
-                                resultado['monto_minimo'] = f"${usd_num:,.2f} USD"
-                                resultado['monto_minimo_moneda'] = 'USD'
-                                resultado['monto_minimo_valor'] = usd_num
-                                campos_extraidos += 1
-                                logger.info(f"[PDF EXTENDED] Monto mínimo: ${usd_num:,.2f} USD")
-                                break
-                            except ValueError:
-                                pass
+            # ============================================================
+            # PATRÓN 7: PATRIMONIO DEL FONDO
+            # ============================================================
+            for linea in lineas:
+                if 'patrimonio serie' in linea.lower() or 'patrimonio total' in linea.lower():
+                    # Buscar montos: "$806.202.087", "USD 1.246.638.652"
+                    match_patrimonio = re.search(r'([A-Z]{3})?\s*\$?\s*([\d.,]+)', linea)
+                    if match_patrimonio:
+                        try:
+                            moneda = match_patrimonio.group(1) or 'CLP'
+                            monto_str = match_patrimonio.group(2).replace('.', '').replace(',', '')
+                            monto = float(monto_str)
 
-                # ============================================================
-                # PATRÓN 6: RENTABILIDAD HISTÓRICA
-                # ============================================================
-                # FIX 4.3: Regex robustificado para rentabilidades (acepta ".5", "9.5", "-2.3")
-                for i, linea in enumerate(lineas):
-                    if 'rentabilidades anualizadas' in linea.lower() or '1 año' in linea.lower():
-                        # Buscar en las siguientes 10 líneas
-                        for j in range(i, min(i + 10, len(lineas))):
-                            linea_busqueda = lineas[j]
-
-                            # Patrón: "1 Año 0,48%" - FIX 4.4: usar regex compilado
-                            match_1ano = REGEX_RENT_1ANO.search(linea_busqueda)
-                            if match_1ano:
-                                try:
-                                    rent_str = match_1ano.group(1).replace(',', '.')
-                                    # FIX 4.2: Validar no vacío
-                                    if rent_str and rent_str not in ['.', '-', '-.']:
-                                        resultado['rentabilidad_12m'] = float(rent_str) / 100
-                                        campos_extraidos += 1
-                                        logger.info(f"[PDF EXTENDED] Rentabilidad 12m: {resultado['rentabilidad_12m']:.2%}")
-                                except ValueError as e:
-                                    logger.debug(f"[PDF EXTENDED] Error parseando rent 12m: {e}")
-                                    pass
+                            resultado['patrimonio'] = monto
+                            resultado['patrimonio_moneda'] = moneda
+                            campos_extraidos += 1
+                            logger.info(f"[PDF EXTENDED] Patrimonio: {moneda} {monto:,.0f}")
+                            break
+                        except ValueError:
+                            continue
 
-                            # Patrón: "2 Años 5,5%" - FIX 4.4: usar regex compilado
-                            match_2anos = REGEX_RENT_2ANOS.search(linea_busqueda)
-                            if match_2anos:
-                                try:
-                                    rent_str = match_2anos.group(1).replace(',', '.')
-                                    if rent_str and rent_str not in ['.', '-', '-.']:
-                                        resultado['rentabilidad_24m'] = float(rent_str) / 100
-                                        campos_extraidos += 1
-                                        logger.info(f"[PDF EXTENDED] Rentabilidad 24m: {resultado['rentabilidad_24m']:.2%}")
-                                except ValueError as e:
-                                    logger.debug(f"[PDF EXTENDED] Error parseando rent 24m: {e}")
-                                    pass
+            # ============================================================
+            # PATRÓN 8: COMPOSICIÓN DE PORTAFOLIO (Mejorada con patrones alternativos)
+            # ============================================================
+            composicion = []
+            composicion_detallada = []
 
-                            # Patrón: "3 Años" o "5 Años" - FIX 4.4: usar regex compilado
-                            match_3anos = REGEX_RENT_3ANOS.search(linea_busqueda)
-                            if match_3anos:
-                                try:
-                                    rent_str = match_3anos.group(1).replace(',', '.')
-                                    if rent_str and rent_str not in ['.', '-', '-.']:
-                                        resultado['rentabilidad_36m'] = float(rent_str) / 100
-                                        campos_extraidos += 1
-                                        logger.info(f"[PDF EXTENDED] Rentabilidad 36m: {resultado['rentabilidad_36m']:.2%}")
-                                except ValueError as e:
-                                    logger.debug(f"[PDF EXTENDED] Error parseando rent 36m: {e}")
-                                    pass
+            # Patrón 1: "Activo XX,XX%" o "Activo XX.XX %"
+            for i, linea in enumerate(lineas):
+                match = re.search(r'([A-Za-záéíóúñÁÉÍÓÚÑ\s\.]+)\s+(\d+[\.,]?\d*)\s*%', linea)
+                if match:
+                    activo_nombre = match.group(1).strip()
+                    porcentaje_str = match.group(2).replace(',', '.')
 
-                # ============================================================
-                # PATRÓN 7: PATRIMONIO DEL FONDO
-                # ============================================================
-                for linea in lineas:
-                    if 'patrimonio serie' in linea.lower() or 'patrimonio total' in linea.lower():
-                        # Buscar montos: "$806.202.087", "USD 1.246.638.652"
-                        match_patrimonio = re.search(r'([A-Z]{3})?\s*\$?\s*([\d.,]+)', linea)
-                        if match_patrimonio:
-                            try:
-                                moneda = match_patrimonio.group(1) or 'CLP'
-                                monto_str = match_patrimonio.group(2).replace('.', '').replace(',', '')
-                                monto = float(monto_str)
+                    try:
+                        porcentaje_num = float(porcentaje_str)
+                        porcentaje_decimal = porcentaje_num / 100
+
+                        # Filtrar nombres muy cortos o genéricos
+                        if len(activo_nombre) > 3 and porcentaje_decimal > 0:
+                            item = {
+                                'activo': activo_nombre,
+                                'porcentaje': porcentaje_decimal
+                            }
+                            composicion.append(item)
 
-                                resultado['patrimonio'] = monto
-                                resultado['patrimonio_moneda'] = moneda
-                                campos_extraidos += 1
-                                logger.info(f"[PDF EXTENDED] Patrimonio: {moneda} {monto:,.0f}")
-                                break
-                            except ValueError:
-                                continue
+                            # Clasificar activo para composición detallada
+                            categoria = self._clasificar_activo(activo_nombre)
+                            item_detallado = item.copy()
+                            item_detallado['categoria'] = categoria
+                            composicion_detallada.append(item_detallado)
 
-                # ============================================================
-                # PATRÓN 8: COMPOSICIÓN DE PORTAFOLIO (Mejorada con patrones alternativos)
-                # ============================================================
-                composicion = []
-                composicion_detallada = []
+                            logger.debug(f"[PDF EXTENDED] Encontrado (P1): {activo_nombre} = {porcentaje_decimal:.2%} (cat: {categoria})")
+                    except ValueError:
+                        continue
 
-                # Patrón 1: "Activo XX,XX%" o "Activo XX.XX %"
+            # Patrón 2: Tabla con columnas "Instrumento | Porcentaje" o similar
+            # Buscar sección "Composición de Cartera" o "Inversiones"
+            if not composicion:
+                logger.info("[PDF EXTENDED] Patrón 1 no encontró composición, intentando Patrón 2 (tabla)...")
+                en_seccion_composicion = False
                 for i, linea in enumerate(lineas):
-                    match = re.search(r'([A-Za-záéíóúñÁÉÍÓÚÑ\s\.]+)\s+(\d+[\.,]?\d*)\s*%', linea)
-                    if match:
-                        activo_nombre = match.group(1).strip()
-                        porcentaje_str = match.group(2).replace(',', '.')
-
-                        try:
-                            porcentaje_num = float(porcentaje_str)
-                            porcentaje_decimal = porcentaje_num / 100
-
-                            # Filtrar nombres muy cortos o genéricos
-                            if len(activo_nombre) > 3 and porcentaje_decimal > 0:
-                                item = {
-                                    'activo': activo_nombre,
-                                    'porcentaje': porcentaje_decimal
-                                }
-                                composicion.append(item)
-
-                                # Clasificar activo para composición detallada
-                                categoria = self._clasificar_activo(activo_nombre)
-                                item_detallado = item.copy()
-                                item_detallado['categoria'] = categoria
-                                composicion_detallada.append(item_detallado)
+                    linea_lower = linea.lower()
 
-                                logger.debug(f"[PDF EXTENDED] Encontrado (P1): {activo_nombre} = {porcentaje_decimal:.2%} (cat: {categoria})")
-                        except ValueError:
+                    # Detectar inicio de sección de composición
+                    if any(keyword in linea_lower for keyword in ['composición', 'cartera', 'inversiones', 'activos']):
+                        if any(keyword2 in linea_lower for keyword2 in ['portafolio', 'serie', 'fondo']):
+                            en_seccion_composicion = True
+                            logger.debug(f"[PDF EXTENDED] Iniciando sección composición en línea {i}")
                             continue
 
-                # Patrón 2: Tabla con columnas "Instrumento | Porcentaje" o similar
-                # Buscar sección "Composición de Cartera" o "Inversiones"
-                if not composicion:
-                    logger.info("[PDF EXTENDED] Patrón 1 no encontró composición, intentando Patrón 2 (tabla)...")
-                    en_seccion_composicion = False
-                    for i, linea in enumerate(lineas):
-                        linea_lower = linea.lower()
-
-                        # Detectar inicio de sección de composición
-                        if any(keyword in linea_lower for keyword in ['composición', 'cartera', 'inversiones', 'activos']):
-                            if any(keyword2 in linea_lower for keyword2 in ['portafolio', 'serie', 'fondo']):
-                                en_seccion_composicion = True
-                                logger.debug(f"[PDF EXTENDED] Iniciando sección composición en línea {i}")
+                    # Si estamos en la sección, buscar patrones más flexibles
+                    if en_seccion_composicion:
+                        # Buscar líneas con múltiples números: "Bonos BCP  15.234  12,5%"
+                        match_tabla = re.search(r'([A-Za-záéíóúñÁÉÍÓÚÑ\s]+?)\s+[\d.,]+\s+(\d+[\.,]\d+)\s*%', linea)
+                        if match_tabla:
+                            activo_nombre = match_tabla.group(1).strip()
+                            porcentaje_str = match_tabla.group(2).replace(',', '.')
+                            try:
+                                porcentaje_decimal = float(porcentaje_str) / 100
+                                if len(activo_nombre) > 3 and porcentaje_decimal > 0:
+                                    item = {'activo': activo_nombre, 'porcentaje': porcentaje_decimal}
+                                    composicion.append(item)
+                                    categoria = self._clasificar_activo(activo_nombre)
+                                    item_detallado = item.copy()
+                                    item_detallado['categoria'] = categoria
+                                    composicion_detallada.append(item_detallado)
+                                    logger.debug(f"[PDF EXTENDED] Encontrado (P2): {activo_nombre} = {porcentaje_decimal:.2%}")
+                            except ValueError:
                                 continue
 
-                        # Si estamos en la sección, buscar patrones más flexibles
-                        if en_seccion_composicion:
-                            # Buscar líneas con múltiples números: "Bonos BCP  15.234  12,5%"
-                            match_tabla = re.search(r'([A-Za-záéíóúñÁÉÍÓÚÑ\s]+?)\s+[\d.,]+\s+(\d+[\.,]\d+)\s*%', linea)
-                            if match_tabla:
-                                activo_nombre = match_tabla.group(1).strip()
-                                porcentaje_str = match_tabla.group(2).replace(',', '.')
+                        # Salir si encontramos otra sección
+                        if any(keyword in linea_lower for keyword in ['rentabilidad', 'comisiones', 'factores de riesgo']):
+                            en_seccion_composicion = False
+                            logger.debug(f"[PDF EXTENDED] Finalizando sección composición en línea {i}")
+
+            # Patrón 3: Buscar tabla explícita con headers
+            if not composicion:
+                logger.info("[PDF EXTENDED] Patrón 2 no encontró composición, intentando Patrón 3 (headers)...")
+                for i, linea in enumerate(lineas):
+                    if 'instrumento' in linea.lower() and '%' in linea.lower():
+                        # Buscar en las siguientes 30 líneas
+                        for j in range(i+1, min(i+31, len(lineas))):
+                            linea_data = lineas[j]
+                            # Formato: cualquier texto seguido de número con %
+                            match_simple = re.search(r'^([^0-9]+?)\s+(\d+[\.,]\d+)\s*%?', linea_data)
+                            if match_simple:
+                                activo_nombre = match_simple.group(1).strip()
+                                porcentaje_str = match_simple.group(2).replace(',', '.')
                                 try:
                                     porcentaje_decimal = float(porcentaje_str) / 100
-                                    if len(activo_nombre) > 3 and porcentaje_decimal > 0:
+                                    if len(activo_nombre) > 3 and porcentaje_decimal > 0 and porcentaje_decimal <= 1:
                                         item = {'activo': activo_nombre, 'porcentaje': porcentaje_decimal}
                                         composicion.append(item)
                                         categoria = self._clasificar_activo(activo_nombre)
                                         item_detallado = item.copy()
                                         item_detallado['categoria'] = categoria
                                         composicion_detallada.append(item_detallado)
-                                        logger.debug(f"[PDF EXTENDED] Encontrado (P2): {activo_nombre} = {porcentaje_decimal:.2%}")
+                                        logger.debug(f"[PDF EXTENDED] Encontrado (P3): {activo_nombre} = {porcentaje_decimal:.2%}")
                                 except ValueError:
                                     continue
+                        break
 
-                            # Salir si encontramos otra sección
-                            if any(keyword in linea_lower for keyword in ['rentabilidad', 'comisiones', 'factores de riesgo']):
-                                en_seccion_composicion = False
-                                logger.debug(f"[PDF EXTENDED] Finalizando sección composición en línea {i}")
-
-                # Patrón 3: Buscar tabla explícita con headers
-                if not composicion:
-                    logger.info("[PDF EXTENDED] Patrón 2 no encontró composición, intentando Patrón 3 (headers)...")
-                    for i, linea in enumerate(lineas):
-                        if 'instrumento' in linea.lower() and '%' in linea.lower():
-                            # Buscar en las siguientes 30 líneas
-                            for j in range(i+1, min(i+31, len(lineas))):
-                                linea_data = lineas[j]
-                                # Formato: cualquier texto seguido de número con %
-                                match_simple = re.search(r'^([^0-9]+?)\s+(\d+[\.,]\d+)\s*%?', linea_data)
-                                if match_simple:
-                                    activo_nombre = match_simple.group(1).strip()
-                                    porcentaje_str = match_simple.group(2).replace(',', '.')
-                                    try:
-                                        porcentaje_decimal = float(porcentaje_str) / 100
-                                        if len(activo_nombre) > 3 and porcentaje_decimal > 0 and porcentaje_decimal <= 1:
-                                            item = {'activo': activo_nombre, 'porcentaje': porcentaje_decimal}
-                                            composicion.append(item)
-                                            categoria = self._clasificar_activo(activo_nombre)
-                                            item_detallado = item.copy()
-                                            item_detallado['categoria'] = categoria
-                                            composicion_detallada.append(item_detallado)
-                                            logger.debug(f"[PDF EXTENDED] Encontrado (P3): {activo_nombre} = {porcentaje_decimal:.2%}")
-                                    except ValueError:
-                                        continue
-                            break
-
-                # Ordenar por porcentaje descendente
-                composicion.sort(key=lambda x: x['porcentaje'], reverse=True)
-                composicion_detallada.sort(key=lambda x: x['porcentaje'], reverse=True)
+            # Ordenar por porcentaje descendente
+            composicion.sort(key=lambda x: x['porcentaje'], reverse=True)
+            composicion_detallada.sort(key=lambda x: x['porcentaje'], reverse=True)
 
-                resultado['composicion_portafolio'] = composicion[:15]
-                resultado['composicion_detallada'] = composicion_detallada[:20]
+            resultado['composicion_portafolio'] = composicion[:15]
+            resultado['composicion_detallada'] = composicion_detallada[:20]
 
-                if composicion:
-                    campos_extraidos += 1
-                    suma_porcentajes = sum(item['porcentaje'] for item in composicion)
-                    logger.info(f"[PDF EXTENDED] Composición: {len(composicion)} activos (suma: {suma_porcentajes:.2%})")
-                else:
-                    # ETL FIX: Logging explícito cuando composición está vacía
-                    logger.warning(f"[PDF EXTENDED] COMPOSICIÓN VACÍA - Ningún patrón encontró activos del portafolio")
-                    logger.warning(f"[PDF EXTENDED] Esto indica un formato de PDF no soportado o datos ausentes")
-
-                # ============================================================
-                # CALCULAR NIVEL DE CONFIANZA
-                # ============================================================
-                porcentaje_extraido = (campos_extraidos / campos_totales) * 100
-
-                if porcentaje_extraido >= 70:
-                    resultado['extraction_confidence'] = 'high'
-                elif porcentaje_extraido >= 40:
-                    resultado['extraction_confidence'] = 'medium'
-                else:
-                    resultado['extraction_confidence'] = 'low'
+            if composicion:
+                campos_extraidos += 1
+                suma_porcentajes = sum(item['porcentaje'] for item in composicion)
+                logger.info(f"[PDF EXTENDED] Composición: {len(composicion)} activos (suma: {suma_porcentajes:.2%})")
+            else:
+                # ETL FIX: Logging explícito cuando composición está vacía
+                logger.warning(f"[PDF EXTENDED] COMPOSICIÓN VACÍA - Ningún patrón encontró activos del portafolio")
+                logger.warning(f"[PDF EXTENDED] Esto indica un formato de PDF no soportado o datos ausentes")
+
+            # ============================================================
+            # CALCULAR NIVEL DE CONFIANZA
+            # ============================================================
+            porcentaje_extraido = (campos_extraidos / campos_totales) * 100
+
+            if porcentaje_extraido >= 70:
+                resultado['extraction_confidence'] = 'high'
+            elif porcentaje_extraido >= 40:
+                resultado['extraction_confidence'] = 'medium'
+            else:
+                resultado['extraction_confidence'] = 'low'
 
-                logger.info(f"[PDF EXTENDED] Campos extraídos: {campos_extraidos}/{campos_totales} ({porcentaje_extraido:.0f}%) - Confianza: {resultado['extraction_confidence']}")
+            logger.info(f"[PDF EXTENDED] Campos extraídos: {campos_extraidos}/{campos_totales} ({porcentaje_extraido:.0f}%) - Confianza: {resultado['extraction_confidence']}")
 
-                return resultado
+            return resultado
 
         except FileNotFoundError:
             logger.error(f"[PDF EXTENDED] Archivo no encontrado: {pdf_path}")
@@ -1940,7 +3610,7 @@ class FondosMutuosProcessor:
                 logger.warning(f"[CMF STATUS] HTTP {response.status_code if response else 'None'} para RUT {rut}")
                 return resultado
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
             texto_completo = soup.get_text()
 
             # FIX 6.1: Pattern 1: Extract most recent date (formato DD-MM-YYYY, DD/MM/YYYY, DD-MM-YY, DD/MM/YY)
@@ -2029,7 +3699,7 @@ class FondosMutuosProcessor:
                     response_table = request_with_retry(self.session, url_table, timeout=15)
 
                     if response_table and response_table.status_code == 200:
-                        soup_table = BeautifulSoup(response_table.content, 'html.parser')
+                        soup_table = BeautifulSoup(response_table.content, HTML_PARSER)
 
                         # Buscar tables con class="tabla" o cualquier table
                         tables = soup_table.find_all('table')
@@ -2098,6 +3768,100 @@ class FondosMutuosProcessor:
         # The old version was losing critical data by only returning a subset of fields
         return resultado_extendido
 
+    def _build_fintual_index(self, fondos: List[Dict]) -> Dict:
+        """
+        Construir índice de búsqueda sobre el listado de fondos de Fintual.
+
+        Los nombres y symbols se concatenan en un blob con separador y offsets
+        ordenados, para resolver "query in nombre" con un solo str.find + bisect.
+        Si pyahocorasick está instalado, un autómata sobre los nombres resuelve
+        "nombre in query" en una pasada sobre la query.
+
+        Args:
+            fondos (List[Dict]): Items 'data' del listado de Fintual
+
+        Returns:
+            Dict con fondos, blobs, offsets y autómata (o None)
+        """
+        nombres = []
+        symbols = []
+        for fondo in fondos:
+            attrs = fondo.get('attributes', {})
+            nombres.append((attrs.get('name') or '').lower())
+            symbols.append((attrs.get('symbol') or '').lower())
+
+        def _blob(textos: List[str]) -> Tuple[str, List[int]]:
+            offsets = []
+            posicion = 0
+            for texto in textos:
+                offsets.append(posicion)
+                posicion += len(texto) + 1
+            return FINTUAL_INDEX_SEP.join(textos), offsets
+
+        nombres_blob, nombres_offsets = _blob(nombres)
+        symbols_blob, symbols_offsets = _blob(symbols)
+
+        automaton = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for i, nombre in enumerate(nombres):
+                # Conservar el primer índice si hay nombres repetidos
+                if nombre and nombre not in automaton:
+                    automaton.add_word(nombre, i)
+            automaton.make_automaton()
+
+        logger.debug(f"[FINTUAL] Índice construido: {len(fondos)} fondos (aho-corasick: {automaton is not None})")
+
+        return {
+            'fondos': fondos,
+            'nombres': nombres,
+            'nombres_blob': nombres_blob,
+            'nombres_offsets': nombres_offsets,
+            'symbols_blob': symbols_blob,
+            'symbols_offsets': symbols_offsets,
+            'automaton': automaton
+        }
+
+    def _match_fintual_fund(self, fondo_id_lower: str) -> Optional[Dict]:
+        """
+        Buscar el primer fondo (en orden del listado) cuyo nombre o symbol
+        contenga la query, o cuyo nombre esté contenido en la query.
+
+        Args:
+            fondo_id_lower (str): Identificador del fondo en minúsculas
+
+        Returns:
+            Dict del fondo encontrado o None
+        """
+        index = self._fintual_index
+        if not index or not index['fondos'] or not fondo_id_lower:
+            return None
+
+        candidatos = []
+
+        # query in nombre / query in symbol: primera ocurrencia en el blob = menor índice
+        if FINTUAL_INDEX_SEP not in fondo_id_lower:
+            for blob, offsets in ((index['nombres_blob'], index['nombres_offsets']),
+                                  (index['symbols_blob'], index['symbols_offsets'])):
+                posicion = blob.find(fondo_id_lower)
+                if posicion >= 0:
+                    candidatos.append(bisect_right(offsets, posicion) - 1)
+
+        # nombre in query
+        automaton = index['automaton']
+        if automaton is not None:
+            candidatos.extend(i for _, i in automaton.iter(fondo_id_lower))
+        else:
+            candidatos.extend(
+                i for i, nombre in enumerate(index['nombres'])
+                if nombre and nombre in fondo_id_lower
+            )
+
+        if not candidatos:
+            return None
+
+        return index['fondos'][min(candidatos)]
+
     def _get_fintual_data(self, fondo_id: str) -> Optional[Dict]:
         """
         Obtener datos completos desde Fintual API (3 CAPAS)
@@ -2109,31 +3873,22 @@ class FondosMutuosProcessor:
         try:
             # CAPA 1: Buscar fondo en el listado completo
             logger.info(f"[FINTUAL CAPA 1] Buscando fondo: {fondo_id}")
-            url_listado = "https://fintual.cl/api/asset_providers/3/conceptual_assets"
 
-            response = requests.get(url_listado, timeout=30)
+            # El listado y su índice de búsqueda se construyen una sola vez por processor
+            if self._fintual_index is None:
+                url_listado = "https://fintual.cl/api/asset_providers/3/conceptual_assets"
 
-            if response.status_code != 200:
-                logger.warning(f"No se pudo acceder al listado de Fintual: {response.status_code}")
-                return None
+                response = self.session.get(url_listado, timeout=30)
 
-            data = response.json()
-            fondos = data.get('data', [])
+                if response.status_code != 200:
+                    logger.warning(f"No se pudo acceder al listado de Fintual: {response.status_code}")
+                    return None
+
+                data = parse_json_response(response)
+                self._fintual_index = self._build_fintual_index(data.get('data', []))
 
             # Buscar fondo por nombre o symbol
-            fondo_encontrado = None
-            fondo_id_lower = fondo_id.lower()
-
-            for fondo in fondos:
-                attrs = fondo.get('attributes', {})
-                nombre = attrs.get('name', '').lower()
-                symbol = attrs.get('symbol', '').lower()
-
-                if (fondo_id_lower in nombre or
-                    fondo_id_lower in symbol or
-                    nombre in fondo_id_lower):
-                    fondo_encontrado = fondo
-                    break
+            fondo_encontrado = self._match_fintual_fund(fondo_id.lower())
 
             if not fondo_encontrado:
                 logger.warning(f"Fondo '{fondo_id}' no encontrado en Fintual")
@@ -2161,10 +3916,10 @@ class FondosMutuosProcessor:
                 logger.info(f"[FINTUAL CAPA 3] Obteniendo series del fondo ID: {conceptual_asset_id}")
                 url_series = f"https://fintual.cl/api/conceptual_assets/{conceptual_asset_id}/real_assets"
 
-                response_series = requests.get(url_series, timeout=30)
+                response_series = self.session.get(url_series, timeout=30)
 
                 if response_series.status_code == 200:
-                    series_data = response_series.json()
+                    series_data = parse_json_response(response_series)
                     series = series_data.get('data', [])
 
                     # Extraer información de series
@@ -2201,8 +3956,14 @@ class FondosMutuosProcessor:
             logger.error(f"Error procesando datos de Fintual: {e}")
             return None
 
-    def _scrape_cmf_funds_list(self) -> List[Dict]:
+    def _scrape_cmf_funds_list(self) -> List[FundRecord]:
         """Hacer scraping MEJORADO de la lista completa de fondos disponibles en CMF"""
+        # La lista cambia muy poco: reutilizarla mientras no expire el TTL
+        if self._cmf_funds_list_cache and time.time() <= self._cmf_funds_list_cache[1]:
+            logger.debug("[CACHE CMF] HIT - Lista de fondos en memoria")
+            self.cache_stats['cmf_hits'] += 1
+            return list(self._cmf_funds_list_cache[0])
+
         try:
             logger.info("Obteniendo lista completa de fondos desde CMF...")
 
@@ -2222,46 +3983,52 @@ class FondosMutuosProcessor:
                     if response.status_code != 200:
                         continue
 
-                    soup = BeautifulSoup(response.content, 'html.parser')
-
                     # Método 1: Buscar en scripts JavaScript
                     # Formato esperado: var fondos_96767630=new Array("Seleccione...","9049-2   DEPÓSITO PLUS G",...)
-                    # IMPORTANTE: Buscar en TODOS los scripts (CMF usa type="text/JavaScript" con J mayúscula)
-                    scripts = soup.find_all('script')
-                    for script in scripts:
-                        if script.string and 'fondos_' in script.string:
-                            script_content = script.string
-                            # Buscar: var fondos_XXXXXXXXX=new Array(...)
-                            fund_arrays = re.findall(r'fondos_(\d+)\s*=\s*new Array\((.*?)\);', script_content, re.DOTALL)
-
-                            for rut_admin, fund_data in fund_arrays:
-                                # Extraer todos los strings entre comillas
-                                items = re.findall(r'"([^"]*)"', fund_data)
-
-                                # Cada item tiene formato: "RUT   NOMBRE" o "Seleccione..."
-                                for item in items:
-                                    # Ignorar "Seleccione..." y strings vacíos
-                                    if not item or 'seleccione' in item.lower():
-                                        continue
-
-                                    # Parsear formato "9049-2   DEPÓSITO PLUS G"
-                                    # Separar por espacios múltiples
-                                    parts = re.split(r'\s{2,}', item.strip(), maxsplit=1)
-
-                                    if len(parts) == 2:
-                                        rut_fondo = parts[0].strip()  # "9049-2"
-                                        nombre_fondo = parts[1].strip()  # "DEPÓSITO PLUS G"
-
-                                        # Validar que el RUT tenga formato correcto
-                                        if re.match(r'^\d+-[\dkK]$', rut_fondo):
-                                            funds_list.append({
-                                                'rut_fondo': rut_fondo,  # RUT del fondo (ej: "9049-2")
-                                                'rut_admin': rut_admin,  # RUT de la administradora (ej: "96767630")
-                                                'nombre': nombre_fondo,
-                                                'full_id': f"{rut_admin}_{rut_fondo}",
-                                                'source': 'javascript'
-                                            })
-                                            logger.debug(f"Fondo encontrado: {rut_fondo} - {nombre_fondo} (Admin: {rut_admin})")
+                    # Los arrays se buscan directo sobre el HTML crudo: construir el DOM con
+                    # BeautifulSoup solo para iterar los <script> es trabajo innecesario
+                    page_text = response.text
+                    if 'fondos_' not in page_text:
+                        continue
+
+                    # Buscar: var fondos_XXXXXXXXX=new Array(...)
+                    fund_arrays = REGEX_FONDOS_ARRAY.findall(page_text)
+
+                    # Referencias locales para el loop caliente (miles de items por página):
+                    # LOAD_FAST en vez de lookups de atributo/global en cada iteración
+                    _append = funds_list.append
+                    _match_rut = REGEX_RUT_FONDO.match
+                    _debug = logger.debug
+
+                    for rut_admin, fund_data in fund_arrays:
+                        # Extraer todos los strings entre comillas: al partir por '"'
+                        # los tokens impares son exactamente el contenido entre comillas
+                        items = fund_data.split('"')[1::2]
+
+                        # Cada item tiene formato: "RUT   NOMBRE" o "Seleccione..."
+                        for item in items:
+                            # Ignorar "Seleccione..." y strings vacíos
+                            if not item or 'seleccione' in item.lower():
+                                continue
+
+                            # Parsear formato "9049-2   DEPÓSITO PLUS G"
+                            # El RUT nunca tiene espacios: cortar en el primer bloque de whitespace
+                            parts = item.split(None, 1)
+
+                            if len(parts) == 2:
+                                rut_fondo = parts[0]  # "9049-2"
+                                nombre_fondo = parts[1].strip()  # "DEPÓSITO PLUS G"
+
+                                # Validar que el RUT tenga formato correcto
+                                if _match_rut(rut_fondo):
+                                    _append(FundRecord(
+                                        rut_fondo=rut_fondo,
+                                        rut_admin=rut_admin,
+                                        nombre=nombre_fondo,
+                                        full_id=f"{rut_admin}_{rut_fondo}",
+                                        source='javascript'
+                                    ))
+                                    _debug(f"Fondo encontrado: {rut_fondo} - {nombre_fondo} (Admin: {rut_admin})")
 
                     if funds_list:  # Si encontramos fondos, no necesitamos probar más URLs
                         break
@@ -2274,9 +4041,9 @@ class FondosMutuosProcessor:
             seen_ruts = set()
             unique_funds = []
             for fund in funds_list:
-                # Usar 'nombre' si existe (nuevo formato), sino 'fund_name' (legacy)
-                nombre = fund.get('nombre') or fund.get('fund_name', '')
-                rut = fund.get('rut_fondo') or fund.get('full_id', '')
+                # FundRecord ya tiene esquema canónico: sin fallbacks a claves legacy
+                nombre = fund.nombre
+                rut = fund.rut_fondo or fund.full_id
 
                 # Validar que tiene datos mínimos
                 if len(nombre) > 5 and rut and rut not in seen_ruts:
@@ -2289,7 +4056,9 @@ class FondosMutuosProcessor:
                 return []
 
             logger.info(f"Encontrados {len(unique_funds)} fondos únicos en CMF")
-            return unique_funds
+            self.cache_stats['cmf_misses'] += 1
+            self._cmf_funds_list_cache = (unique_funds, time.time() + self.cmf_cache_ttl.total_seconds())
+            return list(unique_funds)
 
         except Exception as e:
             logger.error(f"ERROR CRÍTICO: Error scrapeando lista CMF: {e}")
@@ -2311,6 +4080,10 @@ class FondosMutuosProcessor:
                 logger.warning("RUT vacío proporcionado para búsqueda en CMF")
                 return None
 
+            cached_info = self._get_cached_cmf_lookup(rut)
+            if cached_info:
+                return cached_info
+
             logger.info(f"[CMF] Buscando fondo con RUT: {rut}")
 
             # URL de la página de entidad en CMF usando el RUT
@@ -2322,7 +4095,7 @@ class FondosMutuosProcessor:
                 logger.warning(f"[CMF] No se pudo acceder a la página del fondo RUT {rut}: {response.status_code}")
                 return None
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
 
             # Extraer información de la página
             fund_info = {
@@ -2353,6 +4126,8 @@ class FondosMutuosProcessor:
             # Verificar que encontramos datos válidos
             if fund_info['nombre']:
                 logger.info(f"[CMF] Fondo encontrado exitosamente: {fund_info['nombre']}")
+                # Solo se cachean resultados válidos: un fallo puede ser transitorio
+                self._save_cmf_lookup(rut, fund_info)
                 return fund_info
             else:
                 logger.warning(f"[CMF] No se pudo extraer información del fondo con RUT {rut}")
@@ -2362,7 +4137,7 @@ class FondosMutuosProcessor:
             logger.error(f"[CMF] Error buscando fondo por RUT {rut}: {e}")
             return None
 
-    def _search_fund_in_cmf(self, target_name: str) -> Optional[Dict]:
+    def _search_fund_in_cmf(self, target_name: str) -> Optional[FundRecord]:
         """Buscar un fondo específico en la lista de CMF por nombre (método legacy)"""
         try:
             funds_list = self._scrape_cmf_funds_list()
@@ -2377,9 +4152,7 @@ class FondosMutuosProcessor:
             best_score = 0
 
             for fund in funds_list:
-                # Usar 'nombre' (nuevo formato) o 'fund_name' (legacy)
-                fund_name = fund.get('nombre') or fund.get('fund_name', '')
-                fund_name_lower = fund_name.lower()
+                fund_name_lower = fund.nombre.lower()
 
                 # Calcular score de similitud
                 score = 0
@@ -2406,9 +4179,8 @@ class FondosMutuosProcessor:
                     best_match = fund
 
             if best_match and best_score > 30:  # Umbral mínimo de similitud
-                fund_name_match = best_match.get('nombre') or best_match.get('fund_name', 'Unknown')
-                logger.info(f"Fondo encontrado en CMF: {fund_name_match} (score: {best_score})")
-                logger.info(f"  RUT Fondo: {best_match.get('rut_fondo')}, RUT Admin: {best_match.get('rut_admin')}")
+                logger.info(f"Fondo encontrado en CMF: {best_match.nombre} (score: {best_score})")
+                logger.info(f"  RUT Fondo: {best_match.rut_fondo}, RUT Admin: {best_match.rut_admin}")
                 return best_match
             else:
                 logger.warning(f"No se encontró fondo similar a '{target_name}' en CMF")
@@ -2427,22 +4199,26 @@ class FondosMutuosProcessor:
             url = "https://www.cmfchile.cl/institucional/estadisticas/fm.patrimonio_resultado.php"
 
             # Parámetros para la consulta específica
+            hoy = datetime.now()
             params = {
                 'consulta': 'fecha',  # Consulta por fecha
                 'rut_admin': fund_info['administrator_id'],
                 'cod_fondo': fund_info['fund_code'],
-                'fecha_desde': (datetime.now() - timedelta(days=90)).strftime('%d/%m/%Y'),  # 3 meses atrás
-                'fecha_hasta': datetime.now().strftime('%d/%m/%Y')
+                'fecha_desde': (hoy - timedelta(days=90)).strftime('%d/%m/%Y'),  # 3 meses atrás
+                'fecha_hasta': hoy.strftime('%d/%m/%Y')
             }
 
             response = self.session.get(url, params=params, timeout=30)
 
             if response.status_code == 200:
-                # Parsear la respuesta HTML para extraer TODOS los datos disponibles
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                # Buscar tablas con datos financieros
-                tables = soup.find_all('table')
+                # Parsear TODAS las tablas en una sola llamada (pandas.read_html usa lxml)
+                # extract_links='body' deja cada celda como tupla (texto, href), lo que evita
+                # que pandas infiera números y convierta "1.000" (formato chileno) en 1.0
+                try:
+                    tables = pd.read_html(io.BytesIO(response.content), flavor='lxml', extract_links='body')
+                except ValueError:
+                    # read_html lanza ValueError cuando la página no contiene tablas
+                    tables = []
 
                 # Estructura dinámica para almacenar TODOS los datos encontrados
                 financial_data = {}
@@ -2458,49 +4234,77 @@ class FondosMutuosProcessor:
                 }
 #sera en esta parte que faltara el perfil de riesgo / tolerancia al riesgo 
                 # Extraer TODOS los datos numéricos encontrados
-                for table in tables:
-                    rows = table.find_all('tr')
-                    for row in rows:
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 2:
-                            text = ' '.join([cell.get_text().strip() for cell in cells])
-                            text_lower = text.lower()
-
-                            # Buscar patrones dinámicamente
-                            for key, patterns in data_patterns.items():
-                                for pattern in patterns:
-                                    if pattern in text_lower:
-                                        # Extraer valor numérico o porcentual
-                                        if 'rentabilidad' in pattern or 'return' in pattern:
-                                            value = self._extract_percentage_value(text)
-                                            if value is not None:
-                                                if 'mes' in text_lower or 'month' in text_lower:
-                                                    financial_data[f'{key}_mes'] = value
-                                                elif 'año' in text_lower or 'anual' in text_lower or 'year' in text_lower:
-                                                    financial_data[f'{key}_anual'] = value
-                                                else:
-                                                    financial_data[key] = value
-                                        else:
-                                            value = self._extract_numeric_value(text)
-                                            if value:
-                                                financial_data[key] = value
-
-                            # También extraer cualquier dato numérico que no coincida con patrones
-                            numeric_value = self._extract_numeric_value(text)
-                            percentage_value = self._extract_percentage_value(text)
-
-                            if numeric_value and not any(key for key in financial_data.values() if key == numeric_value):
-                                # Crear clave descriptiva basada en el texto
-                                clean_text = re.sub(r'[^\w\s]', '', text_lower)
-                                words = clean_text.split()[:3]  # Primeras 3 palabras
-                                key_name = '_'.join(words) if words else f'valor_{len(financial_data)}'
-                                financial_data[f'data_{key_name}'] = numeric_value
-
-                            if percentage_value is not None and not any(key for key in financial_data.values() if key == percentage_value):
-                                clean_text = re.sub(r'[^\w\s]', '', text_lower)
-                                words = clean_text.split()[:3]
-                                key_name = '_'.join(words) if words else f'porcentaje_{len(financial_data)}'
-                                financial_data[f'pct_{key_name}'] = percentage_value
+                for df in tables:
+                    celdas = df.apply(lambda col: col.str[0])
+                    celdas.columns = range(celdas.shape[1])
+
+                    # read_html mueve las filas de <thead>/<th> a los nombres de columna:
+                    # se escanean como filas, igual que antes con BeautifulSoup
+                    encabezados = _filas_encabezado(df.columns)
+                    if encabezados:
+                        celdas = pd.concat([pd.DataFrame(encabezados), celdas], ignore_index=True)
+
+                    # Solo filas con al menos 2 celdas, unidas en un texto por fila
+                    filas_validas = celdas.notna().sum(axis=1) >= 2
+                    texts = celdas[filas_validas].fillna('').astype(str).agg(' '.join, axis=1).str.strip()
+                    if texts.empty:
+                        continue
+                    texts_lower = texts.str.lower()
+
+                    # Valores numéricos y porcentuales de todas las filas en bloque
+                    # (mismas reglas que _extract_numeric_value / _extract_percentage_value)
+                    numericos = pd.to_numeric(
+                        texts.str.replace('.', '', regex=False)
+                             .str.replace(',', '.', regex=False)
+                             .str.findall(REGEX_NUMERO.pattern, flags=re.ASCII).str[-1],
+                        errors='coerce'
+                    ).to_numpy()
+                    porcentajes = (pd.to_numeric(
+                        texts.str.extract(REGEX_PORCENTAJE.pattern, expand=False),
+                        errors='coerce'
+                    ) / 100).to_numpy()
+
+                    # Coincidencias de cada patrón y del período, para todas las filas en bloque
+                    coincide = {pattern: texts_lower.str.contains(pattern, regex=False).to_numpy()
+                                for patterns in data_patterns.values() for pattern in patterns}
+                    es_mes = texts_lower.str.contains('mes|month', regex=True).to_numpy()
+                    es_anual = texts_lower.str.contains('año|anual|year', regex=True).to_numpy()
+
+                    # Clave descriptiva basada en las primeras 3 palabras del texto
+                    claves = texts_lower.str.replace(r'[^\w\s]', '', regex=True).str.split().str[:3].str.join('_')
+
+                    # Las asignaciones siguen el orden de filas y patrones del recorrido original:
+                    # la última coincidencia prevalece y data_/pct_ solo ven los valores previos.
+                    # Los valores ya registrados se llevan en un set (lookup O(1) en vez de recorrer values())
+                    valores_registrados = set(financial_data.values())
+
+                    for i, key_name in enumerate(claves):
+                        numeric_value = numericos[i]
+                        percentage_value = porcentajes[i]
+
+                        for key, patterns in data_patterns.items():
+                            for pattern in patterns:
+                                if not coincide[pattern][i]:
+                                    continue
+                                # Extraer valor porcentual (rentabilidad/return) o numérico
+                                if 'rentabilidad' in pattern or 'return' in pattern:
+                                    if pd.notna(percentage_value):
+                                        sufijo = '_mes' if es_mes[i] else '_anual' if es_anual[i] else ''
+                                        financial_data[f'{key}{sufijo}'] = float(percentage_value)
+                                        valores_registrados.add(percentage_value)
+                                elif pd.notna(numeric_value) and numeric_value:
+                                    financial_data[key] = float(numeric_value)
+                                    valores_registrados.add(numeric_value)
+
+                        # También extraer cualquier dato numérico que no coincida con patrones
+                        if pd.notna(numeric_value) and numeric_value and numeric_value not in valores_registrados:
+                            financial_data[f'data_{key_name or f"valor_{len(financial_data)}"}'] = float(numeric_value)
+                            valores_registrados.add(numeric_value)
+
+                        # 0% no bloquea duplicados (any() sobre values() lo ignoraba por falsy)
+                        if pd.notna(percentage_value) and (not percentage_value or percentage_value not in valores_registrados):
+                            financial_data[f'pct_{key_name or f"porcentaje_{len(financial_data)}"}'] = float(percentage_value)
+                            valores_registrados.add(percentage_value)
 
                 logger.info(f"Datos financieros extraídos dinámicamente: {len(financial_data)} campos")
                 logger.debug(f"Campos encontrados: {list(financial_data.keys())}")
@@ -2583,19 +4387,21 @@ class FondosMutuosProcessor:
         portfolio_items = {}
 
         try:
-            # Detectar separadores comunes
+            # Detectar separadores comunes con una sola pasada (Counter cuenta en C)
+            # sobre una muestra acotada, en vez de recorrer el contenido completo por separador
             separators = ['\t', ';', ',', '|']
-            detected_separator = '\t'  # Default
+            char_counts = Counter(content[:SEPARATOR_SAMPLE_SIZE])
 
-            for sep in separators:
-                if content.count(sep) > content.count(detected_separator):
-                    detected_separator = sep
+            # max() conserva el orden de la lista ante empates; '\t' es el default
+            detected_separator = max(separators, key=lambda sep: char_counts[sep])
 
-            lines = content.split('\n')
+            # Leer el contenido como stream: no se materializa la lista de todas las líneas
+            buffer = io.StringIO(content)
+            first_line = buffer.readline()
 
-            if len(lines) > 1:
+            if first_line.endswith('\n'):
                 # Analizar header para entender estructura
-                header_line = lines[0].lower()
+                header_line = first_line[:-1].lower()
                 headers = header_line.split(detected_separator)
 
                 logger.debug(f"Headers detectados: {headers}")
@@ -2617,28 +4423,52 @@ class FondosMutuosProcessor:
                     elif any(word in header_clean for word in ['fondo', 'fund']):
                         col_indices['fund'] = i
 
-                # Procesar datos línea por línea
-                for line_num, line in enumerate(lines[1:], 1):
-                    if not line.strip():
+                # Referencias locales para el loop caliente (líneas × campos)
+                _find_numeros = REGEX_NUMERO.findall
+                _search_porcentaje = REGEX_PORCENTAJE.search
+
+                # Tokens de identificación del fondo, en minúsculas una sola vez por documento
+                fund_code_lower = fund_info.get('fund_code', '').lower()
+                admin_id = fund_info.get('administrator_id', '')
+                fund_name_words = tuple(word.lower() for word in fund_info.get('fund_name', '').split()[:3] if len(word) > 3)
+
+                # Valores extraídos por texto de campo: en carteras se repiten mucho
+                # (ceros, monedas, fechas, emisores), así que cada texto distinto se escanea una vez
+                field_values = {}
+
+                # Procesar datos línea por línea; csv.reader tokeniza en C. QUOTE_NONE:
+                # las comillas son texto normal (igual que str.split), así un campo con
+                # una comilla sin cerrar no se traga las líneas siguientes
+                reader = csv.reader(buffer, delimiter=detected_separator, quoting=csv.QUOTE_NONE)
+                for fields in reader:
+                    # line_num del reader = línea física desde la primera línea de datos
+                    line_num = reader.line_num
+                    if not fields or (len(fields) == 1 and not fields[0].strip()):
                         continue
 
-                    fields = line.split(detected_separator)
-
-                    # Verificar si esta línea corresponde a nuestro fondo
-                    line_lower = line.lower()
+                    # Verificar si esta línea corresponde a nuestro fondo (solo hace falta
+                    # cuando la línea no califica ya por cantidad de campos)
                     fund_match = False
-
-                    if (fund_info.get('fund_code', '').lower() in line_lower or
-                        fund_info.get('administrator_id', '') in line or
-                        any(word.lower() in line_lower for word in fund_info.get('fund_name', '').split()[:3] if len(word) > 3)):
-                        fund_match = True
+                    if len(fields) < 3:
+                        line = detected_separator.join(fields)
+                        # El ID de administradora se compara sin normalizar: si coincide
+                        # no hace falta crear la copia en minúsculas de la línea
+                        fund_match = admin_id in line
+                        if not fund_match:
+                            line_lower = line.lower()
+                            fund_match = fund_code_lower in line_lower
+                            if not fund_match:
+                                # Loop simple en vez de any(): evita crear un generador por línea
+                                for word in fund_name_words:
+                                    if word in line_lower:
+                                        fund_match = True
+                                        break
 
                     # También procesar líneas que contengan datos financieros relevantes
                     if fund_match or len(fields) >= 3:
+                        # No se guardan la línea ni los campos crudos: solo lo que usa el procesamiento
                         item_data = {
-                            'line_number': line_num,
-                            'raw_line': line,
-                            'fields': fields
+                            'line_number': line_num
                         }
 
                         # Extraer datos usando índices detectados
@@ -2646,15 +4476,45 @@ class FondosMutuosProcessor:
                             if index < len(fields):
                                 item_data[key] = fields[index].strip()
 
-                        # Extraer valores numéricos de todos los campos
-                        for i, field in enumerate(fields):
-                            numeric_val = self._extract_numeric_value(field)
-                            percentage_val = self._extract_percentage_value(field)
+                        # Sin columna de instrumento/emisor: candidato = primer campo de texto largo
+                        if 'instrument' not in item_data and 'issuer' not in item_data:
+                            for field in fields:
+                                if len(field.strip()) > 10 and not field.replace('.', '').replace(',', '').isdigit():
+                                    item_data['instrument_candidate'] = field.strip()
+                                    break
+
+                        # Extraer valores numéricos de todos los campos (misma lógica que
+                        # _extract_numeric_value/_extract_percentage_value, en línea): campos
+                        # vacíos se saltan y el regex de porcentaje solo corre si hay '%'.
+                        # Los valores se guardan en listas densas, en orden de campo
+                        numerics = []
+                        percentages = []
+                        for field in fields:
+                            if not field:
+                                continue
+
+                            valores = field_values.get(field)
+                            if valores is None:
+                                numeric_val = None
+                                numeros = _find_numeros(field.translate(TRANS_NUMERO_CL))
+                                if numeros:
+                                    numeric_val = float(numeros[-1]) or None
 
-                            if numeric_val:
-                                item_data[f'numeric_{i}'] = numeric_val
-                            if percentage_val is not None:
-                                item_data[f'percentage_{i}'] = percentage_val
+                                percentage_val = None
+                                if '%' in field:
+                                    match_pct = _search_porcentaje(field)
+                                    if match_pct:
+                                        percentage_val = float(match_pct.group(1)) / 100
+
+                                valores = field_values[field] = (numeric_val, percentage_val)
+
+                            if valores[0] is not None:
+                                numerics.append(valores[0])
+                            if valores[1] is not None:
+                                percentages.append(valores[1])
+
+                        item_data['numerics'] = numerics
+                        item_data['percentages'] = percentages
 
                         portfolio_items[f'item_{line_num}'] = item_data
 
@@ -2665,9 +4525,13 @@ class FondosMutuosProcessor:
             logger.error(f"Error parseando contenido de cartera: {e}")
             return {}
 
-    def _process_portfolio_data_dynamic(self, raw_portfolio: Dict, fund_info: Dict) -> Dict:
-        """Procesar dinámicamente TODOS los datos crudos de cartera"""
+    def _process_portfolio_data_dynamic(self, raw_portfolio: Dict, fund_info: Dict,
+                                        processing_date: Optional[str] = None) -> Dict:
+        """Procesar dinámicamente TODOS los datos crudos de cartera (processing_date: timestamp del batch)"""
         try:
+            if processing_date is None:
+                processing_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
             processed_portfolio = {
                 'composicion_portafolio': [],
                 'total_items_raw': len(raw_portfolio),
@@ -2676,13 +4540,13 @@ class FondosMutuosProcessor:
                     'fund_matches_found': 0,
                     'numeric_fields_found': 0,
                     'instruments_identified': 0,
-                    'processing_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    'processing_date': processing_date
                 }
             }
 
-            # Agrupar por tipo de instrumento dinámicamente
-            instrument_groups = {}
-            total_amount = 0
+            # Recolectar (nombre, monto, porcentaje, item) en una sola pasada;
+            # la agregación por tipo se hace después con pandas
+            records = []
             numeric_fields_count = 0
 
             for item_key, item_data in raw_portfolio.items():
@@ -2698,11 +4562,8 @@ class FondosMutuosProcessor:
                     elif 'issuer' in item_data:
                         instrument_name = item_data['issuer']
                     else:
-                        # Buscar en campos de texto más largos
-                        for field in item_data.get('fields', []):
-                            if len(field.strip()) > 10 and not field.replace('.', '').replace(',', '').isdigit():
-                                instrument_name = field.strip()
-                                break
+                        # Campo de texto más largo detectado durante el parseo
+                        instrument_name = item_data.get('instrument_candidate')
 
                     # Buscar monto o porcentaje
                     if 'amount' in item_data:
@@ -2710,58 +4571,60 @@ class FondosMutuosProcessor:
                     if 'percentage' in item_data:
                         percentage = self._extract_percentage_value(item_data['percentage'])
 
-                    # Buscar en campos numéricos
-                    for key, value in item_data.items():
-                        if key.startswith('numeric_'):
-                            if amount == 0:  # Solo usar si no tenemos amount ya
-                                amount = value
-                            numeric_fields_count += 1
-                        elif key.startswith('percentage_') and percentage is None:
-                            percentage = value
+                    # Buscar en campos numéricos: solo el primer valor sirve como
+                    # amount/percentage, el resto solo cuenta para las métricas
+                    numerics = item_data.get('numerics', ())
+                    numeric_fields_count += len(numerics)
+                    if amount == 0 and numerics:  # Solo usar si no tenemos amount ya
+                        amount = numerics[0]
+                    percentages = item_data.get('percentages', ())
+                    if percentage is None and percentages:
+                        percentage = percentages[0]
 
                     if instrument_name:
-                        # Clasificar instrumento dinámicamente
-                        instrument_type = self._classify_instrument_dynamic(instrument_name)
-
-                        if instrument_type not in instrument_groups:
-                            instrument_groups[instrument_type] = {
-                                'total_amount': 0,
-                                'items': [],
-                                'count': 0
-                            }
-
-                        instrument_groups[instrument_type]['total_amount'] += amount
-                        instrument_groups[instrument_type]['count'] += 1
-                        instrument_groups[instrument_type]['items'].append({
-                            'name': instrument_name,
-                            'amount': amount,
-                            'percentage': percentage,
-                            'raw_data': item_data
-                        })
-
-                        total_amount += amount
-                        processed_portfolio['extraction_metadata']['instruments_identified'] += 1
+                        records.append((instrument_name, amount, percentage, item_data))
 
                 except Exception as e:
                     logger.debug(f"Error procesando item {item_key}: {e}")
 
+            processed_portfolio['extraction_metadata']['instruments_identified'] = len(records)
+
             # Convertir a formato normalizado
             composition = []
-            if total_amount > 0:
-                for instrument_type, group_data in instrument_groups.items():
-                    group_percentage = group_data['total_amount'] / total_amount
-                    composition.append({
-                        'activo': instrument_type,
-                        'porcentaje': group_percentage,
-                        'monto_total': group_data['total_amount'],
-                        'cantidad_instrumentos': group_data['count'],
-                        'instrumentos_detalle': group_data['items'][:5]  # Top 5 por tipo
-                    })
-
-            # Ordenar por porcentaje descendente
-            composition.sort(key=lambda x: x['porcentaje'], reverse=True)
+            if records:
+                df = pd.DataFrame([(name, amount) for name, amount, _, _ in records], columns=['name', 'amount'])
+
+                # Clasificar cada nombre distinto una sola vez
+                tipos = {name: self._classify_instrument_dynamic(name) for name in df['name'].unique()}
+                df['type'] = df['name'].map(tipos)
+
+                grouped = df.groupby('type', sort=False)
+                agg = grouped.agg(total_amount=('amount', 'sum'), count=('amount', 'size'))
+                indices = grouped.indices
+                total_amount = float(df['amount'].sum())
+
+                if total_amount > 0:
+                    amounts = [amount for _, amount, _, _ in records]
+                    for instrument_type, group_total, group_count in agg.itertuples(name=None):
+                        group_total = float(group_total)
+                        composition.append({
+                            'activo': instrument_type,
+                            'porcentaje': group_total / total_amount,
+                            'monto_total': group_total,
+                            'cantidad_instrumentos': int(group_count),
+                            'instrumentos_detalle': [  # Top 5 por tipo
+                                {
+                                    'name': records[i][0],
+                                    'amount': records[i][1],
+                                    'percentage': records[i][2],
+                                    'raw_data': records[i][3]
+                                }
+                                for i in heapq.nlargest(5, indices[instrument_type], key=amounts.__getitem__)
+                            ]
+                        })
 
-            processed_portfolio['composicion_portafolio'] = composition[:15]  # Top 15
+            # Top 15 por porcentaje descendente (sin ordenar la lista completa)
+            processed_portfolio['composicion_portafolio'] = heapq.nlargest(15, composition, key=itemgetter('porcentaje'))
             processed_portfolio['extraction_metadata']['numeric_fields_found'] = numeric_fields_count
 
             # Calcular score de calidad
@@ -2782,34 +4645,7 @@ class FondosMutuosProcessor:
 
     def _classify_instrument_dynamic(self, instrument_name: str) -> str:
         """Clasificar dinámicamente un instrumento financiero con patrones expandidos"""
-        name_lower = instrument_name.lower()
-
-        # Patrones expandidos para clasificación
-        classifications = {
-            'Bonos Gobierno': ['bono gobierno', 'treasury', 'btc', 'bono central', 'bcp', 'tesoreria'],
-            'Bonos Corporativos': ['bono empresa', 'corporate bond', 'bono corporativo', 'empresa', 'corp'],
-            'Acciones Chilenas': ['accion chile', 'equity chile', 'bolsa santiago', 'ipsa', 'chile'],
-            'Acciones Extranjeras': ['accion extranjera', 'foreign equity', 'international', 'usa', 'europe', 'global'],
-            'Depósitos a Plazo': ['deposito plazo', 'deposit', 'plazo fijo', 'tiempo deposito'],
-            'Cuotas de Fondos': ['cuota fondo', 'fund share', 'mutual fund', 'fondo mutuo', 'etf'],
-            'Instrumentos Moneda': ['moneda', 'currency', 'forex', 'divisa', 'cambio'],
-            'Derivados Financieros': ['derivado', 'forward', 'future', 'swap', 'option'],
-            'Bienes Raíces': ['real estate', 'inmobiliario', 'property', 'reit'],
-            'Materias Primas': ['commodity', 'oro', 'gold', 'petroleo', 'oil', 'copper', 'cobre']
-        }
-
-        # Buscar coincidencias
-        for category, patterns in classifications.items():
-            if any(pattern in name_lower for pattern in patterns):
-                return category
-
-        # Clasificación por longitud y características del texto
-        if len(name_lower) < 10:
-            return 'Instrumentos de Corto Plazo'
-        elif any(char.isdigit() for char in name_lower):
-            return 'Instrumentos con Vencimiento'
-        else:
-            return 'Otros Instrumentos'
+        return _classify_instrument_dynamic_cached(instrument_name)
 
     def _process_portfolio_data(self, raw_portfolio: List[Dict]) -> Dict:
         """Procesar datos crudos de cartera para generar composición normalizada"""
@@ -2837,11 +4673,8 @@ class FondosMutuosProcessor:
                         'porcentaje': percentage
                     })
 
-            # Ordenar por porcentaje descendente
-            composition.sort(key=lambda x: x['porcentaje'], reverse=True)
-
             return {
-                'composicion_portafolio': composition[:10],  # Top 10
+                'composicion_portafolio': heapq.nlargest(10, composition, key=itemgetter('porcentaje')),  # Top 10
                 'total_instruments': len(raw_portfolio),
                 'portfolio_date': (datetime.now() - timedelta(days=30)).strftime('%Y-%m')
             }
@@ -2852,20 +4685,7 @@ class FondosMutuosProcessor:
 
     def _classify_instrument(self, instrument_name: str) -> str:
         """Clasificar un instrumento financiero en categorías generales"""
-        name_lower = instrument_name.lower()
-
-        if any(word in name_lower for word in ['bono', 'bond', 'btc', 'treasury']):
-            return 'Bonos'
-        elif any(word in name_lower for word in ['accion', 'equity', 'stock', 'share']):
-            return 'Acciones'
-        elif any(word in name_lower for word in ['deposito', 'plazo', 'deposit']):
-            return 'Depósitos a Plazo'
-        elif any(word in name_lower for word in ['cuota', 'fondo', 'fund']):
-            return 'Cuotas de Fondos'
-        elif any(word in name_lower for word in ['moneda', 'currency', 'forex']):
-            return 'Instrumentos de Moneda'
-        else:
-            return 'Otros Instrumentos'
+        return _classify_instrument_cached(instrument_name)
 
     def _generate_sample_portfolio(self, fund_info: Dict) -> Dict:
         """
@@ -2886,75 +4706,193 @@ class FondosMutuosProcessor:
         """Extraer valor numérico de un texto"""
         try:
             # Buscar números con separadores de miles y decimales
-            pattern = r'[\d,]+\.?\d*'
-            matches = re.findall(pattern, text.replace('.', '').replace(',', '.'))
+            matches = REGEX_NUMERO.findall(text.translate(TRANS_NUMERO_CL))
 
             if matches:
                 return float(matches[-1])  # Tomar el último número encontrado
             return None
-        except:
+        except (AttributeError, TypeError, ValueError):
             return None
 
     def _extract_percentage_value(self, text: str) -> Optional[float]:
         """Extraer valor porcentual de un texto y convertirlo a decimal"""
         try:
             # Buscar patrón de porcentaje
-            pattern = r'(-?\d+\.?\d*)\s*%'
-            match = re.search(pattern, text)
+            match = REGEX_PORCENTAJE.search(text)
 
             if match:
                 return float(match.group(1)) / 100  # Convertir a decimal
             return None
-        except:
+        except (TypeError, ValueError):
             return None
 
-    def _generate_ai_description(self, fondo_data: Dict) -> str:
-        """Generar descripción amigable usando OpenAI"""
+    def _build_description_messages(self, fondo_data: Dict) -> List[Dict]:
+        """
+        Construir los mensajes de chat para la descripción de un fondo.
+
+        Args:
+            fondo_data (Dict): Datos procesados del fondo
+
+        Returns:
+            Lista de mensajes (system + user) para chat.completions
+        """
+        # Preparar datos para el prompt
+        composicion_str = ', '.join([
+            f"{item['activo']}: {item['porcentaje']:.1%}"
+            for item in fondo_data.get('composicion_portafolio', [])[:5]
+        ])
+
+        # Formatear prompt con datos del fondo
+        prompt = self._prompt_template.format(
+            nombre_fondo=fondo_data.get('nombre', 'N/A'),
+            tipo_fondo=fondo_data.get('tipo_fondo', 'N/A'),
+            perfil_riesgo=fondo_data.get('perfil_riesgo', 'N/A'),
+            composicion_top5=composicion_str or 'No disponible',
+            rentabilidad_12m=fondo_data.get('rentabilidad_anual', 'N/A')
+        )
+
+        return [
+            {"role": "system", "content": "Eres un experto en finanzas que escribe descripciones claras para jóvenes inversores chilenos."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _ai_cache_key(self, messages: List[Dict]) -> str:
+        """
+        Clave de caché de una descripción: hash del prompt completo y del modelo.
+
+        Args:
+            messages (List[Dict]): Mensajes que se enviarían a OpenAI
+
+        Returns:
+            str: Digest hexadecimal (blake2b, 16 bytes)
+        """
+        payload = json.dumps({'model': AI_DESCRIPTION_MODEL, 'messages': messages},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _load_ai_description_cache(self) -> Dict[str, str]:
+        """Cargar (una sola vez) el caché de descripciones desde disco"""
+        if self._ai_description_cache is None:
+            self._ai_description_cache = {}
+            try:
+                if os.path.exists(self.ai_cache_path):
+                    with open(self.ai_cache_path, 'r', encoding='utf-8') as f:
+                        self._ai_description_cache = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.debug(f"[CACHE IA] Error leyendo caché: {e}")
+        return self._ai_description_cache
+
+    def _save_ai_description(self, cache_key: str, descripcion: str) -> None:
+        """Guardar una descripción generada en el caché (memoria + disco)"""
+        cache = self._load_ai_description_cache()
+        cache[cache_key] = descripcion
+        try:
+            write_json_atomic(self.ai_cache_path, cache)
+        except OSError as e:
+            logger.debug(f"[CACHE IA] Error guardando caché: {e}")
+
+    def _prepare_ai_description(self, fondo_data: Dict) -> Tuple[Optional[str], Optional[str], Optional[Dict]]:
+        """
+        Paso previo a la llamada a OpenAI, común a la versión sync y async.
+
+        Args:
+            fondo_data (Dict): Datos procesados del fondo
+
+        Returns:
+            (descripcion, cache_key, request): si descripcion no es None ya está resuelta
+            (sin API key o HIT de caché) y no hay que llamar al modelo; si no, request
+            son los argumentos de chat.completions.create
+        """
         if not self.openai_key:
-            return "Descripción no disponible - API key de OpenAI no configurada"
+            return "Descripción no disponible - API key de OpenAI no configurada", None, None
+
+        messages = self._build_description_messages(fondo_data)
+
+        # Mismo prompt => misma descripción: no volver a llamar al modelo
+        cache_key = self._ai_cache_key(messages)
+        cached = self._load_ai_description_cache().get(cache_key)
+        if cached is not None:
+            logger.info("[CACHE IA] HIT - Descripción reutilizada")
+            return cached, None, None
+
+        request = {
+            'model': AI_DESCRIPTION_MODEL,
+            'messages': messages,
+            'max_tokens': 600,
+            'temperature': 0.7
+        }
+        return None, cache_key, request
+
+    def _finish_ai_description(self, cache_key: str, response) -> str:
+        """Extraer la descripción de la respuesta de OpenAI y guardarla en el caché"""
+        descripcion = response.choices[0].message.content
+        self._save_ai_description(cache_key, descripcion)
+        return descripcion
 
+    def _generate_ai_description(self, fondo_data: Dict) -> str:
+        """Generar descripción amigable usando OpenAI"""
         try:
-            # Cargar prompt desde archivo
-            prompt_path = 'prompts/fondos_prompt.txt'
-            if os.path.exists(prompt_path):
-                with open(prompt_path, 'r', encoding='utf-8') as f:
-                    prompt_template = f.read()
-            else:
-                prompt_template = self._get_default_prompt()
-
-            # Preparar datos para el prompt
-            composicion_str = ', '.join([
-                f"{item['activo']}: {item['porcentaje']:.1%}"
-                for item in fondo_data.get('composicion_portafolio', [])[:5]
-            ])
-
-            # Formatear prompt con datos del fondo
-            prompt = prompt_template.format(
-                nombre_fondo=fondo_data.get('nombre', 'N/A'),
-                tipo_fondo=fondo_data.get('tipo_fondo', 'N/A'),
-                perfil_riesgo=fondo_data.get('perfil_riesgo', 'N/A'),
-                composicion_top5=composicion_str or 'No disponible',
-                rentabilidad_12m=fondo_data.get('rentabilidad_anual', 'N/A')
-            )
+            descripcion, cache_key, request = self._prepare_ai_description(fondo_data)
+            if descripcion is not None:
+                return descripcion
 
             # Llamada a OpenAI (nueva sintaxis para v1.0+)
-            client = openai.OpenAI(api_key=self.openai_key)
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "Eres un experto en finanzas que escribe descripciones claras para jóvenes inversores chilenos."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=600,
-                temperature=0.7
-            )
+            if self._openai_client is None:
+                # SDK importado solo cuando se genera la primera descripción
+                import openai
+                self._openai_client = openai.OpenAI(api_key=self.openai_key)
+            response = self._openai_client.chat.completions.create(**request)
+
+            return self._finish_ai_description(cache_key, response)
+
+        except Exception as e:
+            logger.error(f"Error generando descripción con IA: {e}")
+            return f"Error generando descripción automática: {str(e)}"
+
+    async def _generate_ai_description_async(self, fondo_data: Dict) -> str:
+        """Versión async de _generate_ai_description (usa AsyncOpenAI)"""
+        try:
+            descripcion, cache_key, request = self._prepare_ai_description(fondo_data)
+            if descripcion is not None:
+                return descripcion
+
+            if self._async_openai_client is None:
+                import openai
+                self._async_openai_client = openai.AsyncOpenAI(api_key=self.openai_key)
+            response = await self._async_openai_client.chat.completions.create(**request)
 
-            return response.choices[0].message.content
+            return self._finish_ai_description(cache_key, response)
 
         except Exception as e:
             logger.error(f"Error generando descripción con IA: {e}")
             return f"Error generando descripción automática: {str(e)}"
 
+    async def generate_all_descriptions(self, fondos: List[Dict],
+                                        max_concurrency: int = AI_DESCRIPTION_CONCURRENCY) -> List[str]:
+        """
+        Generar descripciones de varios fondos en paralelo.
+
+        Las llamadas a OpenAI son I/O: se solapan con un límite de concurrencia
+        para no exceder el rate limit de la API.
+
+        Args:
+            fondos (List[Dict]): Datos procesados de cada fondo
+            max_concurrency (int): Máximo de requests simultáneos
+
+        Returns:
+            List[str]: Descripciones en el mismo orden que fondos
+
+        Ejemplo:
+            descripciones = asyncio.run(processor.generate_all_descriptions(fondos))
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _one(fondo_data: Dict) -> str:
+            async with semaphore:
+                return await self._generate_ai_description_async(fondo_data)
+
+        return await asyncio.gather(*(_one(fondo_data) for fondo_data in fondos))
+
     def _get_default_prompt(self) -> str:
         """Prompt por defecto si no se encuentra el archivo"""
         return """
@@ -3009,8 +4947,7 @@ class FondosMutuosProcessor:
 
             # Análisis de diversificación
             if composicion:
-                total_activos = len(composicion)
-                concentracion_max = max([item.get('porcentaje', 0) for item in composicion]) if composicion else 0
+                total_activos, concentracion_max = _portfolio_stats(composicion)
 
                 metrics['analisis_diversificacion'] = {
                     'total_activos': total_activos,
@@ -3053,20 +4990,21 @@ class FondosMutuosProcessor:
 
     def _analyze_asset_distribution(self, composicion: List[Dict]) -> Dict:
         """Analizar distribución de activos por tipo"""
-        distribution = {'renta_fija': 0, 'renta_variable': 0, 'otros': 0}
+        if not composicion:
+            return {'renta_fija': 0, 'renta_variable': 0, 'otros': 0}
 
-        for item in composicion:
-            activo = item.get('activo', '').lower()
-            porcentaje = item.get('porcentaje', 0)
+        activos = pd.Series([item.get('activo', '') for item in composicion], dtype=str).str.lower()
+        pesos = pd.Series([item.get('porcentaje', 0) for item in composicion], dtype=float)
 
-            if any(word in activo for word in ['bono', 'depósito', 'plazo', 'treasury']):
-                distribution['renta_fija'] += porcentaje
-            elif any(word in activo for word in ['accion', 'equity', 'stock']):
-                distribution['renta_variable'] += porcentaje
-            else:
-                distribution['otros'] += porcentaje
+        # Una máscara por bucket; renta fija tiene prioridad sobre renta variable
+        renta_fija = activos.str.contains('bono|depósito|plazo|treasury', regex=True)
+        renta_variable = activos.str.contains('accion|equity|stock', regex=True) & ~renta_fija
 
-        return distribution
+        return {
+            'renta_fija': float(pesos[renta_fija].sum()),
+            'renta_variable': float(pesos[renta_variable].sum()),
+            'otros': float(pesos[~(renta_fija | renta_variable)].sum())
+        }
 
     def _estimate_volatility(self, tipo_fondo: str) -> Optional[float]:
         """
@@ -3079,6 +5017,9 @@ class FondosMutuosProcessor:
     def _generate_excel(self, data: Dict) -> None:
         """Generar archivo Excel AVANZADO con análisis completo del fondo"""
         try:
+            # Timestamp único para todas las hojas
+            now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
             # Calcular métricas avanzadas
             metrics = self._calculate_fund_metrics(data)
 
@@ -3123,7 +5064,7 @@ class FondosMutuosProcessor:
                     data.get('duracion', 'N/A'),
                     data.get('monto_minimo', 'N/A'),
                     'CMF Chile + Scraping Web' if data.get('fuente_cmf') else 'ERROR: Datos CMF no disponibles',
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    now_str,
                     metrics.get('perfil_inversionista_ideal') if metrics.get('perfil_inversionista_ideal') else 'N/A',
                     metrics.get('horizonte_inversion_recomendado') if metrics.get('horizonte_inversion_recomendado') else 'N/A',
                     metrics.get('horizonte_inversion_meses') if metrics.get('horizonte_inversion_meses') else 'N/A'
@@ -3231,14 +5172,14 @@ class FondosMutuosProcessor:
                     'Advertencias'
                 ],
                 'Valor': [
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    now_str,
                     data.get('extraction_method', 'pdfplumber'),
                     data.get('extraction_confidence', 'unknown'),
                     'Sí' if data.get('pdf_procesado') else 'No',
                     'Sí' if data.get('fuente_cmf') else 'No',
                     'Sí' if data.get('fintual_match') else 'No',
                     f"{len([k for k, v in data.items() if v and k not in ['texto_completo', 'composicion_portafolio', 'composicion_detallada']])}",
-                    data.get('total_paginas_pdf', 'N/A'),
+                    data['total_paginas_pdf'] if data.get('total_paginas_pdf') is not None else 'N/A',
                     len(data.get('texto_completo', '')) if data.get('texto_completo') else 0,
                     f"{len(data.get('composicion_portafolio', []))} activos",
                     'Sí' if data.get('run') and data.get('rut_base') else 'No',
@@ -3247,7 +5188,7 @@ class FondosMutuosProcessor:
                 ],
                 'Descripción': [
                     'Fecha y hora de la extracción de datos',
-                    'Método usado para extraer texto del PDF (pdfplumber u OCR)',
+                    'Método usado para extraer texto del PDF (pymupdf, pdfplumber u OCR)',
                     'Nivel de confianza en los datos extraídos (high/medium/low)',
                     'Si se procesó correctamente el PDF del folleto informativo',
                     'Si se obtuvieron datos del sitio CMF Chile',
@@ -3263,34 +5204,32 @@ class FondosMutuosProcessor:
             }
 
             # Crear archivo Excel con todas las hojas
-            fondo_nombre = data.get('nombre', 'fondo_desconocido').replace(' ', '_').replace('/', '_')
+            fondo_nombre = data.get('nombre', 'fondo_desconocido').translate(TRANS_NOMBRE_ARCHIVO)
             output_path = f'outputs/analisis_completo_fondo_{fondo_nombre}.xlsx'
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            hojas = {
+                'Resumen Ejecutivo': pd.DataFrame(resumen_data),
+                'Composición Portafolio': pd.DataFrame(composicion_data),
+                'Riesgo y Rentabilidad': pd.DataFrame(riesgo_rentabilidad_data),
+                'Ventajas y Desventajas': pd.DataFrame(ventajas_desventajas_data),
+                'Descripción IA': pd.DataFrame(descripcion_data),
+                'Metadatos Extracción': pd.DataFrame(metadata_data)
+            }
+
+            with pd.ExcelWriter(output_path, engine=EXCEL_ENGINE) as writer:
                 # Escribir todas las hojas
-                pd.DataFrame(resumen_data).to_excel(writer, sheet_name='Resumen Ejecutivo', index=False)
-                pd.DataFrame(composicion_data).to_excel(writer, sheet_name='Composición Portafolio', index=False)
-                pd.DataFrame(riesgo_rentabilidad_data).to_excel(writer, sheet_name='Riesgo y Rentabilidad', index=False)
-                pd.DataFrame(ventajas_desventajas_data).to_excel(writer, sheet_name='Ventajas y Desventajas', index=False)
-                pd.DataFrame(descripcion_data).to_excel(writer, sheet_name='Descripción IA', index=False)
-                pd.DataFrame(metadata_data).to_excel(writer, sheet_name='Metadatos Extracción', index=False)
-
-                # Ajustar formato
-                for sheet_name in writer.sheets:
+                for sheet_name, df in hojas.items():
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+                    # Ajustar formato: anchos calculados desde el DataFrame, sin recorrer celdas
                     worksheet = writer.sheets[sheet_name]
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                cell_length = len(str(cell.value))
-                                if cell_length > max_length:
-                                    max_length = cell_length
-                            except:
-                                pass
-                        adjusted_width = min(max_length + 2, 100)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
+                    for i, width in enumerate(_excel_column_widths(df)):
+                        if XLSXWRITER_AVAILABLE:
+                            worksheet.set_column(i, i, width)
+                        else:
+                            from openpyxl.utils import get_column_letter
+                            worksheet.column_dimensions[get_column_letter(i + 1)].width = width
 
             logger.info(f"✓ Archivo Excel generado: {output_path}")
 
@@ -3311,32 +5250,38 @@ class FondosMutuosProcessor:
 
     def _classify_investment_type(self, activo: str) -> str:
         """Clasificar tipo de inversión basado en el nombre del activo"""
-        activo_lower = activo.lower()
-        if any(word in activo_lower for word in ['bono', 'bond', 'treasury', 'btc']):
-            return 'Renta Fija'
-        elif any(word in activo_lower for word in ['accion', 'equity', 'stock']):
-            return 'Renta Variable'
-        elif any(word in activo_lower for word in ['deposito', 'plazo', 'deposit']):
-            return 'Depósito'
-        elif any(word in activo_lower for word in ['cuota', 'fondo', 'fund']):
-            return 'Fondo de Inversión'
-        else:
-            return 'Otros Instrumentos'
+        return _classify_investment_type_cached(activo)
 
     def _generate_simple_excel(self, data: Dict) -> None:
         """Método de respaldo para generar Excel simple"""
         try:
             simple_data = {
-                'Nombre': [data.get('nombre', '')],
-                'Tipo': [data.get('tipo_fondo', '')],
-                'Riesgo': [data.get('perfil_riesgo', '')],
-                'Rentabilidad': [data.get('rentabilidad_anual', 'N/A')]
+                'Nombre': data.get('nombre', ''),
+                'Tipo': data.get('tipo_fondo', ''),
+                'Riesgo': data.get('perfil_riesgo', ''),
+                'Rentabilidad': data.get('rentabilidad_anual', 'N/A')
             }
 
-            fondo_nombre = data.get('nombre', 'fondo_desconocido').replace(' ', '_')
-            output_path = f'outputs/fondo_simple_{fondo_nombre}.xlsx'
-            pd.DataFrame(simple_data).to_excel(output_path, index=False)
-            logger.info(f"Archivo Excel simple generado: {output_path}")
+            fondo_nombre = data.get('nombre', 'fondo_desconocido').translate(TRANS_NOMBRE_ARCHIVO)
+
+            if SIMPLE_OUTPUT_FORMAT == 'csv':
+                # Consumidor es otro script: CSV plano, sin capa XLSX
+                output_path = f'outputs/fondo_simple_{fondo_nombre}.csv'
+                with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(simple_data.keys())
+                    writer.writerow(simple_data.values())
+            else:
+                # Una sola fila: escribir directo con openpyxl (sin pasar por DataFrame/ExcelWriter)
+                output_path = f'outputs/fondo_simple_{fondo_nombre}.xlsx'
+                from openpyxl import Workbook
+
+                wb = Workbook(write_only=True)
+                ws = wb.create_sheet()
+                ws.append(list(simple_data.keys()))
+                ws.append(list(simple_data.values()))
+                wb.save(output_path)
+            logger.info(f"Archivo simple generado: {output_path}")
 
         except Exception as e:
             logger.error(f"Error generando Excel simple: {e}")
@@ -3351,7 +5296,7 @@ class FondosMutuosProcessor:
         Returns:
             Dict: Datos procesados del fondo
         """
-        logger.info(f" INICIANDO PROCESAMIENTO CON SCRAPING REAL para: {fondo_id}")
+        logger.info(" INICIANDO PROCESAMIENTO CON SCRAPING REAL para: %s", fondo_id)
 
         resultado = {
             'fondo_id': fondo_id,
@@ -3367,11 +5312,14 @@ class FondosMutuosProcessor:
             'error': None
         }
 
+        # Corta la descarga especulativa del folleto cuando su resultado ya no sirve
+        cancelar_pdf = threading.Event()
+
         try:
             # Fase 1: Obtener datos de Fintual (3 CAPAS)
-            logger.info("═" * 60)
+            logger.info(LOG_SEPARATOR)
             logger.info(" Fase 1: Obteniendo datos de Fintual (3 CAPAS)...")
-            logger.info("═" * 60)
+            logger.info(LOG_SEPARATOR)
 
             fintual_data = self._get_fintual_data(fondo_id)
 
@@ -3384,11 +5332,11 @@ class FondosMutuosProcessor:
                     primera_serie = series[0]
                     if primera_serie.get('fecha_valor_cuota'):
                         resultado['fecha_valor_cuota'] = primera_serie['fecha_valor_cuota']
-                        logger.info(f" Fecha valor cuota desde Fintual: {resultado['fecha_valor_cuota']}")
+                        logger.info(" Fecha valor cuota desde Fintual: %s", resultado['fecha_valor_cuota'])
 
-                logger.info(f" Datos de Fintual obtenidos para: {fintual_data.get('nombre', fondo_id)}")
-                logger.info(f" RUN: {fintual_data.get('run')}, RUT base: {fintual_data.get('rut_base')}")
-                logger.info(f" Series encontradas: {len(fintual_data.get('series', []))}")
+                logger.info(" Datos de Fintual obtenidos para: %s", fintual_data.get('nombre', fondo_id))
+                logger.info(" RUN: %s, RUT base: %s", fintual_data.get('run'), fintual_data.get('rut_base'))
+                logger.info(" Series encontradas: %d", len(series))
             else:
                 # Si no hay datos de Fintual, marcar error
                 resultado['nombre'] = fondo_id.replace('_', ' ').title()
@@ -3396,28 +5344,41 @@ class FondosMutuosProcessor:
                 resultado['error'] = 'No se obtuvieron datos de Fintual'
                 logger.error(" No se obtuvieron datos de Fintual - No hay datos reales disponibles")
 
+            # Descarga especulativa del folleto: la URL solo depende del RUT de Fintual,
+            # así que los pasos HTTP corren mientras se busca el fondo en CMF. Si el fondo
+            # está cerrado o CMF confirma otro RUT, cancelar_pdf la corta antes del
+            # siguiente paso de red (Future.cancel() no detiene una tarea ya iniciada).
+            # El fallback Selenium nunca corre especulativamente
+            pdf_future = None
+            if resultado.get('rut_base'):
+                if self._pdf_executor is None:
+                    self._pdf_executor = ThreadPoolExecutor(max_workers=1)
+                pdf_future = self._pdf_executor.submit(
+                    self._download_pdf_from_cmf_http, resultado['rut_base'], resultado.get('run'), cancelar_pdf)
+
             # Fase 2: SCRAPING REAL de CMF USANDO EL RUT
-            logger.info("═" * 60)
+            logger.info(LOG_SEPARATOR)
             logger.info(" Fase 2: Buscando fondo en CMF usando RUT...")
-            logger.info("═" * 60)
+            logger.info(LOG_SEPARATOR)
 
             cmf_fund = None
 
             # ESTRATEGIA 1: Buscar por RUT si lo tenemos de Fintual
             if resultado.get('rut_base'):
-                logger.info(f" [ESTRATEGIA 1] Buscando por RUT: {resultado['rut_base']}")
+                logger.info(" [ESTRATEGIA 1] Buscando por RUT: %s", resultado['rut_base'])
                 cmf_fund = self._search_fund_in_cmf_by_rut(resultado['rut_base'])
 
             # ESTRATEGIA 2 (fallback): Buscar por nombre si no tenemos RUT o no se encontró
             if not cmf_fund:
-                logger.info(f" [ESTRATEGIA 2 - Fallback] Buscando por nombre: {resultado['nombre'] or fondo_id}")
+                logger.info(" [ESTRATEGIA 2 - Fallback] Buscando por nombre: %s", resultado['nombre'] or fondo_id)
                 cmf_fund = self._search_fund_in_cmf(resultado['nombre'] or fondo_id)
 
             if cmf_fund:
                 # Determinar el nombre del fondo dependiendo de la fuente
-                nombre_cmf = cmf_fund.get('nombre') or cmf_fund.get('fund_name', '')
-                logger.info(f" Fondo encontrado en CMF: {nombre_cmf}")
-                logger.info(f" RUT CMF: {cmf_fund.get('rut')}, RUT completo: {cmf_fund.get('rut_completo')}")
+                # Ambas fuentes (CMF por RUT y FundRecord del listado) usan la clave 'nombre'
+                nombre_cmf = cmf_fund.get('nombre') or ''
+                logger.info(" Fondo encontrado en CMF: %s", nombre_cmf)
+                logger.info(" RUT CMF: %s, RUT completo: %s", cmf_fund.get('rut'), cmf_fund.get('rut_completo'))
 
                 resultado.update({
                     'nombre_cmf': nombre_cmf,
@@ -3426,7 +5387,7 @@ class FondosMutuosProcessor:
                     'url_cmf': cmf_fund.get('url_cmf'),
                     'fuente_cmf': True,
                     'scraping_success': True,
-                    'cmf_fund_info': cmf_fund
+                    'cmf_fund_info': cmf_fund.to_dict() if isinstance(cmf_fund, FundRecord) else cmf_fund
                 })
 
                 # FIX: Clear Fintual error if CMF data is successfully obtained
@@ -3435,12 +5396,24 @@ class FondosMutuosProcessor:
                     resultado['error'] = None
                     logger.info(" Error de Fintual eliminado - Datos CMF válidos obtenidos")
 
+                # Las consultas a CMF que solo dependen de cmf_fund (estado, datos financieros,
+                # cartera) son I/O independiente: se lanzan en paralelo y se consumen en orden
+                rut_para_status = cmf_fund.get('rut') or resultado.get('rut_base')
+                tiene_codigos_cmf = 'fund_code' in cmf_fund and 'administrator_id' in cmf_fund
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    status_future = None
+                    if rut_para_status:
+                        status_future = executor.submit(self._scrape_fund_status_from_cmf, rut_para_status)
+                    financial_future = portfolio_future = None
+                    if tiene_codigos_cmf:
+                        financial_future = executor.submit(self._get_fund_financial_data, cmf_fund)
+                        portfolio_future = executor.submit(self._get_fund_portfolio_data, cmf_fund)
+
                 # FIX: Scrape fund status from CMF to get fecha_valor_cuota
                 # This addresses the critical missing data for 96.8% of funds
                 logger.info(" Extrayendo estado y fecha_valor_cuota desde CMF...")
-                rut_para_status = cmf_fund.get('rut') or resultado.get('rut_base')
-                if rut_para_status:
-                    status_data = self._scrape_fund_status_from_cmf(rut_para_status)
+                if status_future:
+                    status_data = status_future.result()
 
                     # FIX CRÍTICO: Guardar estado_fondo SIEMPRE, no solo si hay fecha_valor_cuota
                     # Esto permite detectar fondos cerrados (Liquidado/Fusionado) y skip PDFs
@@ -3452,20 +5425,21 @@ class FondosMutuosProcessor:
                             resultado['fecha_valor_cuota'] = status_data['fecha_valor_cuota']
                         if status_data.get('valor_cuota'):
                             resultado['valor_cuota_cmf'] = status_data['valor_cuota']
-                        logger.info(f" Datos de estado obtenidos: fecha={status_data['fecha_valor_cuota']}, estado={status_data['estado_fondo']}")
+                        logger.info(" Datos de estado obtenidos: fecha=%s, estado=%s",
+                                    status_data['fecha_valor_cuota'], status_data['estado_fondo'])
                     else:
-                        logger.info(f" Estado fondo obtenido: {resultado['estado_fondo']} (sin fecha_valor_cuota)")
+                        logger.info(" Estado fondo obtenido: %s (sin fecha_valor_cuota)", resultado['estado_fondo'])
 
                 # Verificar que el RUT de Fintual coincide con el RUT de CMF
                 if resultado.get('rut_base') and cmf_fund.get('rut'):
                     if resultado['rut_base'] == cmf_fund['rut']:
                         logger.info(" MATCH EXITOSO: RUT de Fintual coincide con RUT de CMF")
                     else:
-                        logger.warning(f" ADVERTENCIA: RUT no coincide - Fintual: {resultado['rut_base']}, CMF: {cmf_fund['rut']}")
+                        logger.warning(" ADVERTENCIA: RUT no coincide - Fintual: %s, CMF: %s", resultado['rut_base'], cmf_fund['rut'])
 
                 # Obtener datos financieros reales (si la estructura lo soporta)
-                if 'fund_code' in cmf_fund and 'administrator_id' in cmf_fund:
-                    financial_data = self._get_fund_financial_data(cmf_fund)
+                if tiene_codigos_cmf:
+                    financial_data = financial_future.result()
                     if financial_data:
                         resultado.update({
                             'patrimonio': financial_data.get('patrimonio'),
@@ -3475,7 +5449,7 @@ class FondosMutuosProcessor:
                         })
 
                     # Obtener composición de cartera real
-                    portfolio_data = self._get_fund_portfolio_data(cmf_fund)
+                    portfolio_data = portfolio_future.result()
                     if portfolio_data:
                         resultado.update(portfolio_data)
 
@@ -3485,7 +5459,10 @@ class FondosMutuosProcessor:
                 skip_pdf = estado_fondo in ['Liquidado', 'Fusionado']
 
                 if skip_pdf:
-                    logger.info(f" ⏭️  SKIPPING PDF download - Fondo {estado_fondo} (inactivo)")
+                    logger.info(" ⏭️  SKIPPING PDF download - Fondo %s (inactivo)", estado_fondo)
+                    cancelar_pdf.set()
+                    if pdf_future is not None:
+                        pdf_future.cancel()
                     pdf_path = None
                 else:
                     # SIEMPRE intentar descargar PDF (independiente de si tiene fund_code o no)
@@ -3498,15 +5475,25 @@ class FondosMutuosProcessor:
                     # Only attempt PDF download if we have a valid RUT
                     pdf_path = None
                     if rut_para_pdf:
-                        pdf_path = self._download_pdf_from_cmf_improved(rut_para_pdf, resultado.get('run'))
+                        if pdf_future is not None and rut_para_pdf == resultado.get('rut_base'):
+                            # Mismo RUT que la descarga especulativa: esperar los pasos HTTP y
+                            # usar Selenium en este hilo solo si no alcanzaron
+                            pdf_path, page_url = pdf_future.result()
+                            if not pdf_path and page_url:
+                                pdf_path = self._download_pdf_selenium_fallback(page_url, rut_para_pdf, resultado.get('run'))
+                        else:
+                            cancelar_pdf.set()
+                            if pdf_future is not None:
+                                pdf_future.cancel()
+                            pdf_path = self._download_pdf_from_cmf_improved(rut_para_pdf, resultado.get('run'))
                     else:
                         logger.warning(" No se encontró RUT válido para descargar PDF")
 
                 if pdf_path:
                     # Extraer datos del PDF
-                    logger.info("═" * 60)
+                    logger.info(LOG_SEPARATOR)
                     logger.info(" Fase 2.5: Extrayendo datos del PDF...")
-                    logger.info("═" * 60)
+                    logger.info(LOG_SEPARATOR)
 
                     pdf_data = self._extract_data_from_pdf(pdf_path)
 #### Tener cuidado y revisar si esta cadena de ifs, esta muy hardcodeada y los pdf's estan construidos diferentemenete
@@ -3522,22 +5509,18 @@ class FondosMutuosProcessor:
                         # FIX: Map rentabilidad_12m to rentabilidad_anual if not already set
                         if pdf_data.get('rentabilidad_12m') and not resultado.get('rentabilidad_anual'):
                             resultado['rentabilidad_anual'] = pdf_data['rentabilidad_12m']
-                            logger.info(f" Rentabilidad anual mapeada desde PDF: {resultado['rentabilidad_anual']:.2%}")
+                            logger.info(" Rentabilidad anual mapeada desde PDF: %.2f%%", resultado['rentabilidad_anual'] * 100)
 
                         # FIX: Map composicion_detallada if composicion_portafolio is empty
                         if pdf_data.get('composicion_detallada') and not resultado.get('composicion_portafolio'):
                             resultado['composicion_portafolio'] = pdf_data['composicion_detallada']
-                            logger.info(f" Composición mapeada desde composicion_detallada: {len(resultado['composicion_portafolio'])} activos")
-
-                        # Also map other useful fields from PDF
-                        if pdf_data.get('horizonte_inversion'):
-                            resultado['horizonte_inversion'] = pdf_data['horizonte_inversion']
-                        if pdf_data.get('comision_administracion'):
-                            resultado['comision_administracion'] = pdf_data['comision_administracion']
-                        if pdf_data.get('rentabilidad_24m'):
-                            resultado['rentabilidad_24m'] = pdf_data['rentabilidad_24m']
-                        if pdf_data.get('rentabilidad_36m'):
-                            resultado['rentabilidad_36m'] = pdf_data['rentabilidad_36m']
+                            logger.info(" Composición mapeada desde composicion_detallada: %d activos", len(resultado['composicion_portafolio']))
+
+                        # Also map other useful fields from PDF (un solo lookup por campo)
+                        for campo in CAMPOS_PDF_OPCIONALES:
+                            valor = pdf_data.get(campo)
+                            if valor:
+                                resultado[campo] = valor
 
                         # FIX: Clear error if we have extracted meaningful data from PDF
                         if (pdf_data.get('tipo_fondo') or pdf_data.get('rentabilidad_12m') or
@@ -3546,16 +5529,18 @@ class FondosMutuosProcessor:
                                 resultado['error'] = None
                                 logger.info(" Error de Fintual eliminado - Datos PDF válidos obtenidos")
 
-                        logger.info(f" Datos extraídos del PDF: Tipo={pdf_data.get('tipo_fondo')}, Riesgo={pdf_data.get('perfil_riesgo')}, Activos={len(pdf_data.get('composicion_portafolio', []))}")
+                        logger.info(" Datos extraídos del PDF: Tipo=%s, Riesgo=%s, Activos=%d", pdf_data.get('tipo_fondo'),
+                                    pdf_data.get('perfil_riesgo'), len(pdf_data.get('composicion_portafolio', [])))
                     else:
-                        logger.warning(f" Error procesando PDF: {pdf_data.get('error')}")
+                        logger.warning(" Error procesando PDF: %s", pdf_data.get('error'))
                 else:
                     logger.warning(" No se pudo descargar el PDF del folleto informativo")
 
                 # ETL FIX: NO inferir tipo_fondo ni perfil_riesgo desde nombre
                 # Mantener valores extraídos o None si no se pudo extraer
                 # La inferencia desde nombre es una VIOLACIÓN ETL
-                logger.info(f"[ETL] PDF no disponible. tipo_fondo y perfil_riesgo quedan como extraídos: {resultado.get('tipo_fondo', None)}, {resultado.get('perfil_riesgo', None)}")
+                logger.info("[ETL] PDF no disponible. tipo_fondo y perfil_riesgo quedan como extraídos: %s, %s",
+                            resultado.get('tipo_fondo'), resultado.get('perfil_riesgo'))
  # NO generar portafolio simulado
             else:
                 logger.error(" Fondo no encontrado en CMF - No hay datos reales disponibles")
@@ -3586,18 +5571,24 @@ class FondosMutuosProcessor:
             self._generate_excel(resultado)
 
         except Exception as e:
-            logger.error(f" Error procesando fondo {fondo_id}: {e}")
+            logger.error(" Error procesando fondo %s: %s", fondo_id, e)
             resultado['error'] = str(e)
 
+        # Descarga especulativa que nadie consumió (fondo no encontrado en CMF, error): cortarla
+        cancelar_pdf.set()
+
         # Mostrar estadísticas de caché al finalizar
         self._log_cache_statistics()
 
         return resultado
 
-    def _generate_fund_investment_analysis(self, data: Dict) -> Dict:
-        """Generar análisis de inversión completo para el fondo"""
+    def _generate_fund_investment_analysis(self, data: Dict, analysis_date: Optional[str] = None) -> Dict:
+        """Generar análisis de inversión completo para el fondo (analysis_date: timestamp del batch)"""
+        if analysis_date is None:
+            analysis_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
         analysis = {
-            'fecha_analisis': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'fecha_analisis': analysis_date,
             'resumen_ejecutivo_fondo': '',
             'puntos_clave_fondo': [],
             'riesgos_identificados_fondo': [],
@@ -3609,23 +5600,24 @@ class FondosMutuosProcessor:
         try:
             fund_name = data.get('nombre', 'El fondo')
             fund_type = data.get('tipo_fondo', 'mixto')
+            fund_type_lower = fund_type.lower()
             rentabilidad = data.get('rentabilidad_anual', 0)
 
             # Resumen ejecutivo - SOLO datos reales
             perfil_riesgo = data.get('perfil_riesgo', 'No especificado')
             if rentabilidad and rentabilidad > 0:
-                analysis['resumen_ejecutivo_fondo'] = f"""{fund_name} es un fondo mutuo de tipo {fund_type.lower()}
+                analysis['resumen_ejecutivo_fondo'] = f"""{fund_name} es un fondo mutuo de tipo {fund_type_lower}
 con una rentabilidad anual real del {rentabilidad:.2%}.
 Perfil de riesgo: {perfil_riesgo.lower()}."""
             else:
-                analysis['resumen_ejecutivo_fondo'] = f"""{fund_name} es un fondo mutuo de tipo {fund_type.lower()}.
+                analysis['resumen_ejecutivo_fondo'] = f"""{fund_name} es un fondo mutuo de tipo {fund_type_lower}.
 Perfil de riesgo: {perfil_riesgo.lower()}.
 Rentabilidad: No disponible."""
 
             # Puntos clave - SOLO basados en datos REALES (sin umbrales arbitrarios)
             if rentabilidad and rentabilidad > 0:
                 analysis['puntos_clave_fondo'].append(f'Rentabilidad anual real: {rentabilidad:.2%}')
-            if fund_type.lower() == 'conservador':
+            if fund_type_lower == 'conservador':
                 analysis['puntos_clave_fondo'].append('Fondo clasificado como conservador')
             if data.get('fuente_cmf'):
                 analysis['puntos_clave_fondo'].append('Datos verificados con CMF Chile')
@@ -3633,18 +5625,18 @@ Rentabilidad: No disponible."""
             # Identificar riesgos específicos del fondo - CALCULADOS de datos reales
             composicion = data.get('composicion_portafolio', [])
             if composicion:
-                max_concentration = max([item.get('porcentaje', 0) for item in composicion])
+                _, max_concentration = _portfolio_stats(composicion)
                 # Solo reportar concentración alta si > 40% (estándar de diversificación)
                 if max_concentration > 0.4:
                     analysis['riesgos_identificados_fondo'].append(f'Alta concentración en un activo ({max_concentration:.1%})')
 
-            if fund_type.lower() == 'agresivo':
+            if fund_type_lower == 'agresivo':
                 analysis['riesgos_identificados_fondo'].append('Fondo clasificado como agresivo - mayor volatilidad esperada')
-            elif fund_type.lower() == 'conservador':
+            elif fund_type_lower == 'conservador':
                 analysis['riesgos_identificados_fondo'].append('Fondo conservador - menor volatilidad pero potencial de retorno limitado')
 
             # Oportunidades - basadas en DATOS REALES sin comparaciones arbitrarias
-            if fund_type.lower() in ['balanceado', 'mixto']:
+            if fund_type_lower in ('balanceado', 'mixto'):
                 analysis['oportunidades_fondo'].append('Fondo balanceado - diversificación entre renta fija y variable')
 
             if len(composicion) > 10:
@@ -3666,58 +5658,6 @@ Rentabilidad: No disponible."""
 
         return analysis
 
-    # def _get_investment_horizon(self, fund_type: str) -> str:
-    #     """Obtener horizonte de inversión recomendado"""
-    #     if 'conservador' in fund_type.lower():
-    #         return '6 meses a 2 años'
-    #     elif 'agresivo' in fund_type.lower():
-    #         return '5 años o más'
-    #     else:
-    #         return '2 a 5 años'
-
-    # def _calculate_risk_score(self, data: Dict) -> int:
-    #     """Calcular puntaje de riesgo (1-5)"""
-    #     score = 3  # Base
-
-    #     fund_type = data.get('tipo_fondo', '').lower()
-    #     if 'conservador' in fund_type:
-    #         score = 2
-    #     elif 'agresivo' in fund_type:
-    #         score = 5
-
-    #     # Ajustar por concentración
-    #     composicion = data.get('composicion_portafolio', [])
-    #     if composicion:
-    #         max_concentration = max([item.get('porcentaje', 0) for item in composicion])
-    #         if max_concentration > 0.5:
-    #             score += 1
-
-    #     return min(score, 5)
-
-    # def _calculate_return_score(self, data: Dict) -> int:
-    #     """
-    #     ELIMINADO: Calcular puntaje de retorno esperado con umbrales hardcodeados
-    #     Los umbrales arbitrarios (12%, 8%, 5%, 3%) no son datos reales
-    #     """
-    #     rentabilidad = data.get('rentabilidad_anual', 0)
-    #
-    #     if rentabilidad > 0.12:
-    #         return 5
-    #     elif rentabilidad > 0.08:
-    #         return 4
-    #     elif rentabilidad > 0.05:
-    #         return 3
-    #     elif rentabilidad > 0.03:
-    #         return 2
-    #     else:
-    #         return 1
-
-            # # Agregar métricas finales de calidad
-            # resultado['calidad_datos'] = self._assess_data_quality(resultado)
-
-            # logger.info(f" PROCESAMIENTO COMPLETADO para: {resultado.get('nombre_cmf') or resultado.get('nombre')}")
-            # logger.info(f" Calidad de datos: {resultado['calidad_datos']['score']}/10 - {resultado['calidad_datos']['descripcion']}")
-
     def _assess_data_quality(self, data: Dict) -> Dict:
         """Evaluar la calidad y completitud de los datos obtenidos"""
         quality_score = 0
@@ -3798,6 +5738,26 @@ Rentabilidad: No disponible."""
         }
 
 
+# Procesador compartido por el wrapper: reutiliza la sesión HTTP (conexiones TLS
+# keep-alive a CMF/Fintual), el índice de Fintual y el prompt entre fondos
+_default_processor: Optional[FondosMutuosProcessor] = None
+
+
+def get_default_processor() -> FondosMutuosProcessor:
+    """
+    Obtener el procesador compartido del módulo, creándolo en el primer uso.
+
+    Returns:
+        FondosMutuosProcessor: Instancia reutilizada por procesar_fondos_mutuos()
+    """
+    global _default_processor
+    if _default_processor is None:
+        _default_processor = FondosMutuosProcessor()
+        # Persistir las invalidaciones de caché pendientes al terminar el proceso
+        atexit.register(_default_processor._flush_cache_deletes)
+    return _default_processor
+
+
 def procesar_fondos_mutuos(fondo_id: str) -> Dict:
     """
     Función wrapper para facilitar el uso desde otros módulos
@@ -3808,8 +5768,7 @@ def procesar_fondos_mutuos(fondo_id: str) -> Dict:
     Returns:
         Dict: Datos procesados CON SCRAPING REAL
     """
-    processor = FondosMutuosProcessor()
-    return processor.procesar_fondos_mutuos(fondo_id)
+    return get_default_processor().procesar_fondos_mutuos(fondo_id)
 
 
 if __name__ == "__main__":
@@ -3819,6 +5778,8 @@ if __name__ == "__main__":
     # Probar con diferentes nombres de fondos
     test_funds = ["santander", "bci", "conservador"]
 
+    # En serie y en este proceso: los workers de un pool no corren los hooks atexit
+    # (Chrome y borrados de caché pendientes) y compartirían temp/ y los cachés JSON
     for fund_name in test_funds:
         print(f"\n Procesando: {fund_name}")
         resultado = procesar_fondos_mutuos(fund_name)
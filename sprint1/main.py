@@ -355,8 +355,9 @@ def main():
         # Obtener TODOS los fondos desde CMF
         print(f"\n OBTENIENDO LISTA COMPLETA DE FONDOS DESDE CMF...")
         print("-" * 50)
-        from fondos_mutuos import FondosMutuosProcessor
-        processor = FondosMutuosProcessor()
+        from fondos_mutuos import get_default_processor
+        # Mismo procesador (y sesión HTTP) que usa procesar_fondos_mutuos() en el batch
+        processor = get_default_processor()
         todos_los_fondos = processor._scrape_cmf_funds_list()
 
         # Extraer nombres únicos de fondos
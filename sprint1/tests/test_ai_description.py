@@ -0,0 +1,105 @@
+"""
+Tests de la descripción con IA (sync y async) con un cliente OpenAI simulado.
+Verifican que ambos caminos envían el mismo request y comparten el caché.
+"""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fondos_mutuos import FondosMutuosProcessor
+
+FONDO = {
+    'nombre': 'Fondo Test',
+    'tipo_fondo': 'balanceado',
+    'perfil_riesgo': 'medio',
+    'composicion_portafolio': [{'activo': 'Bonos', 'porcentaje': 0.6}],
+    'rentabilidad_anual': 0.05
+}
+
+
+class _Completions:
+    """Imita client.chat.completions y registra cada request recibido"""
+
+    def __init__(self, contenido: str, es_async: bool = False):
+        self.contenido = contenido
+        self.es_async = es_async
+        self.requests = []
+
+    def _respuesta(self, kwargs):
+        self.requests.append(kwargs)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.contenido))])
+
+    def create(self, **kwargs):
+        if self.es_async:
+            async def _create():
+                return self._respuesta(kwargs)
+            return _create()
+        return self._respuesta(kwargs)
+
+
+def _processor(tmp_path, completions=None, async_completions=None):
+    """Procesador mínimo, sin red, con el caché de IA en tmp_path"""
+    processor = FondosMutuosProcessor.__new__(FondosMutuosProcessor)
+    processor.openai_key = 'sk-test'
+    processor.ai_cache_path = str(tmp_path / 'ai_description_cache.json')
+    processor._ai_description_cache = None
+    processor._prompt_template = processor._get_default_prompt()
+    processor._openai_client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    processor._async_openai_client = SimpleNamespace(chat=SimpleNamespace(completions=async_completions))
+    return processor
+
+
+def test_sync_y_async_envian_el_mismo_request(tmp_path):
+    sync_completions = _Completions('sync')
+    async_completions = _Completions('async', es_async=True)
+
+    # Cachés separados: el segundo camino también debe llegar al modelo
+    (tmp_path / 'sync').mkdir()
+    (tmp_path / 'async').mkdir()
+
+    processor = _processor(tmp_path / 'sync', sync_completions, async_completions)
+    assert processor._generate_ai_description(FONDO) == 'sync'
+
+    processor = _processor(tmp_path / 'async', sync_completions, async_completions)
+    assert asyncio.run(processor._generate_ai_description_async(FONDO)) == 'async'
+
+    assert sync_completions.requests == async_completions.requests
+
+
+def test_cache_compartido_entre_sync_y_async(tmp_path):
+    sync_completions = _Completions('desde el modelo')
+    async_completions = _Completions('no debería llamarse', es_async=True)
+    processor = _processor(tmp_path, sync_completions, async_completions)
+
+    assert processor._generate_ai_description(FONDO) == 'desde el modelo'
+    assert asyncio.run(processor._generate_ai_description_async(FONDO)) == 'desde el modelo'
+    assert len(sync_completions.requests) == 1
+    assert async_completions.requests == []
+
+    with open(processor.ai_cache_path, encoding='utf-8') as f:
+        assert list(json.load(f).values()) == ['desde el modelo']
+
+
+def test_sin_api_key_no_llama_al_modelo(tmp_path):
+    async_completions = _Completions('x', es_async=True)
+    processor = _processor(tmp_path, async_completions=async_completions)
+    processor.openai_key = None
+
+    descripcion = asyncio.run(processor._generate_ai_description_async(FONDO))
+    assert descripcion.startswith('Descripción no disponible')
+    assert async_completions.requests == []
+
+
+def test_error_del_cliente_devuelve_mensaje(tmp_path):
+    class _Falla:
+        async def create(self, **kwargs):
+            raise RuntimeError('rate limit')
+
+    processor = _processor(tmp_path, async_completions=_Falla())
+    descripcion = asyncio.run(processor._generate_ai_description_async(FONDO))
+    assert descripcion == 'Error generando descripción automática: rate limit'
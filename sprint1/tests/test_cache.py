@@ -82,12 +82,20 @@ def test_cache_system():
     # Verificar archivo de índice de caché
     print("\n[TEST] Verificando archivos de caché...")
 
-    if os.path.exists('cache/pdf_cache_index.json'):
-        print("✅ Archivo de índice de caché encontrado: cache/pdf_cache_index.json")
-
-        import json
-        with open('cache/pdf_cache_index.json', 'r', encoding='utf-8') as f:
-            cache_index = json.load(f)
+    if os.path.exists('cache/pdf_cache_index.db'):
+        print("✅ Archivo de índice de caché encontrado: cache/pdf_cache_index.db")
+
+        import sqlite3
+        from datetime import datetime
+        conn = sqlite3.connect('cache/pdf_cache_index.db')
+        conn.row_factory = sqlite3.Row
+        cache_index = {}
+        for row in conn.execute("SELECT * FROM entries"):
+            entry = dict(row)
+            entry['downloaded_at'] = datetime.fromtimestamp(entry['downloaded_at']).isoformat()
+            entry['expires_at'] = datetime.fromtimestamp(entry['expires_at']).isoformat()
+            cache_index[entry['key']] = entry
+        conn.close()
 
         print(f"✅ PDFs en caché: {len(cache_index)}")
 
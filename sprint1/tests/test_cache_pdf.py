@@ -111,11 +111,20 @@ def test_pdf_cache_direct():
     print("\n[TEST] Verificando archivos del sistema de caché...")
     print("-"*80)
 
-    if os.path.exists('cache/pdf_cache_index.json'):
-        print("✅ Archivo de índice encontrado: cache/pdf_cache_index.json\n")
-
-        with open('cache/pdf_cache_index.json', 'r', encoding='utf-8') as f:
-            cache_index = json.load(f)
+    if os.path.exists('cache/pdf_cache_index.db'):
+        print("✅ Archivo de índice encontrado: cache/pdf_cache_index.db\n")
+
+        import sqlite3
+        from datetime import datetime
+        conn = sqlite3.connect('cache/pdf_cache_index.db')
+        conn.row_factory = sqlite3.Row
+        cache_index = {}
+        for row in conn.execute("SELECT * FROM entries"):
+            entry = dict(row)
+            entry['downloaded_at'] = datetime.fromtimestamp(entry['downloaded_at']).isoformat()
+            entry['expires_at'] = datetime.fromtimestamp(entry['expires_at']).isoformat()
+            cache_index[entry['key']] = entry
+        conn.close()
 
         if cache_index:
             print(f"📦 Total de PDFs en caché: {len(cache_index)}\n")
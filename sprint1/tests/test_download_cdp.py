@@ -0,0 +1,60 @@
+"""
+Test de _wait_for_download_cdp con un driver simulado: cuando Chrome renombra la
+descarga ("folleto (1).pdf") no se debe devolver el PDF viejo con el nombre sugerido.
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fondos_mutuos import _wait_for_download_cdp
+
+
+class _DriverCDP:
+    """Imita driver.get_log('performance') con los eventos de una descarga"""
+
+    def __init__(self, nombre: str):
+        eventos = [
+            {'method': 'Page.downloadWillBegin', 'params': {'guid': 'g1', 'suggestedFilename': nombre}},
+            {'method': 'Page.downloadProgress', 'params': {'guid': 'g1', 'state': 'completed'}},
+        ]
+        self.logs = [[{'message': json.dumps({'message': e})} for e in eventos]]
+
+    def get_log(self, tipo):
+        return self.logs.pop(0) if self.logs else []
+
+
+def _escribir(path, contenido: bytes):
+    with open(path, 'wb') as f:
+        f.write(contenido)
+
+
+def test_descarga_nueva_usa_el_nombre_sugerido(tmp_path):
+    _escribir(tmp_path / 'folleto.pdf', b'%PDF' + b'0' * 20000)
+
+    pdf_path = _wait_for_download_cdp(_DriverCDP('folleto.pdf'), str(tmp_path), timeout=1,
+                                      existing_files=set())
+    assert pdf_path == str(tmp_path / 'folleto.pdf')
+
+
+def test_descarga_renombrada_no_devuelve_el_pdf_viejo(tmp_path):
+    # PDF de un fondo anterior, ya en el directorio antes del click
+    _escribir(tmp_path / 'folleto.pdf', b'%PDF viejo' + b'0' * 20000)
+    existentes = set(os.listdir(tmp_path))
+    # Chrome guarda la descarga nueva con otro nombre
+    _escribir(tmp_path / 'folleto (1).pdf', b'%PDF nuevo' + b'0' * 20000)
+
+    pdf_path = _wait_for_download_cdp(_DriverCDP('folleto.pdf'), str(tmp_path), timeout=1,
+                                      existing_files=existentes)
+    assert pdf_path == str(tmp_path / 'folleto (1).pdf')
+
+
+def test_sin_archivo_nuevo_devuelve_none(tmp_path):
+    _escribir(tmp_path / 'folleto.pdf', b'%PDF viejo' + b'0' * 20000)
+    existentes = set(os.listdir(tmp_path))
+
+    pdf_path = _wait_for_download_cdp(_DriverCDP('folleto.pdf'), str(tmp_path), timeout=1,
+                                      existing_files=existentes)
+    assert pdf_path is None
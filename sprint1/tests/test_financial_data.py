@@ -0,0 +1,114 @@
+"""
+Test de _get_fund_financial_data (pandas.read_html) contra el recorrido original
+con BeautifulSoup, sobre una página CMF de ejemplo con una sesión HTTP simulada.
+"""
+
+import os
+import re
+import sys
+from types import SimpleNamespace
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fondos_mutuos import FondosMutuosProcessor
+
+HTML_CMF = """
+<html><body>
+<table>
+  <thead>
+    <tr><th>Rentabilidad anual</th><th>7,5%</th></tr>
+    <tr><th>Patrimonio</th><th>1.250.000</th></tr>
+  </thead>
+  <tbody>
+    <tr><td>Valor cuota</td><td>1.234,56</td></tr>
+    <tr><td>Rentabilidad mes</td><td>0,8 %</td></tr>
+    <tr><td>Rentabilidad</td><td>-1.2%</td></tr>
+    <tr><td>Rendimiento</td><td>3,5</td></tr>
+    <tr><td>Participes</td><td>842</td></tr>
+    <tr><td>Comision</td><td>0%</td></tr>
+    <tr><td>Otro dato</td><td>0%</td></tr>
+    <tr><td>Sin valor</td><td></td></tr>
+    <tr><td>solo una celda</td></tr>
+  </tbody>
+</table>
+<table>
+  <tr><th>Fecha</th><th>Valor cuota</th><th>Patrimonio</th></tr>
+  <tr><td>01/10/2026</td><td>1.230,10</td><td>1.200.000</td></tr>
+  <tr><td>02/10/2026</td><td>1.234,56</td><td>1.250.000</td></tr>
+  <tr><td>Return year</td><td>4.1 %</td><td></td></tr>
+</table>
+</body></html>
+"""
+
+FUND_INFO = {'fund_name': 'Fondo Test', 'administrator_id': '96514410', 'fund_code': '8638'}
+
+DATA_PATTERNS = {
+    'patrimonio': ['patrimonio', 'assets', 'activos'],
+    'valor_cuota': ['valor cuota', 'precio', 'price', 'cuota'],
+    'rentabilidad': ['rentabilidad', 'return', 'rendimiento'],
+    'numero_participes': ['participes', 'investors', 'inversionistas'],
+    'gastos': ['gastos', 'expenses', 'costos'],
+    'comisiones': ['comision', 'fee', 'tarifa'],
+    'duracion': ['duracion', 'duration', 'plazo'],
+    'volatilidad': ['volatilidad', 'volatility', 'riesgo']
+}
+
+
+def _financial_data_beautifulsoup(processor, html: str) -> dict:
+    """Recorrido tabla/fila/celda previo a read_html (referencia)"""
+    financial_data = {}
+    for table in BeautifulSoup(html, 'html.parser').find_all('table'):
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                text = ' '.join([cell.get_text().strip() for cell in cells])
+                text_lower = text.lower()
+
+                for key, patterns in DATA_PATTERNS.items():
+                    for pattern in patterns:
+                        if pattern in text_lower:
+                            if 'rentabilidad' in pattern or 'return' in pattern:
+                                value = processor._extract_percentage_value(text)
+                                if value is not None:
+                                    if 'mes' in text_lower or 'month' in text_lower:
+                                        financial_data[f'{key}_mes'] = value
+                                    elif 'año' in text_lower or 'anual' in text_lower or 'year' in text_lower:
+                                        financial_data[f'{key}_anual'] = value
+                                    else:
+                                        financial_data[key] = value
+                            else:
+                                value = processor._extract_numeric_value(text)
+                                if value:
+                                    financial_data[key] = value
+
+                numeric_value = processor._extract_numeric_value(text)
+                percentage_value = processor._extract_percentage_value(text)
+
+                if numeric_value and not any(key for key in financial_data.values() if key == numeric_value):
+                    clean_text = re.sub(r'[^\w\s]', '', text_lower)
+                    words = clean_text.split()[:3]
+                    key_name = '_'.join(words) if words else f'valor_{len(financial_data)}'
+                    financial_data[f'data_{key_name}'] = numeric_value
+
+                if percentage_value is not None and not any(key for key in financial_data.values() if key == percentage_value):
+                    clean_text = re.sub(r'[^\w\s]', '', text_lower)
+                    words = clean_text.split()[:3]
+                    key_name = '_'.join(words) if words else f'porcentaje_{len(financial_data)}'
+                    financial_data[f'pct_{key_name}'] = percentage_value
+    return financial_data
+
+
+def test_read_html_igual_al_recorrido_original():
+    processor = FondosMutuosProcessor.__new__(FondosMutuosProcessor)
+    respuesta = SimpleNamespace(status_code=200, content=HTML_CMF.encode('utf-8'))
+    processor.session = SimpleNamespace(get=lambda url, params=None, timeout=None: respuesta)
+
+    esperado = _financial_data_beautifulsoup(processor, HTML_CMF)
+    obtenido = processor._get_fund_financial_data(FUND_INFO)
+
+    # Las filas de <thead>/<th> también se leen y 'rendimiento' usa el valor numérico
+    assert esperado['rentabilidad'] == 3.5
+    assert esperado['data_rentabilidad_anual_75'] == 7.5
+    assert list(obtenido.items()) == list(esperado.items())
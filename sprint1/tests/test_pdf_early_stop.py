@@ -0,0 +1,80 @@
+"""
+Test del corte temprano de extract_pdf_text con un folleto de varias páginas:
+una sección que sigue en la página siguiente a la que completa los campos
+objetivo no se pierde, y un índice que solo nombra las secciones no corta.
+"""
+
+import os
+import sys
+
+import pytest
+
+pymupdf = pytest.importorskip('pymupdf')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fondos_mutuos
+from fondos_mutuos import PDF_CAMPOS_OBJETIVO, FondosMutuosProcessor, extract_pdf_text
+
+PAGINAS = [
+    # 1: índice, nombra todas las secciones sin valores
+    ['Índice', 'Horizonte de inversión', 'Remuneración', 'Rentabilidad', 'Patrimonio',
+     'Composición de la cartera', 'Monto mínimo', 'Plazo de rescate', 'Duración'],
+    # 2: casi todos los campos
+    ['Tipo de fondo: conservador', 'Nivel de riesgo R2',
+     'Perfil del inversionista: conservador', 'Horizonte de inversión: corto plazo',
+     'Remuneración anual 1,20%', 'Comisión máxima de rescate 0,50%', 'Fondo rescatable',
+     'Plazo de rescate: 10 días', 'Duración: indefinido', 'Monto mínimo: $ 5.000',
+     '1 año 4,50%'],
+    # 3: último campo (patrimonio) y comienzo de la composición
+    ['Patrimonio total $ 1.000.000', 'Composición de la cartera',
+     'Acciones nacionales 40,50%'],
+    # 4: la composición continúa
+    ['Bonos corporativos 35,20%', 'Depósitos a plazo 24,30%'],
+] + [[f'Anexo {n}'] for n in range(5, 9)]
+
+
+@pytest.fixture
+def folleto_pdf(tmp_path, monkeypatch):
+    monkeypatch.setattr(fondos_mutuos, 'PYMUPDF_AVAILABLE', True)
+    pdf_path = tmp_path / 'folleto.pdf'
+    with pymupdf.open() as doc:
+        for lineas in PAGINAS:
+            page = doc.new_page()
+            for i, linea in enumerate(lineas):
+                page.insert_text((72, 72 + 16 * i), linea)
+        doc.save(pdf_path)
+    return str(pdf_path)
+
+
+def test_lee_una_pagina_despues_de_los_campos_objetivo(folleto_pdf):
+    texto, total, backend = extract_pdf_text(folleto_pdf, stop_patterns=PDF_CAMPOS_OBJETIVO)
+
+    assert (total, backend) == (8, 'pymupdf')
+    # La composición que sigue en la página 4 se lee; los anexos no
+    assert 'Bonos corporativos' in texto
+    assert 'Depósitos a plazo' in texto
+    assert 'Anexo 5' not in texto
+
+
+def test_indice_no_corta_la_extraccion(folleto_pdf):
+    texto, _, _ = extract_pdf_text(folleto_pdf, max_pages=1, stop_patterns=PDF_CAMPOS_OBJETIVO)
+    assert 'Índice' in texto
+
+    pendientes = [p for p in PDF_CAMPOS_OBJETIVO if not p.search(texto)]
+    assert pendientes
+
+
+def test_sin_campos_objetivo_lee_todo(folleto_pdf):
+    texto, total, _ = extract_pdf_text(folleto_pdf)
+    assert total == 8
+    assert 'Anexo 8' in texto
+
+
+def test_composicion_completa_en_datos_extendidos(folleto_pdf):
+    processor = FondosMutuosProcessor.__new__(FondosMutuosProcessor)
+    resultado = processor._extract_extended_data_from_pdf(folleto_pdf)
+
+    activos = {item['activo'].lower() for item in resultado['composicion_portafolio']}
+    assert any('bonos' in activo for activo in activos)
+    assert resultado['patrimonio'] is not None